@@ -1,128 +1,329 @@
 import numpy as np
-from typing import Tuple, List
+from typing import Dict, Tuple, List, Optional, Union
 import random
+import threading
+import time
+from bitboard import BitBoard
+from evaluator import Evaluator, best_moves_batch, make_evaluator, neighbor_mask
+from instrumentation import Instrumentation, pattern_cache_hits
+from mcts import MCTSEngine
+from movegen import ordered_moves
+from opening_book import OpeningBook, default_book
+from rules import make_rules
+from search import MATE_BOUND, SearchEngine
+from threat_search import ThreatSolver, find_forced_move
+from time_control import TimeManager, position_complexity
+
+# 난이도별 계산 예산 - 최대 깊이, 최대 노드 수, 생각 시간 상한(ms), 필승 수순을 먼저 확인할지
+# None이면 AI 설정을 따름 (깊이: search_engine.max_depth, 시간: think_ms 또는 대국 시계로 정한 시간).
+# 쉬운 난이도도 무작위로 두지 않고 얕고 짧게 읽을 뿐이라, 난이도가 곧 수당 계산량과 지연 시간의 상한이다.
+DIFFICULTY_BUDGETS: Dict[str, Dict] = {
+    "easy": {"max_depth": 1, "max_nodes": 50, "think_ms": 50, "threats": False},
+    "medium": {"max_depth": 2, "max_nodes": 1000, "think_ms": 200, "threats": True},
+    "hard": {"max_depth": None, "max_nodes": None, "think_ms": None, "threats": True},
+    "mcts": {"max_depth": None, "max_nodes": None, "think_ms": None, "threats": True},
+}
 
 class AI:
-    def __init__(self, player_id: int):
+    def __init__(self, player_id: int, think_ms: int = 1000, tt_mb: float = 16, candidate_radius: int = 1,
+                 opening_book: Optional[OpeningBook] = None, use_book: bool = True, threat_ms: int = 100,
+                 rules: str = "freestyle", ponder_width: int = 3, evaluator: Union[str, Evaluator, None] = None,
+                 mcts_workers: int = 1, mcts_playouts: Optional[int] = None):
         self.player_id = player_id
         self.opponent_id = 3 - player_id  # 1이면 2, 2이면 1
+        self.candidate_radius = candidate_radius
+        self.rules = rules  # 렌주룰이면 흑의 금수 자리를 후보에서 뺌
+        # 오프닝 북 - 지정하지 않으면 기본 북 파일(opening_book.bin)을 사용
+        self.opening_book = opening_book if opening_book is not None or not use_book else default_book()
+        # 평가기 - 'pattern'(패턴 점수, 기본) 또는 신경망 가중치 파일(.npz) 경로
+        self.evaluator = make_evaluator(evaluator)
+        self.search_engine = SearchEngine(think_ms=think_ms, tt_mb=tt_mb, candidate_radius=candidate_radius,
+                                          evaluator=self.evaluator)
+        # 'mcts' 난이도의 몬테카를로 트리 탐색 - 같은 생각 시간, mcts_workers개 프로세스로 루트 병렬 탐색
+        self.mcts = MCTSEngine(think_ms=think_ms, playouts=mcts_playouts, workers=mcts_workers,
+                               evaluator=self.evaluator)
+        # 평가 전에 연속 사/삼 필승 수순을 확인하는 위협 공간 탐색
+        self.threat_solver = ThreatSolver(time_ms=threat_ms)
+        # 대국 시계가 있을 때 남은 시간과 국면 복잡도로 수마다 생각 시간을 정함
+        self.time_manager = TimeManager()
+        self.last_think_ms: Optional[float] = None  # 마지막 수에 배정한 생각 시간
+        self.last_score: Optional[float] = None  # 마지막 수의 점수 (탐색/평가 점수, 없으면 None)
+        # 마지막으로 본 보드 - 새로 놓인 돌만 반영해 후보 수를 점진적으로 갱신
+        self.position: Optional[BitBoard] = None
+        # 수마다 통계를 모을 때만 붙임 (None이면 통계를 모으지 않음)
+        self.instrumentation: Optional[Instrumentation] = None
+        self.last_candidates: Optional[int] = None  # 마지막 get_available_moves의 후보 수
+        # 상대 차례에 미리 읽어 둔 결과 - 예상 응수를 둔 국면의 해시 -> (수, 고른 방법, 점수, 깊이, 읽은 시간 ms)
+        self.ponder_width = ponder_width  # 미리 읽을 상대 응수 수
+        self.pondered: Dict[int, Tuple[Tuple[int, int], str, Optional[float], int, float]] = {}
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+    
+    def sync_position(self, board: np.ndarray) -> BitBoard:
+        """numpy 보드와 내부 BitBoard를 맞춤 (돌이 추가되기만 했으면 그 돌만 반영)"""
+        position = self.position
+        if position is not None and position.size == board.shape[0]:
+            changed = np.argwhere(position.grid != board)
+            if all(position.grid[row, col] == 0 for row, col in changed):
+                for row, col in changed:
+                    position.place(int(row), int(col), int(board[row, col]))
+                return position
+        self.position = BitBoard.from_array(board, self.candidate_radius)
+        if self.rules != "freestyle":
+            make_rules(self.rules, self.position)
+        return self.position
+    
+    def set_rules(self, rules: str):
+        """규칙 바꾸기 - 다음 수부터 적용"""
+        if rules != self.rules:
+            self.rules = rules
+            self.position = None
+            self.pondered = {}
+    
+    def set_evaluator(self, evaluator: Union[str, Evaluator, None]):
+        """평가기 바꾸기 - 이전 평가기로 채운 치환표는 비움"""
+        self.evaluator = self.search_engine.evaluator = self.mcts.evaluator = make_evaluator(evaluator)
+        self.search_engine.tt.clear()
+        self.pondered = {}
+    
+    def _allowed(self, board: np.ndarray, move: Tuple[int, int]) -> bool:
+        """규칙상 둘 수 있는 수인지 (오프닝 북/필승 수순의 수 확인용)"""
+        if self.rules == "freestyle":
+            return True
+        position = self.sync_position(board)
+        return not position.rules.is_forbidden(move[0], move[1], self.player_id)
+    
+    def get_available_moves(self, board: np.ndarray, forced_only: bool = False) -> List[Tuple[int, int]]:
+        """돌 주변의 가능한 수를 위협 순서대로 찾기
+
+        forced_only면 이기는 수나 막아야 하는 수가 있을 때 그 수만 반환한다.
+        """
+        # 후보는 돌 주변 칸만 점진적으로 관리하므로 보드 크기와 상관없이 돌 수에 비례
+        position = self.sync_position(board)
+        moves = [] if position.is_full() else ordered_moves(position, self.player_id, forced=forced_only)
+        self.last_candidates = len(moves)
+        return moves
     
-    def evaluate_position(self, board: np.ndarray, row: int, col: int, player: int) -> int:
-        """특정 위치의 가치를 평가"""
-        if board[row, col] != 0:
-            return -1000  # 이미 돌이 놓인 위치
+    def make_move(self, board: np.ndarray) -> Tuple[int, int]:
+        """AI의 수를 결정"""
+        return self._greedy_move(board)[0]
+    
+    def _greedy_move(self, board: np.ndarray) -> Tuple[Tuple[int, int], Optional[float]]:
+        """후보 중 점수가 가장 높은 수와 그 점수"""
+        available_moves = self.get_available_moves(board, forced_only=True)
         
-        # 임시로 돌을 놓아서 평가
-        board[row, col] = player
+        if not available_moves:
+            return (0, 0), None
         
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-        total_score = 0
+        # 후보 점수는 평가기가 한 번에 계산 - 기본 패턴 평가기는 score_map과 같은 값을
+        # 보드 전체가 아니라 후보 주변 줄만 보고 계산
+        position = self.sync_position(board)
+        candidate_scores = self.evaluator.score_moves(position, self.player_id, available_moves)
+        best_score = max(candidate_scores)
+        best_moves = [move for move, score in zip(available_moves, candidate_scores) if score == best_score]
         
-        for dr, dc in directions:
-            count = 1
-            blocked = 0
-            
-            # 정방향 확인
-            r, c = row + dr, col + dc
-            while 0 <= r < board.shape[0] and 0 <= c < board.shape[1] and board[r, c] == player:
-                count += 1
-                r += dr
-                c += dc
-            if not (0 <= r < board.shape[0] and 0 <= c < board.shape[1]) or board[r, c] != 0:
-                blocked += 1
-            
-            # 역방향 확인
-            r, c = row - dr, col - dc
-            while 0 <= r < board.shape[0] and 0 <= c < board.shape[1] and board[r, c] == player:
-                count += 1
-                r -= dr
-                c -= dc
-            if not (0 <= r < board.shape[0] and 0 <= c < board.shape[1]) or board[r, c] != 0:
-                blocked += 1
-            
-            # 점수 계산
-            if count >= 5:
-                total_score += 10000
-            elif count == 4 and blocked == 0:
-                total_score += 1000
-            elif count == 3 and blocked == 0:
-                total_score += 100
-            elif count == 2 and blocked == 0:
-                total_score += 10
+        # 최고 점수의 수들 중에서 랜덤 선택
+        return random.choice(best_moves), float(best_score)
+    
+    def make_moves_batch(self, boards: np.ndarray, players: Optional[np.ndarray] = None) -> np.ndarray:
+        """여러 보드(N, size, size)의 수를 한 번에 결정 -> (N, 2)
+
+        점수 계산이 보드 묶음 전체에 대해 벡터화되어 있어 보드가 많을수록 한 수당 비용이 줄어든다.
+        players를 주지 않으면 모든 보드에서 이 AI의 돌(player_id)로 둔다.
+        렌주룰이면 보드마다 흑의 금수 자리를 찾아 빼므로 그만큼 느려진다.
+        """
+        boards = np.asarray(boards)
+        if boards.ndim == 2:
+            boards = boards[None]
+        forbidden = None
+        if self.rules != "freestyle":
+            forbidden = np.zeros(boards.shape, dtype=bool)
+            near = neighbor_mask(boards)
+            for i, board in enumerate(boards):
+                rules = make_rules(self.rules, BitBoard.from_array(board))
+                for row, col in np.argwhere(near[i]):
+                    forbidden[i, row, col] = rules.is_forbidden(int(row), int(col), 1)
+        return best_moves_batch(boards, self.player_id if players is None else players, defense_weight=0.8,
+                                forbidden=forbidden)
+    
+    def get_move_with_difficulty(self, board: np.ndarray, difficulty: str = "medium",
+                                 stop: Optional[threading.Event] = None, time_left_ms: Optional[float] = None,
+                                 increment_ms: float = 0) -> Tuple[int, int]:
+        """난이도에 따른 AI 수 결정 (stop: 탐색 중단 신호)
+
+        time_left_ms(대국 시계의 남은 시간)를 주면 시간 관리자가 남은 시간과 국면 복잡도로 생각 시간을 정한다.
+        복잡도를 재는 시간도 그 생각 시간에 들어간다.
+        """
+        start = time.perf_counter()
+        self.search_engine.nodes = 0
+        self.last_think_ms = self.think_time(board, difficulty, time_left_ms, increment_ms)
+        if self.instrumentation is None:
+            move, _, self.last_score = self._choose_move(board, difficulty, stop, start)
+            return move
+        return self._instrumented_move(board, difficulty, stop, start)
+    
+    def think_time(self, board: np.ndarray, difficulty: str, time_left_ms: Optional[float] = None,
+                   increment_ms: float = 0) -> float:
+        """이번 수의 생각 시간(ms) - 난이도의 상한과 (시계가 있으면) 시간 관리자가 정한 시간 중 작은 쪽"""
+        limit = DIFFICULTY_BUDGETS[difficulty]["think_ms"]
+        if time_left_ms is None:
+            if limit is not None:
+                return limit
+            return self.mcts.think_ms if difficulty == "mcts" else self.search_engine.think_ms
+        position = self.sync_position(board)
+        allocated = self.time_manager.allocate(time_left_ms, increment_ms, len(position.history),
+                                               position_complexity(position, self.player_id))
+        return allocated if limit is None else min(limit, allocated)
+    
+    def _instrumented_move(self, board: np.ndarray, difficulty: str, stop: Optional[threading.Event],
+                           start: float) -> Tuple[int, int]:
+        """수를 결정하면서 통계를 모아 instrumentation으로 보냄"""
+        engine = self.search_engine
+        tt = engine.tt
+        tt_hits, tt_probes = tt.hits, tt.hits + tt.misses
+        pattern_hits = pattern_cache_hits()
+        engine.evaluations = engine.completed_depth = 0
+        self.threat_solver.nodes = 0
+        self.last_candidates = None
         
-        # 임시로 놓은 돌 제거
-        board[row, col] = 0
+        (row, col), source, score = self._choose_move(board, difficulty, stop, start)
+        self.last_score = score
         
-        return total_score
+        wall_ms = (time.perf_counter() - start) * 1000
+        searched = source in ("search", "ponder")
+        if source == "mcts":
+            # MCTS는 플레이아웃을 노드로, 루트에서 펼친 수를 후보로 셈
+            engine_nodes, candidates = self.mcts.playouts, len(self.mcts.root_visits)
+        else:
+            engine_nodes, candidates = engine.nodes, engine.root_candidates if searched else self.last_candidates
+        self.instrumentation.emit({
+            "player": self.player_id,
+            "difficulty": difficulty,
+            "stones": int(np.count_nonzero(board)),
+            "move": [int(row), int(col)],
+            "source": source,
+            "candidates": candidates,
+            "evaluations": engine.evaluations if searched else 0,
+            "nodes": engine_nodes,
+            "threat_nodes": self.threat_solver.nodes,
+            "depth": engine.completed_depth,
+            "tt_hits": tt.hits - tt_hits,
+            "tt_probes": tt.hits + tt.misses - tt_probes,
+            "pattern_cache_hits": pattern_cache_hits() - pattern_hits,
+            "think_ms": self.last_think_ms,
+            "wall_ms": wall_ms,
+            "score": None if score is None else float(score),
+        })
+        return row, col
     
-    def get_available_moves(self, board: np.ndarray) -> List[Tuple[int, int]]:
-        """가능한 수를 찾기"""
-        moves = []
-        for row in range(board.shape[0]):
-            for col in range(board.shape[1]):
-                if board[row, col] == 0:
-                    # 주변에 돌이 있는 위치만 고려 (성능 최적화)
-                    has_neighbor = False
-                    for dr in [-1, 0, 1]:
-                        for dc in [-1, 0, 1]:
-                            r, c = row + dr, col + dc
-                            if (0 <= r < board.shape[0] and 0 <= c < board.shape[1] and 
-                                board[r, c] != 0):
-                                has_neighbor = True
-                                break
-                        if has_neighbor:
-                            break
-                    
-                    if has_neighbor or board.shape[0] * board.shape[1] < 50:  # 작은 보드면 모든 위치 고려
-                        moves.append((row, col))
+    def ponder(self, board: np.ndarray, difficulty: str, stop: threading.Event) -> int:
+        """상대 차례에 예상 응수마다 내 수를 미리 읽어 둠 (stop이 설정될 때까지) - 읽은 응수 수
+
+        어려움 난이도에서만 쓴다. 응수마다 평소 생각 시간만큼 탐색하고, 시간이 남으면 시간을 두 배로
+        늘려 다시 읽는다. 상대가 읽어 둔 응수를 두면 _choose_move가 그 결과를 바로 쓰고,
+        다른 수를 두더라도 치환표에 남은 항목으로 탐색이 빨라진다.
+        """
+        self.pondered = {}
+        if difficulty != "hard" or stop.is_set():
+            return 0
+        # 내부 BitBoard(self.position)는 실제 수를 둘 때 쓰므로 따로 만든 보드에서 읽음
+        root = BitBoard.from_array(board, self.candidate_radius)
+        if self.rules != "freestyle":
+            make_rules(self.rules, root)
+        if root.is_full():
+            return 0
+        replies = [move for move in ordered_moves(root, self.opponent_id)[:self.ponder_width]
+                   if not root.would_be_five(move[0], move[1], self.opponent_id)]
         
-        return moves if moves else [(row, col) for row in range(board.shape[0]) 
-                                  for col in range(board.shape[1]) if board[row, col] == 0]
+        engine = self.search_engine
+        budget = engine.think_ms
+        pending = list(replies)
+        while pending and not stop.is_set():
+            for row, col in list(pending):
+                root.place(row, col, self.opponent_id)
+                try:
+                    key = root.hash
+                    previous = self.pondered.get(key)
+                    if previous is None:
+                        # 필승/방어 수순은 처음 한 번만 확인
+                        forced = find_forced_move(root, self.player_id, self.threat_solver)
+                        if forced is not None and not (root.rules is not None and
+                                                       root.rules.is_forbidden(*forced[0], self.player_id)):
+                            self.pondered[key] = (forced[0], forced[1], None, 0, float("inf"))
+                            pending.remove((row, col))
+                            continue
+                    start = time.perf_counter()
+                    move = engine.search(root, self.player_id, stop, think_ms=budget)
+                    elapsed = (time.perf_counter() - start) * 1000 + (previous[4] if previous else 0.0)
+                    if previous is None or engine.completed_depth >= previous[3]:
+                        self.pondered[key] = (move, "ponder", engine.best_score, engine.completed_depth, elapsed)
+                    else:
+                        self.pondered[key] = previous[:4] + (elapsed,)
+                    if (engine.completed_depth >= engine.max_depth or abs(engine.best_score) > MATE_BOUND or
+                            root.would_be_five(move[0], move[1], self.player_id)):
+                        pending.remove((row, col))
+                finally:
+                    root.undo()
+                if stop.is_set():
+                    break
+            budget *= 2
+        return len(replies)
     
-    def make_move(self, board: np.ndarray) -> Tuple[int, int]:
-        """AI의 수를 결정"""
-        available_moves = self.get_available_moves(board)
-        
-        if not available_moves:
-            return (0, 0)
+    def _pondered_move(self, board: np.ndarray) -> Optional[Tuple[Tuple[int, int], str, Optional[float], float]]:
+        """지금 국면을 미리 읽어 두었으면 (수, 고른 방법, 점수, 읽은 시간 ms)"""
+        if not self.pondered:
+            return None
+        entry = self.pondered.get(self.sync_position(board).hash)
+        self.pondered = {}
+        if entry is None:
+            self.ponder_misses += 1
+            return None
+        self.ponder_hits += 1
+        move, source, score, _, elapsed = entry
+        return move, source, score, elapsed
+    
+    def _choose_move(self, board: np.ndarray, difficulty: str, stop: Optional[threading.Event],
+                     start: Optional[float] = None) -> Tuple[Tuple[int, int], str, Optional[float]]:
+        """(수, 어떻게 골랐는지, 그 수의 점수) - 난이도의 계산 예산 안에서 고름
+
+        start(이 수를 생각하기 시작한 시각, perf_counter)부터 쓴 시간은 모두 생각 시간에 들어가며,
+        탐색은 남은 시간만 쓴다.
+        """
+        start = time.perf_counter() if start is None else start
+        budget = DIFFICULTY_BUDGETS[difficulty]
+        think_ms = self.last_think_ms if self.last_think_ms is not None else self.think_time(board, difficulty)
         
-        best_score = float('-inf')
-        best_moves = []
+        # 초반에는 탐색 전에 오프닝 북부터 확인
+        if difficulty != "easy" and self.opening_book is not None:
+            book_move = self.opening_book.lookup(board, self.player_id)
+            if book_move is not None and self._allowed(board, book_move):
+                return book_move, "book", None
         
-        for row, col in available_moves:
-            # 내 수의 가치
-            my_score = self.evaluate_position(board, row, col, self.player_id)
-            
-            # 상대방이 이 위치에 놓았을 때의 가치 (방어)
-            opponent_score = self.evaluate_position(board, row, col, self.opponent_id)
-            
-            # 종합 점수 (공격과 방어를 모두 고려)
-            total_score = my_score + opponent_score * 0.8
-            
-            if total_score > best_score:
-                best_score = total_score
-                best_moves = [(row, col)]
-            elif total_score == best_score:
-                best_moves.append((row, col))
+        # 상대 차례에 이 국면을 미리 읽었으면 그 결과를 쓰고, 덜 읽었으면 남은 시간만 더 탐색
+        pondered = self._pondered_move(board) if difficulty == "hard" else None
+        if pondered is not None:
+            move, source, score, elapsed = pondered
+            remaining = think_ms - elapsed - (time.perf_counter() - start) * 1000
+            if remaining <= 0:
+                return move, source, score
+            move = self.search_engine.search(self.sync_position(board), self.player_id, stop, think_ms=remaining)
+            return move, "ponder", self.search_engine.best_score
         
-        # 최고 점수의 수들 중에서 랜덤 선택
-        return random.choice(best_moves)
-    
-    def get_move_with_difficulty(self, board: np.ndarray, difficulty: str = "medium") -> Tuple[int, int]:
-        """난이도에 따른 AI 수 결정"""
-        if difficulty == "easy":
-            # 쉬운 난이도: 랜덤 수
-            available_moves = self.get_available_moves(board)
-            return random.choice(available_moves) if available_moves else (0, 0)
+        # 필승 수순은 바로 두고, 상대의 필승 수순은 먼저 막음 (위협 탐색은 생각 시간의 절반까지만)
+        if budget["threats"]:
+            forced = find_forced_move(self.sync_position(board), self.player_id, self.threat_solver,
+                                      time_ms=min(self.threat_solver.time_ms, think_ms / 2))
+            if forced is not None and self._allowed(board, forced[0]):
+                return forced[0], forced[1], None
+        think_ms = max(1.0, think_ms - (time.perf_counter() - start) * 1000)
         
-        elif difficulty == "hard":
-            # 어려운 난이도: 더 깊은 탐색
-            return self.make_move(board)
+        if difficulty == "mcts":
+            # MCTS 난이도: 제한 시간 안에서 몬테카를로 트리 탐색 (점수는 고른 수의 승률)
+            move = self.mcts.search(self.sync_position(board), self.player_id, stop, think_ms=think_ms)
+            return move, "mcts", self.mcts.best_value
         
-        else:  # medium
-            # 중간 난이도: 70% 확률로 좋은 수, 30% 확률로 랜덤 수
-            if random.random() < 0.7:
-                return self.make_move(board)
-            else:
-                available_moves = self.get_available_moves(board)
-                return random.choice(available_moves) if available_moves else (0, 0) 
\ No newline at end of file
+        # 알파-베타 탐색 - 난이도마다 깊이/노드 수/시간 예산만 다름
+        # 동기화된 BitBoard에서 두고 무르며 탐색 (보드를 새로 만들지 않음)
+        move = self.search_engine.search(self.sync_position(board), self.player_id, stop, think_ms=think_ms,
+                                         max_depth=budget["max_depth"], max_nodes=budget["max_nodes"])
+        return move, "search", self.search_engine.best_score
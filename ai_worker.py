@@ -0,0 +1,83 @@
+import threading
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Tuple
+from ai import AI
+
+
+class AIWorker:
+    """AI 수 계산을 메인 루프 밖의 스레드에서 실행
+
+    요청마다 보드를 복사해 넘기고, cancel()은 진행 중인 탐색에 중단 신호를 보낸다.
+    취소된 요청의 결과는 poll()에서 버려진다.
+    미리 읽기(ponder)도 같은 스레드에서 돌기 때문에, 수 요청이 오면 미리 읽기를 멈추고
+    그 작업이 끝난 뒤에 수 계산이 시작된다 (AI의 탐색 엔진과 치환표를 동시에 쓰지 않음).
+    """
+
+    def __init__(self, ai: AI):
+        self.ai = ai
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-worker")
+        self._future: Optional[Future] = None
+        self._stop = threading.Event()
+        self._ponder_future: Optional[Future] = None
+        self._ponder_stop = threading.Event()
+        self.error: Optional[BaseException] = None  # 마지막 수 계산이 실패했으면 그 예외
+
+    @property
+    def thinking(self) -> bool:
+        """계산 중이거나 아직 가져가지 않은 결과가 있는지"""
+        return self._future is not None
+
+    @property
+    def pondering(self) -> bool:
+        """상대 차례에 미리 읽는 중인지"""
+        return self._ponder_future is not None and not self._ponder_future.done()
+
+    def request_ponder(self, board: np.ndarray, difficulty: str) -> Future:
+        """상대 차례에 백그라운드에서 미리 읽기 시작 - 수 요청이나 cancel()이 올 때까지"""
+        self.stop_ponder()
+        stop = threading.Event()
+        self._ponder_stop = stop
+        self._ponder_future = self._executor.submit(self.ai.ponder, board.copy(), difficulty, stop)
+        return self._ponder_future
+
+    def stop_ponder(self):
+        """미리 읽기 중단 - 읽어 둔 결과는 국면 해시로 찾으므로 AI에 그대로 둠"""
+        if self._ponder_future is not None:
+            self._ponder_stop.set()
+            self._ponder_future = None
+
+    def request_move(self, board: np.ndarray, difficulty: str, time_left_ms: Optional[float] = None,
+                     increment_ms: float = 0) -> Future:
+        """백그라운드에서 수 계산 시작 (미리 읽기 중이면 멈추고 그 뒤에 계산) - 시계가 있으면 남은 시간도 넘김"""
+        self.cancel()
+        self.error = None
+        stop = threading.Event()
+        self._stop = stop
+        self._future = self._executor.submit(self.ai.get_move_with_difficulty, board.copy(), difficulty, stop,
+                                             time_left_ms, increment_ms)
+        return self._future
+
+    def poll(self) -> Optional[Tuple[int, int]]:
+        """계산이 끝났으면 결과를 반환 (아직이면 None, 계산이 실패했으면 None을 반환하고 예외는 error에 둠)"""
+        future = self._future
+        if future is None or not future.done():
+            return None
+        self._future = None
+        try:
+            return future.result()
+        except Exception as e:
+            self.error = e
+            return None
+
+    def cancel(self):
+        """진행 중인 계산과 미리 읽기 중단 - 계산 결과는 버려짐"""
+        self.stop_ponder()
+        if self._future is not None:
+            self._stop.set()
+            self._future.cancel()
+            self._future = None
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+기보 분석 도구 (창 없이 실행)
+저장된 기보를 한 판씩 읽어 다시 두면서 수마다 AI의 평가 점수, 최선 수와 그 점수, 악수 여부를 JSON-lines로 기록합니다.
+여러 판을 프로세스 풀에서 동시에 분석하며, 중단된 뒤 같은 명령으로 다시 실행하면 이미 기록한 판은 건너뜁니다.
+
+사용 예:
+    python analyze.py games.omr selfplay.omr --out analysis.jsonl --workers 8 --think-ms 100
+    python analyze.py games.txt --out analysis.jsonl --blunder 2000
+
+출력 한 줄(한 판): {"id": "games.omr#0", "size": 15, "winner": 1, "blunders": {"1": 0, "2": 2},
+                   "moves": [{"move": "h8", "player": 1, "score": 12, "best": "h8", "best_score": 12,
+                              "loss": 0, "blunder": false}, ...]}
+점수는 모두 그 수를 둔 쪽 입장의 탐색 점수(패턴 점수 단위, 승패가 보이면 ±search.WIN_SCORE 근처)입니다.
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from multiprocessing import Pool
+from typing import Dict, Iterator, Optional, Set, Tuple
+from bitboard import BitBoard
+from game_record import GameRecord, format_move, iter_records, iter_text
+from rules import make_rules
+from search import WIN_SCORE, SearchEngine
+
+BLUNDER_THRESHOLD = 1000  # 최선 수보다 이만큼 이상 나쁘면 악수 (패턴 점수로 사 하나 정도)
+
+# 작업 프로세스마다 탐색 엔진(치환표)을 한 번만 만듦
+_worker_engine: Optional[SearchEngine] = None
+
+
+def iter_games(paths) -> Iterator[Tuple[str, GameRecord]]:
+    """(판 id, 기보)를 한 판씩 - id는 '파일 경로#파일 안의 판 번호'"""
+    for path in paths:
+        games = iter_text(path) if path.endswith(".txt") else iter_records(path)
+        for index, game in enumerate(games):
+            yield f"{path}#{index}", game
+
+
+def completed_ids(out_path: str) -> Set[str]:
+    """출력 파일에 이미 기록한 판들 (중단되며 끊긴 마지막 줄은 빼고 다시 분석)"""
+    done = set()
+    if not os.path.exists(out_path):
+        return done
+    with open(out_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["id"])
+            except (ValueError, KeyError):
+                continue
+    return done
+
+
+def _truncate_partial_line(out_path: str):
+    """끊긴 마지막 줄을 지워 이어 쓸 자리를 맞춤"""
+    if not os.path.exists(out_path):
+        return
+    with open(out_path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            f.truncate(end)
+
+
+def best_reply(engine: SearchEngine, board: BitBoard, player: int, think_ms: float) -> Tuple[Tuple[int, int], int]:
+    """player 차례의 (최선 수, player 입장 점수)"""
+    move = engine.search(board, player, think_ms=think_ms)
+    if board.grid[move] == 0 and board.would_be_five(move[0], move[1], player):
+        return move, WIN_SCORE  # 바로 이기는 수는 탐색하지 않으므로 점수를 직접 매김
+    return move, engine.best_score
+
+
+def analyze_game(game: GameRecord, engine: SearchEngine, think_ms: float, rules: str = "freestyle",
+                 threshold: int = BLUNDER_THRESHOLD) -> Dict:
+    """한 판을 다시 두며 수마다 (둔 수의 점수, 최선 수와 그 점수, 손해, 악수 여부)를 구함
+
+    둔 수의 점수는 그 수를 둔 뒤 상대의 최선 응수 점수를 뒤집은 값이다 (최선 수를 뒀으면 최선 수의 점수).
+    """
+    size = game.size
+    board = BitBoard(size)
+    game_rules = make_rules(rules, board)
+    moves = []
+    blunders = {1: 0, 2: 0}
+    for i, (row, col) in enumerate(game.moves):
+        player = 1 + i % 2
+        if board.grid[row, col] != 0:
+            break  # 잘못된 기보는 거기까지만
+        best, best_score = best_reply(engine, board, player, think_ms)
+        board.place(row, col, player)
+        won = game_rules.is_win(row, col, player)
+        if won:
+            score = WIN_SCORE
+        elif (row, col) == best:
+            score = best_score
+        elif board.is_full():
+            score = 0
+        else:
+            score = -best_reply(engine, board, 3 - player, think_ms)[1]
+        loss = max(0, best_score - score)
+        blunder = loss >= threshold
+        blunders[player] += blunder
+        moves.append({"move": format_move(row, col, size), "player": player, "score": int(score),
+                      "best": format_move(best[0], best[1], size), "best_score": int(best_score),
+                      "loss": int(loss), "blunder": blunder})
+        if won:
+            break
+    return {"size": size, "winner": game.winner, "blunders": blunders, "moves": moves}
+
+
+def _init_worker(think_ms: float, tt_mb: float):
+    global _worker_engine
+    _worker_engine = SearchEngine(think_ms=think_ms, tt_mb=tt_mb)
+
+
+def _analyze_task(task: Tuple) -> Dict:
+    game_id, game, think_ms, rules, threshold = task
+    result = analyze_game(game, _worker_engine, think_ms, rules, threshold)
+    return dict({"id": game_id}, **result)
+
+
+def analyze_files(paths, out_path: str, think_ms: float = 100, workers: Optional[int] = None,
+                  rules: str = "freestyle", threshold: int = BLUNDER_THRESHOLD, tt_mb: float = 16,
+                  limit: Optional[int] = None, progress: bool = True) -> Dict:
+    """기보 파일들을 분석해 out_path에 한 판씩 이어 씀 - 이미 기록한 판은 건너뜀
+
+    기보는 한 판씩 읽어 작업 프로세스에 넘기고, 동시에 처리 중인 판 수를 제한해 큰 기보 모음도 메모리를 적게 쓴다.
+    결과는 읽은 순서대로 기록한다.
+    """
+    done = completed_ids(out_path)
+    total = sum(1 for game_id, _ in iter_games(paths) if game_id not in done)
+    if limit is not None:
+        total = min(total, limit)
+    tasks = ((game_id, game, think_ms, rules, threshold)
+             for game_id, game in iter_games(paths) if game_id not in done)
+
+    stats = {"games": 0, "moves": 0, "blunders": {1: 0, 2: 0}, "skipped": len(done), "elapsed_s": 0.0}
+    start = time.perf_counter()
+    _truncate_partial_line(out_path)
+    with open(out_path, "a", encoding="utf-8") as out:
+        def record(result: Dict):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            stats["games"] += 1
+            stats["moves"] += len(result["moves"])
+            for player, count in result["blunders"].items():
+                stats["blunders"][int(player)] += count
+            if progress:
+                elapsed = time.perf_counter() - start
+                print(f"\r진행 {stats['games']}/{total}판, {stats['moves']}수, "
+                      f"{stats['games'] / elapsed:.2f}판/초, 악수 흑 {stats['blunders'][1]} 백 {stats['blunders'][2]}",
+                      end="", flush=True)
+
+        if workers == 1:
+            _init_worker(think_ms, tt_mb)
+            for i, task in enumerate(tasks):
+                if limit is not None and i >= limit:
+                    break
+                record(_analyze_task(task))
+        else:
+            with Pool(workers, initializer=_init_worker, initargs=(think_ms, tt_mb)) as pool:
+                window = 4 * (workers or os.cpu_count() or 1)  # 동시에 맡겨 둘 판 수
+                pending = deque()
+                for i, task in enumerate(tasks):
+                    if limit is not None and i >= limit:
+                        break
+                    pending.append(pool.apply_async(_analyze_task, (task,)))
+                    if len(pending) >= window:
+                        record(pending.popleft().get())
+                while pending:
+                    record(pending.popleft().get())
+    if progress and stats["games"]:
+        print()
+    stats["elapsed_s"] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기보 분석 (수마다 AI 평가, 최선 수, 악수)")
+    parser.add_argument("records", nargs="+", help="분석할 기보 파일 (.omr 이진, .txt 텍스트)")
+    parser.add_argument("--out", default="analysis.jsonl", help="결과 JSON-lines 파일 (있으면 이어 씀)")
+    parser.add_argument("--think-ms", type=float, default=100, help="국면마다 탐색 시간")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--rules", choices=["freestyle", "renju"], default="freestyle")
+    parser.add_argument("--blunder", type=int, default=BLUNDER_THRESHOLD, help="악수로 볼 점수 손해")
+    parser.add_argument("--limit", type=int, help="이번에 분석할 최대 판 수")
+    args = parser.parse_args()
+
+    stats = analyze_files(args.records, args.out, args.think_ms, args.workers, args.rules, args.blunder,
+                          limit=args.limit)
+    print(f"{stats['games']}판 {stats['moves']}수 분석 ({stats['elapsed_s']:.1f}초), "
+          f"이미 분석한 판 {stats['skipped']}개 건너뜀, 악수 흑 {stats['blunders'][1]} 백 {stats['blunders'][2]} "
+          f"-> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI 대전 경기장 (창 없이 실행)
+AI끼리 여러 판을 프로세스 풀에서 동시에 두고 승률, 평균 수, 초당 노드 수, 수당 지연 시간을 보고합니다.
+
+사용 예:
+    python arena.py --a hard:think_ms=200 --b medium --games 40 --workers 8
+    python arena.py --a mcts:think_ms=500 --b hard:think_ms=500 --games 20
+"""
+
+import argparse
+import json
+import random
+import time
+import numpy as np
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
+from ai import AI
+from bitboard import BitBoard
+from game_record import GameRecord, write_records
+from rules import make_rules
+
+
+def parse_config(spec: str) -> Dict:
+    """'hard:think_ms=200,tt_mb=8' -> {'difficulty': 'hard', 'think_ms': 200, 'tt_mb': 8}"""
+    difficulty, _, options = spec.partition(":")
+    config = {"difficulty": difficulty or "medium"}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        try:
+            config[key] = int(value)
+        except ValueError:
+            try:
+                config[key] = float(value)
+            except ValueError:
+                config[key] = value
+    return config
+
+
+def make_ai(config: Dict, player: int) -> AI:
+    options = {key: value for key, value in config.items() if key != "difficulty"}
+    return AI(player, **options)
+
+
+def random_opening(size: int, moves: int, rng: random.Random) -> List[Tuple[int, int]]:
+    """중앙 근처에 흑백 번갈아 놓을 무작위 시작 수"""
+    center = size // 2
+    spread = max(1, min(3, center))
+    opening = []
+    while len(opening) < moves:
+        move = (center + rng.randint(-spread, spread), center + rng.randint(-spread, spread))
+        if move not in opening:
+            opening.append(move)
+    return opening
+
+
+def play_game(black: Dict, white: Dict, seed: int, size: int = 15, opening_moves: int = 2,
+              max_moves: Optional[int] = None, rules: str = "freestyle") -> Dict:
+    """한 판을 두고 결과를 반환 (winner: 1 흑, 2 백, 0 무승부)"""
+    rng = random.Random(seed)
+    random.seed(seed)  # AI의 동점 처리/무작위 수
+    board = BitBoard(size)
+    game_rules = make_rules(rules, board)
+    players = {1: (black, make_ai(dict(black, rules=rules), 1)), 2: (white, make_ai(dict(white, rules=rules), 2))}
+    latencies = {1: [], 2: []}
+    nodes = {1: 0, 2: 0}
+    max_moves = max_moves or size * size
+
+    player = 1
+    winner = 0
+    for row, col in random_opening(size, opening_moves, rng):
+        board.place(row, col, player)
+        player = 3 - player
+
+    while len(board.history) < max_moves:
+        config, ai = players[player]
+        start = time.perf_counter()
+        row, col = ai.get_move_with_difficulty(board.grid, config["difficulty"])
+        latencies[player].append(time.perf_counter() - start)
+        if config["difficulty"] == "mcts":
+            nodes[player] += ai.mcts.playouts
+        else:
+            nodes[player] += ai.search_engine.nodes
+
+        if game_rules.is_forbidden(row, col, player) or not board.place(row, col, player):
+            winner = 3 - player  # 둘 수 없는 곳(금수 포함)에 두면 패배
+            break
+        if game_rules.is_win(row, col, player):
+            winner = player
+            break
+        player = 3 - player
+
+    return {
+        "winner": winner,
+        "moves": len(board.history),
+        "record": list(board.history),
+        "latencies": latencies,
+        "nodes": nodes,
+    }
+
+
+def _play_task(task: Tuple) -> Dict:
+    index, config_a, config_b, seed, size, opening_moves, rules = task
+    # 색을 번갈아 가며 둔다
+    if index % 2 == 0:
+        result = play_game(config_a, config_b, seed, size, opening_moves, rules=rules)
+        sides = {"a": 1, "b": 2}
+    else:
+        result = play_game(config_b, config_a, seed, size, opening_moves, rules=rules)
+        sides = {"a": 2, "b": 1}
+    result["sides"] = sides
+    return result
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    data = np.array(values) * 1000
+    p50, p90, p99 = np.percentile(data, [50, 90, 99])
+    return {"p50": float(p50), "p90": float(p90), "p99": float(p99), "max": float(data.max())}
+
+
+def play_games(config_a: Dict, config_b: Dict, games: int = 10, workers: Optional[int] = None,
+               size: int = 15, opening_moves: int = 2, seed: int = 0, rules: str = "freestyle") -> List[Dict]:
+    """두 AI 설정으로 games판을 (색을 번갈아) 두고 판별 결과를 반환"""
+    tasks = [(i, config_a, config_b, seed + i, size, opening_moves, rules) for i in range(games)]
+    if workers == 1:
+        return [_play_task(task) for task in tasks]
+    with Pool(workers) as pool:
+        return pool.map(_play_task, tasks, chunksize=1)
+
+
+def run_match(config_a: Dict, config_b: Dict, games: int = 10, workers: Optional[int] = None,
+              size: int = 15, opening_moves: int = 2, seed: int = 0, record_path: Optional[str] = None,
+              rules: str = "freestyle") -> Dict:
+    """두 AI 설정으로 games판을 두고 통계를 반환 (record_path를 주면 기보도 저장)"""
+    start = time.perf_counter()
+    results = play_games(config_a, config_b, games, workers, size, opening_moves, seed, rules)
+    elapsed = time.perf_counter() - start
+    if record_path:
+        write_records(record_path, (GameRecord(r["record"], size, r["winner"]) for r in results))
+
+    report = {"games": games, "draws": 0, "elapsed_s": elapsed,
+              "average_moves": float(np.mean([r["moves"] for r in results])) if results else 0.0}
+    for name, config in (("a", config_a), ("b", config_b)):
+        wins = sum(1 for r in results if r["winner"] == r["sides"][name])
+        latencies = [t for r in results for t in r["latencies"][r["sides"][name]]]
+        nodes = sum(r["nodes"][r["sides"][name]] for r in results)
+        think_time = sum(latencies)
+        report[name] = {
+            "config": config,
+            "wins": wins,
+            "win_rate": wins / games if games else 0.0,
+            "moves": len(latencies),
+            "nodes_per_sec": nodes / think_time if think_time else 0.0,
+            "latency_ms": percentiles(latencies),
+        }
+    report["draws"] = sum(1 for r in results if r["winner"] == 0)
+    return report
+
+
+def print_report(report: Dict):
+    print(f"{report['games']}판, 무승부 {report['draws']}, 평균 {report['average_moves']:.1f}수, "
+          f"{report['elapsed_s']:.1f}초")
+    for name in ("a", "b"):
+        side = report[name]
+        latency = side["latency_ms"]
+        unit = "플레이아웃/초" if side["config"]["difficulty"] == "mcts" else "노드/초"  # MCTS는 플레이아웃을 노드로 셈
+        print(f"  {name} {side['config']}: 승 {side['wins']} ({side['win_rate']:.1%}), "
+              f"{side['nodes_per_sec']:.0f} {unit}, 지연 p50 {latency['p50']:.1f}ms "
+              f"p90 {latency['p90']:.1f}ms p99 {latency['p99']:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI 대전 경기장")
+    parser.add_argument("--a", default="hard", help="AI A 설정 (예: hard:think_ms=200)")
+    parser.add_argument("--b", default="medium", help="AI B 설정")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--size", type=int, default=15)
+    parser.add_argument("--opening", type=int, default=2, help="무작위 시작 수 개수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    parser.add_argument("--record", help="모든 판의 기보를 이 파일(이진 기보)에 저장")
+    parser.add_argument("--rules", choices=["freestyle", "renju"], default="freestyle")
+    args = parser.parse_args()
+
+    report = run_match(parse_config(args.a), parse_config(args.b), args.games, args.workers,
+                       args.size, args.opening, args.seed, args.record, args.rules)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
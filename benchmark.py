@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+보드/AI 핵심 경로 마이크로 벤치마크
+고정된 시드로 만든 중반/종반 국면 모음에서 함수별 초당 호출 수와 지연 시간 분포를 잽니다.
+
+사용 예:
+    python benchmark.py --save baseline.json
+    python benchmark.py --compare baseline.json --threshold 0.15
+    python benchmark.py --sizes 15,19,50   (같은 돌 수의 국면을 보드 크기별로 - 수당 비용이 크기와 무관한지 확인)
+    python benchmark.py --startup          (게임 창/터미널 모드의 시작 시간을 목표와 비교)
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import numpy as np
+from typing import Callable, Dict, List, Tuple
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from ai import AI
+from bitboard import BitBoard
+from board import Board
+
+CORPUS_SEED = 12345
+STAGES = {"mid": 30, "late": 100}  # 국면별 돌 수
+SCALING_STONES = 30  # 크기별 비교에서 모든 보드에 놓는 돌 수
+BATCH_SIZES = (1, 64, 256)
+# 시작 시간 목표(ms) - 프로세스 시작부터 첫 화면(창), 첫 입력 대기(터미널)까지
+STARTUP_TARGETS_MS = {"gui": 600, "headless": 300}
+
+
+def make_position(stones: int, rng: random.Random, size: int = 15) -> BitBoard:
+    """중앙 근처에서 시작해 이웃 칸에 번갈아 둔 무작위 국면 (5목은 만들지 않음)"""
+    board = BitBoard(size)
+    center = size // 2
+    board.place(center, center, 1)
+    player = 2
+    while len(board.history) < stones:
+        row, col = rng.choice(sorted(board.candidates))
+        if board.would_be_five(row, col, player):
+            continue
+        board.place(row, col, player)
+        player = 3 - player
+    return board
+
+
+def make_corpus(positions: int = 8, size: int = 15) -> Dict[str, List[BitBoard]]:
+    rng = random.Random(CORPUS_SEED)
+    return {stage: [make_position(stones, rng, size) for _ in range(positions)]
+            for stage, stones in STAGES.items()}
+
+
+def _board_from(position: BitBoard) -> Board:
+    board = Board(position.size)
+    for row, col in position.history:
+        board.place_stone(row, col, int(position.grid[row, col]))
+    return board
+
+
+def cases(position: BitBoard) -> Dict[str, Callable[[], object]]:
+    """측정할 함수들 - 같은 국면에서 반복 호출"""
+    board = _board_from(position)
+    grid = position.grid.copy()
+    last_row, last_col = position.history[-1]
+    last_player = int(grid[last_row, last_col])
+    empty = [tuple(cell) for cell in np.argwhere(grid == 0)]
+    row, col = empty[len(empty) // 2]
+    player = 3 - last_player
+    ai = AI(player)
+
+    def place_undo():
+        position.place(row, col, player)
+        position.undo()
+
+    return {
+        "BitBoard.place+undo": place_undo,
+        "Board.check_winner": lambda: board.check_winner(last_row, last_col, last_player),
+        "Board.is_full": lambda: board.is_full(),
+        "BitBoard.would_be_five": lambda: position.would_be_five(row, col, player),
+        "AI.get_available_moves": lambda: ai.get_available_moves(grid),
+        "AI.make_move": lambda: ai.make_move(grid),
+    }
+
+
+def measure(func: Callable[[], object], min_time: float) -> List[float]:
+    """min_time 초 이상 반복해 호출별 시간(초) 목록을 반환"""
+    func()  # 캐시 준비
+    samples = []
+    clock = time.perf_counter
+    deadline = clock() + min_time
+    while clock() < deadline or len(samples) < 5:
+        start = clock()
+        func()
+        samples.append(clock() - start)
+    return samples
+
+
+def summarize(values: List[float], ops_per_call: int = 1) -> Dict:
+    data = np.array(values) * 1e6
+    p50, p90, p99 = np.percentile(data, [50, 90, 99])
+    return {
+        "ops_per_sec": ops_per_call * len(values) / sum(values),
+        "p50_us": float(p50),
+        "p90_us": float(p90),
+        "p99_us": float(p99),
+        "calls": len(values),
+    }
+
+
+def run(positions: int = 8, min_time: float = 0.05) -> Dict[str, Dict]:
+    corpus = make_corpus(positions)
+    results = {}
+    for stage, boards in corpus.items():
+        samples: Dict[str, List[float]] = {}
+        for position in boards:
+            for name, func in cases(position).items():
+                samples.setdefault(name, []).extend(measure(func, min_time))
+        for name, values in samples.items():
+            results[f"{name}[{stage}]"] = summarize(values)
+
+    # 묶음 API - 초당 호출 수는 보드 수 기준
+    boards = np.stack([position.grid for positions in corpus.values() for position in positions])
+    ai = AI(2)
+    for batch in BATCH_SIZES:
+        stack = np.resize(boards, (batch,) + boards.shape[1:])
+        values = measure(lambda: ai.make_moves_batch(stack), min_time * len(boards))
+        results[f"AI.make_moves_batch[N={batch}]"] = summarize(values, batch)
+    return results
+
+
+def run_scaling(sizes: List[int], positions: int = 8, min_time: float = 0.05) -> Dict[str, Dict]:
+    """같은 국면을 보드 크기별로 가운데에 옮겨 놓고 측정 - 결과 이름은 '함수[NxN]'"""
+    rng = random.Random(CORPUS_SEED)
+    base_size = min(sizes)
+    corpus = [make_position(SCALING_STONES, rng, base_size) for _ in range(positions)]
+    results = {}
+    for size in sizes:
+        shift = size // 2 - base_size // 2
+        samples: Dict[str, List[float]] = {}
+        for base in corpus:
+            position = BitBoard(size)
+            for row, col in base.history:
+                position.place(row + shift, col + shift, int(base.grid[row, col]))
+            for name, func in cases(position).items():
+                samples.setdefault(name, []).extend(measure(func, min_time))
+        for name, values in samples.items():
+            results[f"{name}[{size}x{size}]"] = summarize(values)
+    return results
+
+
+def run_startup(repeat: int = 5) -> Dict[str, Dict]:
+    """main.py를 새 프로세스로 repeat번 띄워 시작 시간을 잼 (창은 SDL 더미 드라이버로)"""
+    main_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    commands = {"gui": [sys.executable, main_path, "--startup-time"],
+                "headless": [sys.executable, main_path, "--headless", "--startup-time"]}
+    results = {}
+    for name, command in commands.items():
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            times.append((time.perf_counter() - start) * 1000)
+        times.sort()
+        results[name] = {"median_ms": times[len(times) // 2], "min_ms": times[0], "max_ms": times[-1],
+                         "target_ms": STARTUP_TARGETS_MS[name]}
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[Tuple[str, float]]:
+    """기준보다 초당 호출 수가 threshold 비율 이상 떨어진 항목"""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        change = result["ops_per_sec"] / baseline[name]["ops_per_sec"] - 1
+        if change < -threshold:
+            regressions.append((name, change))
+    return regressions
+
+
+def print_results(results: Dict[str, Dict], baseline: Dict[str, Dict] = None):
+    print(f"{'함수':<32} {'호출/초':>12} {'p50(us)':>10} {'p90(us)':>10} {'p99(us)':>10} {'변화':>8}")
+    for name, result in results.items():
+        change = ""
+        if baseline and name in baseline:
+            change = f"{result['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1:+.1%}"
+        print(f"{name:<32} {result['ops_per_sec']:>12.0f} {result['p50_us']:>10.1f} "
+              f"{result['p90_us']:>10.1f} {result['p99_us']:>10.1f} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="보드/AI 마이크로 벤치마크")
+    parser.add_argument("--positions", type=int, default=8, help="단계별 국면 수")
+    parser.add_argument("--min-time", type=float, default=0.05, help="국면/함수별 최소 측정 시간(초)")
+    parser.add_argument("--save", help="결과를 기준 JSON으로 저장")
+    parser.add_argument("--compare", help="기준 JSON과 비교")
+    parser.add_argument("--threshold", type=float, default=0.15, help="회귀로 볼 초당 호출 수 감소 비율")
+    parser.add_argument("--sizes", help="보드 크기별 비교 (예: 15,19,50)")
+    parser.add_argument("--startup", action="store_true", help="게임 창/터미널 모드 시작 시간을 목표와 비교")
+    parser.add_argument("--repeat", type=int, default=5, help="--startup에서 띄울 횟수")
+    args = parser.parse_args()
+
+    if args.startup:
+        slow = []
+        for name, result in run_startup(args.repeat).items():
+            print(f"{name:10s} 중앙값 {result['median_ms']:6.0f}ms (최소 {result['min_ms']:.0f}, 최대 {result['max_ms']:.0f}), "
+                  f"목표 {result['target_ms']}ms")
+            if result["median_ms"] > result["target_ms"]:
+                slow.append(name)
+        if slow:
+            print(f"목표 초과: {', '.join(slow)}")
+            sys.exit(1)
+        return
+
+    if args.sizes:
+        results = run_scaling([int(size) for size in args.sizes.split(",")], args.positions, args.min_time)
+    else:
+        results = run(args.positions, args.min_time)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"기준 저장: {args.save}")
+
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+        for name, change in regressions:
+            print(f"회귀: {name} {change:+.1%}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
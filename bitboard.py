@@ -0,0 +1,283 @@
+import numpy as np
+from functools import lru_cache
+from typing import List, Set, Tuple
+from zobrist import zobrist_keys
+
+# 5칸 윈도우 안에 상대 돌 없이 내 돌이 k개 있을 때의 점수
+WINDOW_SCORES = (0, 1, 10, 100, 1000, 100000)
+
+# 방향 번호: 0 가로, 1 세로, 2 대각선 ↘, 3 대각선 ↙
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+
+@lru_cache(maxsize=1 << 18)
+def line_value(mine: int, theirs: int, valid: int) -> int:
+    """한 줄(비트열)에서 내 돌이 만드는 5칸 윈도우 점수의 합"""
+    score = 0
+    while valid >> 4:
+        if valid & 0x1F == 0x1F and theirs & 0x1F == 0:
+            score += WINDOW_SCORES[bin(mine & 0x1F).count("1")]
+        mine >>= 1
+        theirs >>= 1
+        valid >>= 1
+    return score
+
+
+def _segment(bits: int, pos: int) -> int:
+    """pos를 가운데(비트 4)로 한 9칸 - pos를 지나는 5칸 윈도우는 모두 이 안에 있음"""
+    shift = pos - 4
+    if shift >= 0:
+        return (bits >> shift) & 0x1FF
+    return (bits << -shift) & 0x1FF
+
+
+def _line_index(size: int, d: int, row: int, col: int) -> Tuple[int, int]:
+    if d == 0:
+        return row, col
+    if d == 1:
+        return col, row
+    if d == 2:
+        return row - col + size - 1, col
+    return row + col, col
+
+
+@lru_cache(maxsize=None)
+def _valid_masks(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """방향별 줄마다 보드 안에 있는 칸의 비트열 (크기마다 한 번만 만들고 모든 보드가 같이 씀)"""
+    line_counts = [size, size, 2 * size - 1, 2 * size - 1]
+    valid = [[0] * n for n in line_counts]
+    for row in range(size):
+        for col in range(size):
+            for d in range(4):
+                index, pos = _line_index(size, d, row, col)
+                valid[d][index] |= 1 << pos
+    return tuple(tuple(masks) for masks in valid)
+
+
+@lru_cache(maxsize=None)
+def _neighbor_table(size: int, radius: int) -> Tuple[Tuple[Tuple[Tuple[int, int], ...], ...], ...]:
+    """칸마다 반경 안의 이웃 칸들 (크기/반경마다 한 번만 만듦)"""
+    def around(row: int, col: int) -> Tuple[Tuple[int, int], ...]:
+        return tuple((r, c)
+                     for r in range(max(0, row - radius), min(size, row + radius + 1))
+                     for c in range(max(0, col - radius), min(size, col + radius + 1))
+                     if (r, c) != (row, col))
+    return tuple(tuple(around(row, col) for col in range(size)) for row in range(size))
+
+
+@lru_cache(maxsize=None)
+def _run_links(size: int) -> Tuple[Tuple[Tuple[int, ...], Tuple[int, ...]], ...]:
+    """방향별 (앞 칸, 뒤 칸) 번호표 - 칸 번호는 row * size + col, 보드 밖은 항상 0인 칸 size * size"""
+    outside = size * size
+    links = []
+    for dr, dc in DIRECTIONS:
+        def cell(row: int, col: int) -> int:
+            return row * size + col if 0 <= row < size and 0 <= col < size else outside
+        prev = tuple(cell(row - dr, col - dc) for row in range(size) for col in range(size))
+        nxt = tuple(cell(row + dr, col + dc) for row in range(size) for col in range(size))
+        links.append((prev, nxt))
+    return tuple(links)
+
+
+class BitBoard:
+    """줄 단위 비트열로 표현한 보드 (렌더링과 무관한 순수 규칙 코어)
+
+    각 플레이어마다 가로/세로/두 대각선의 모든 줄을 정수 비트열로 보관하고,
+    돌을 놓거나 무를 때 그 돌이 지나는 네 줄만 갱신한다.
+    """
+
+    def __init__(self, size: int = 15, candidate_radius: int = 1):
+        self.size = size
+        self.grid = np.zeros((size, size), dtype=np.int8)  # 기존 호출자를 위한 numpy 보기
+        self.history: List[Tuple[int, int]] = []
+
+        # 후보 수: 반경 안에 돌이 하나라도 있는 빈 칸 (돌을 놓고 무를 때마다 갱신)
+        self.candidate_radius = candidate_radius
+        self.near = [[0] * size for _ in range(size)]
+        self.candidates: Set[Tuple[int, int]] = set()
+        self._neighbors = _neighbor_table(size, candidate_radius)
+
+        line_counts = [size, size, 2 * size - 1, 2 * size - 1]
+        # lines[player][direction][index]
+        self.lines = [None] + [[[0] * n for n in line_counts] for _ in range(2)]
+        self.valid = _valid_masks(size)
+
+        # 연속 길이표: runs[player][direction][칸 번호] = 그 칸을 지나는 player 돌의 연속 길이 (내 돌이 아니면 0)
+        # 마지막 칸(size * size)은 보드 밖을 뜻하며 늘 0 - 승리/5목 확인은 표 몇 칸만 읽음
+        self.runs = [None] + [[[0] * (size * size + 1) for _ in range(4)] for _ in range(2)]
+        self._run_links = _run_links(size)
+        self.stones = 0
+
+        # 패턴 점수 합계 (플레이어별)
+        self.scores = [0, 0, 0]
+
+        # Zobrist 해시 - 돌을 놓고 무를 때마다 XOR로 갱신
+        self.zobrist = zobrist_keys(size)
+        self.hash = 0
+
+        # 금수 지도처럼 돌이 바뀔 때마다 갱신할 규칙 (rules.make_rules로 붙임, 없으면 None)
+        self.rules = None
+
+    @classmethod
+    def from_array(cls, board: np.ndarray, candidate_radius: int = 1) -> "BitBoard":
+        """numpy 보드로부터 생성"""
+        bitboard = cls(board.shape[0], candidate_radius)
+        for row, col in np.argwhere(board != 0):
+            bitboard.place(int(row), int(col), int(board[row, col]))
+        return bitboard
+
+    def line_index(self, d: int, row: int, col: int) -> Tuple[int, int]:
+        """(방향, 칸) -> (줄 번호, 줄 안의 비트 위치)"""
+        if d == 0:
+            return row, col
+        if d == 1:
+            return col, row
+        if d == 2:
+            return row - col + self.size - 1, col
+        return row + col, col
+
+    def get(self, row: int, col: int) -> int:
+        return int(self.grid[row, col])
+
+    def place(self, row: int, col: int, player: int) -> bool:
+        """돌을 놓기 (빈 칸이 아니면 False)"""
+        if not (0 <= row < self.size and 0 <= col < self.size) or self.grid[row, col] != 0:
+            return False
+        self._update_lines(row, col, player, True)
+        self._update_runs(row, col, player, True)
+        self.grid[row, col] = player
+        self.stones += 1
+        self.hash ^= self.zobrist[player][row][col]
+        self.history.append((row, col))
+
+        near = self.near
+        candidates = self.candidates
+        candidates.discard((row, col))
+        for r, c in self._neighbors[row][col]:
+            near[r][c] += 1
+            if self.grid[r, c] == 0:
+                candidates.add((r, c))
+        if self.rules is not None:
+            self.rules.changed(row, col)
+        return True
+
+    def undo(self) -> Tuple[int, int]:
+        """마지막 수 무르기"""
+        row, col = self.history.pop()
+        player = int(self.grid[row, col])
+        self._update_lines(row, col, player, False)
+        self._update_runs(row, col, player, False)
+        self.grid[row, col] = 0
+        self.stones -= 1
+        self.hash ^= self.zobrist[player][row][col]
+
+        near = self.near
+        candidates = self.candidates
+        for r, c in self._neighbors[row][col]:
+            near[r][c] -= 1
+            if near[r][c] == 0:
+                candidates.discard((r, c))
+        if near[row][col] > 0:
+            candidates.add((row, col))
+        if self.rules is not None:
+            self.rules.changed(row, col)
+        return row, col
+
+    def _update_lines(self, row: int, col: int, player: int, setting: bool):
+        # 점수 변화는 (row, col)을 지나는 윈도우에서만 생기므로 그 9칸만 본다 (보드 크기와 무관)
+        opponent = 3 - player
+        mine_lines = self.lines[player]
+        their_lines = self.lines[opponent]
+        scores = self.scores
+        for d in range(4):
+            index, pos = self.line_index(d, row, col)
+            mine_line = mine_lines[d][index]
+            mine = _segment(mine_line, pos)
+            theirs = _segment(their_lines[d][index], pos)
+            valid = _segment(self.valid[d][index], pos)
+            if setting:
+                new_mine = mine | 0x10
+                mine_lines[d][index] = mine_line | (1 << pos)
+            else:
+                new_mine = mine & ~0x10
+                mine_lines[d][index] = mine_line & ~(1 << pos)
+            scores[player] += line_value(new_mine, theirs, valid) - line_value(mine, theirs, valid)
+            scores[opponent] += line_value(theirs, new_mine, valid) - line_value(theirs, mine, valid)
+
+    def _update_runs(self, row: int, col: int, player: int, setting: bool):
+        # 바뀌는 것은 (row, col)이 잇거나 끊는 연속 돌뿐 - 방향마다 그 돌들의 길이만 다시 적음
+        cell = row * self.size + col
+        for run, (prev, nxt) in zip(self.runs[player], self._run_links):
+            if setting:
+                # 빈 칸 양옆의 연속은 그 칸에서 끝나므로 이웃 칸의 길이가 곧 그쪽 돌 수
+                back = run[prev[cell]]
+                ahead = run[nxt[cell]]
+                length = back + 1 + ahead
+            else:
+                length = run[cell]
+                if length == 1:
+                    run[cell] = 0
+                    continue
+                back = 0
+                c = prev[cell]
+                while run[c]:
+                    back += 1
+                    c = prev[c]
+                ahead = length - 1 - back
+            run[cell] = length if setting else 0
+            c = cell
+            for _ in range(back):
+                c = prev[c]
+                run[c] = length if setting else back
+            c = cell
+            for _ in range(ahead):
+                c = nxt[c]
+                run[c] = length if setting else ahead
+
+    def run_length(self, row: int, col: int, player: int, d: int) -> int:
+        """d 방향으로 (row, col)을 지나는 player 돌의 연속 길이 (그 칸이 player 돌이 아니면 0)"""
+        return self.runs[player][d][row * self.size + col]
+
+    def is_full(self) -> bool:
+        """빈 칸이 없는지"""
+        return self.stones == self.size * self.size
+
+    def move_gain(self, row: int, col: int, player: int) -> Tuple[int, int]:
+        """(row, col)에 player가 둘 때 (내 점수 변화, 상대 점수 변화) - 보드는 바꾸지 않음"""
+        opponent = 3 - player
+        mine_delta = 0
+        theirs_delta = 0
+        for d in range(4):
+            index, pos = self.line_index(d, row, col)
+            mine = _segment(self.lines[player][d][index], pos)
+            theirs = _segment(self.lines[opponent][d][index], pos)
+            valid = _segment(self.valid[d][index], pos)
+            new_mine = mine | 0x10
+            mine_delta += line_value(new_mine, theirs, valid) - line_value(mine, theirs, valid)
+            theirs_delta += line_value(theirs, new_mine, valid) - line_value(theirs, mine, valid)
+        return mine_delta, theirs_delta
+
+    def is_five(self, row: int, col: int, player: int) -> bool:
+        """(row, col)을 지나는 5목 이상이 있는지 확인 (연속 길이표 네 칸만 읽음)"""
+        cell = row * self.size + col
+        for run in self.runs[player]:
+            if run[cell] >= 5:
+                return True
+        return False
+
+    def would_be_five(self, row: int, col: int, player: int) -> bool:
+        """빈 칸 (row, col)에 player가 두면 5목이 되는지 확인 - 양옆 연속 길이의 합으로 판단"""
+        cell = row * self.size + col
+        for run, (prev, nxt) in zip(self.runs[player], self._run_links):
+            if run[prev[cell]] + run[nxt[cell]] >= 4:
+                return True
+        return False
+
+    def evaluate(self, player: int) -> int:
+        """player 입장의 패턴 점수 차"""
+        return self.scores[player] - self.scores[3 - player]
+
+    def reset(self):
+        """보드 초기화"""
+        while self.history:
+            self.undo()
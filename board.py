@@ -1,12 +1,17 @@
 import pygame
 import numpy as np
-from typing import Tuple, Optional
+from typing import List, Set, Tuple, Optional
+from bitboard import BitBoard
+from game_record import GameRecord
+from rules import make_rules
 
 class Board:
-    def __init__(self, size: int = 15):
+    def __init__(self, size: int = 15, rules: str = "freestyle"):
         self.size = size
-        self.board = np.zeros((size, size), dtype=int)
-        self.cell_size = 40
+        self.core = BitBoard(size)  # 줄 단위 비트열 보드 코어 (둔 수 스택은 core.history)
+        self.rules = make_rules(rules, self.core)  # 승리/금수 규칙 (자유룰, 렌주룰)
+        self.redo_stack: List[Tuple[int, int, int]] = []  # 무른 수 (row, col, player) - 새 수를 두면 비움
+        self.cell_size = max(12, min(40, 760 // size))  # 큰 보드는 칸을 줄여 화면에 맞춤
         self.margin = 50
         self.board_width = size * self.cell_size
         self.board_height = size * self.cell_size
@@ -22,6 +27,18 @@ class Board:
         }
         self.stone_shadow_color = (100, 100, 100)
         
+        # 렌더링 캐시 - 빈 보드판과 돌 표면은 한 번만 그리고, 마지막으로 그린 보드와 비교해 바뀐 칸만 갱신
+        self._background: Optional[pygame.Surface] = None
+        self._stone_surfaces = {}
+        self._drawn: Optional[np.ndarray] = None
+        self._drawn_marks: Set[Tuple[int, int]] = set()  # 마지막으로 그린 금수 표시
+        self.forbidden_color = (220, 40, 40)
+    
+    @property
+    def board(self) -> np.ndarray:
+        """기존 호출자를 위한 numpy 보기 (수정은 place_stone/undo로만)"""
+        return self.core.grid
+        
     def get_cell_from_pos(self, pos: Tuple[int, int]) -> Optional[Tuple[int, int]]:
         """마우스 위치를 보드 좌표로 변환 - 격자선 교차점 기준"""
         x, y = pos
@@ -41,51 +58,64 @@ class Board:
         return (x, y)
     
     def place_stone(self, row: int, col: int, player: int) -> bool:
-        """돌을 놓기"""
-        if 0 <= row < self.size and 0 <= col < self.size and self.board[row, col] == 0:
-            self.board[row, col] = player
-            return True
-        return False
+        """돌을 놓기 - 금수 자리면 False (새 수를 두면 다시 두기 스택은 비워짐)"""
+        if self.rules.is_forbidden(row, col, player) or not self.core.place(row, col, player):
+            return False
+        self.redo_stack.clear()
+        return True
+    
+    def undo(self) -> Optional[Tuple[int, int, int]]:
+        """마지막 수 무르기 - 무른 수 (row, col, player), 둔 수가 없으면 None"""
+        if not self.core.history:
+            return None
+        row, col = self.core.history[-1]
+        player = int(self.core.grid[row, col])
+        self.core.undo()
+        self.redo_stack.append((row, col, player))
+        return row, col, player
+    
+    def redo(self) -> Optional[Tuple[int, int, int]]:
+        """무른 수 다시 두기 - 다시 둔 수 (row, col, player), 없으면 None"""
+        if not self.redo_stack:
+            return None
+        row, col, player = self.redo_stack.pop()
+        self.core.place(row, col, player)
+        return row, col, player
+    
+    @property
+    def moves(self) -> List[Tuple[int, int, int]]:
+        """둔 순서대로 (row, col, player)"""
+        grid = self.core.grid
+        return [(row, col, int(grid[row, col])) for row, col in self.core.history]
+    
+    def to_record(self, winner: Optional[int] = None) -> GameRecord:
+        """지금까지 둔 수의 기보"""
+        return GameRecord(list(self.core.history), self.size, winner)
     
     def check_winner(self, row: int, col: int, player: int) -> bool:
-        """승리 조건 확인"""
-        directions = [
-            (0, 1),   # 가로
-            (1, 0),   # 세로
-            (1, 1),   # 대각선 ↘
-            (1, -1)   # 대각선 ↙
-        ]
-        
-        for dr, dc in directions:
-            count = 1
-            
-            # 정방향 확인
-            r, c = row + dr, col + dc
-            while 0 <= r < self.size and 0 <= c < self.size and self.board[r, c] == player:
-                count += 1
-                r += dr
-                c += dc
-            
-            # 역방향 확인
-            r, c = row - dr, col - dc
-            while 0 <= r < self.size and 0 <= c < self.size and self.board[r, c] == player:
-                count += 1
-                r -= dr
-                c -= dc
-            
-            if count >= 5:
-                return True
-        
-        return False
+        """승리 조건 확인 - (row, col)의 네 방향 연속 길이만 읽음 (렌주룰의 흑은 정확히 5목)"""
+        return self.rules.is_win(row, col, player)
+    
+    def set_rules(self, name: str):
+        """규칙 바꾸기 - 금수 지도는 현재 돌 배치로 새로 시작"""
+        if name != self.rules.name:
+            self.rules = make_rules(name, self.core)
+            self.invalidate()
+    
+    def forbidden_points(self) -> Set[Tuple[int, int]]:
+        """흑의 금수 자리 (자유룰이면 빈 집합)"""
+        return self.rules.forbidden_points()
     
     def is_full(self) -> bool:
-        """보드가 가득 찼는지 확인"""
-        return np.all(self.board != 0)
+        """보드가 가득 찼는지 확인 (코어가 세는 돌 수로)"""
+        return self.core.is_full()
     
-    def draw(self, screen: pygame.Surface):
-        """3D 효과가 있는 보드 그리기"""
+    def _build_background(self) -> pygame.Surface:
+        """빈 보드판(배경, 그림자, 격자)을 한 번만 그려 둔 표면"""
+        surface = pygame.Surface((self.screen_width, self.screen_height))
+        
         # 배경
-        screen.fill((34, 139, 34))  # 초록색 배경
+        surface.fill((34, 139, 34))  # 초록색 배경
         
         # 3D 보드판 그리기
         board_rect = pygame.Rect(
@@ -102,42 +132,36 @@ class Board:
             self.board_width + 10, 
             self.board_height + 10
         )
-        pygame.draw.rect(screen, (100, 100, 100), shadow_rect)
+        pygame.draw.rect(surface, (100, 100, 100), shadow_rect)
         
         # 보드판
-        pygame.draw.rect(screen, self.board_color, board_rect)
+        pygame.draw.rect(surface, self.board_color, board_rect)
         
         # 격자 그리기
         for i in range(self.size + 1):
             # 세로선
             start_pos = (self.margin + i * self.cell_size, self.margin)
             end_pos = (self.margin + i * self.cell_size, self.margin + self.board_height)
-            pygame.draw.line(screen, self.grid_color, start_pos, end_pos, 2)
+            pygame.draw.line(surface, self.grid_color, start_pos, end_pos, 2)
             
             # 가로선
             start_pos = (self.margin, self.margin + i * self.cell_size)
             end_pos = (self.margin + self.board_width, self.margin + i * self.cell_size)
-            pygame.draw.line(screen, self.grid_color, start_pos, end_pos, 2)
+            pygame.draw.line(surface, self.grid_color, start_pos, end_pos, 2)
         
-        # 돌 그리기
-        for row in range(self.size):
-            for col in range(self.size):
-                if self.board[row, col] != 0:
-                    self.draw_stone(screen, row, col, self.board[row, col])
+        return surface
     
-    def draw_stone(self, screen: pygame.Surface, row: int, col: int, player: int):
-        """3D 효과가 있는 돌 그리기 - 격자선 교차점에 놓기"""
-        # 돌을 격자선 교차점에 놓기
-        x = self.margin + col * self.cell_size
-        y = self.margin + row * self.cell_size
+    def _build_stone_surface(self, player: int) -> pygame.Surface:
+        """3D 효과가 있는 돌(그림자 포함)을 한 번만 그려 둔 투명 표면"""
         radius = self.cell_size // 2 - 2
+        center = radius + 2
+        surface = pygame.Surface((2 * radius + 7, 2 * radius + 7), pygame.SRCALPHA)
         
         # 돌 그림자
         shadow_radius = radius + 2
-        pygame.draw.circle(screen, self.stone_shadow_color, (x + 2, y + 2), shadow_radius)
+        pygame.draw.circle(surface, self.stone_shadow_color, (center + 2, center + 2), shadow_radius)
         
         # 돌 그라데이션 효과
-        color = self.stone_colors[player]
         for i in range(3):
             current_radius = radius - i * 2
             if current_radius > 0:
@@ -149,7 +173,7 @@ class Board:
                     brightness = max(200, 255 - i * 15)
                     current_color = (brightness, brightness, brightness)
                 
-                pygame.draw.circle(screen, current_color, (x, y), current_radius)
+                pygame.draw.circle(surface, current_color, (center, center), current_radius)
         
         # 돌 하이라이트
         highlight_radius = radius // 3
@@ -159,9 +183,86 @@ class Board:
         else:  # 흰 돌
             highlight_color = (200, 200, 200)
         
-        pygame.draw.circle(screen, highlight_color, 
-                         (x - highlight_offset, y - highlight_offset), highlight_radius)
+        pygame.draw.circle(surface, highlight_color, 
+                         (center - highlight_offset, center - highlight_offset), highlight_radius)
+        return surface
+    
+    def invalidate(self):
+        """다음 draw에서 전체를 다시 그리도록 표시"""
+        self._drawn = None
+    
+    def stone_rect(self, row: int, col: int) -> pygame.Rect:
+        """돌(그림자 포함)이 차지하는 화면 영역"""
+        x, y = self.get_stone_center(row, col)
+        center = self.cell_size // 2
+        size = 2 * (self.cell_size // 2 - 2) + 7
+        return pygame.Rect(x - center, y - center, size, size)
+    
+    def draw(self, screen: pygame.Surface, full: bool = False,
+             marks: Set[Tuple[int, int]] = frozenset()) -> List[pygame.Rect]:
+        """3D 효과가 있는 보드 그리기 - 바뀐 칸만 다시 그리고 갱신된 영역을 반환
+
+        marks: 금수 표시를 할 빈 칸들
+        """
+        if self._background is None:
+            self._background = self._build_background()
+            self._stone_surfaces = {player: self._build_stone_surface(player) for player in self.stone_colors}
+        
+        grid = self.board
+        if full or self._drawn is None or self._drawn.shape != grid.shape:
+            screen.blit(self._background, (0, 0))
+            for row, col in np.argwhere(grid != 0):
+                self.draw_stone(screen, row, col, grid[row, col])
+            self._drawn_marks = set(marks)
+            for row, col in self._drawn_marks:
+                self.draw_mark(screen, row, col)
+            self._drawn = grid.copy()
+            return [screen.get_rect()]
+        
+        dirty = []
+        changed = {(int(row), int(col)) for row, col in np.argwhere(grid != self._drawn)}
+        if marks != self._drawn_marks:
+            changed |= marks ^ self._drawn_marks
+            self._drawn_marks = set(marks)
+        for row, col in changed:
+            dirty.append(self.redraw_area(screen, self.stone_rect(row, col)))
+        if dirty:
+            self._drawn = grid.copy()
+        return dirty
+    
+    def redraw_area(self, screen: pygame.Surface, rect: pygame.Rect) -> pygame.Rect:
+        """화면의 한 영역을 빈 보드판과 그 위의 돌로 다시 그리기"""
+        screen.set_clip(rect)
+        screen.blit(self._background, rect, rect)
+        # 영역에 걸친 돌들을 원래 그리는 순서(행 우선)대로
+        first_row = max(0, (rect.top - self.margin) // self.cell_size - 1)
+        last_row = min(self.size - 1, (rect.bottom - self.margin) // self.cell_size + 1)
+        first_col = max(0, (rect.left - self.margin) // self.cell_size - 1)
+        last_col = min(self.size - 1, (rect.right - self.margin) // self.cell_size + 1)
+        grid = self.board
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                if grid[row, col] != 0:
+                    self.draw_stone(screen, row, col, grid[row, col])
+                elif (row, col) in self._drawn_marks:
+                    self.draw_mark(screen, row, col)
+        screen.set_clip(None)
+        return rect
+    
+    def draw_stone(self, screen: pygame.Surface, row: int, col: int, player: int):
+        """3D 효과가 있는 돌 그리기 - 격자선 교차점에 미리 그려 둔 돌을 붙임"""
+        x, y = self.get_stone_center(row, col)
+        center = self.cell_size // 2
+        screen.blit(self._stone_surfaces[int(player)], (x - center, y - center))
+    
+    def draw_mark(self, screen: pygame.Surface, row: int, col: int):
+        """금수 자리 표시 (빨간 X)"""
+        x, y = self.get_stone_center(row, col)
+        half = self.cell_size // 5
+        pygame.draw.line(screen, self.forbidden_color, (x - half, y - half), (x + half, y + half), 3)
+        pygame.draw.line(screen, self.forbidden_color, (x - half, y + half), (x + half, y - half), 3)
     
     def reset(self):
         """보드 초기화"""
-        self.board = np.zeros((self.size, self.size), dtype=int) 
\ No newline at end of file
+        self.core.reset()
+        self.redo_stack.clear() 
\ No newline at end of file
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공유 메모리 보드 풀 (여러 프로세스의 AI 작업자용)
+보드 슬롯 묶음을 multiprocessing.shared_memory 한 블록에 두어, 작업 프로세스가 국면을 복사 없이 읽고
+고른 수와 점수를 결과 칸에 바로 씁니다. 작업마다 넘기는 것은 풀 정보(spec)와 슬롯 번호뿐입니다.
+
+블록 구성 (슬롯 수 N, 보드 크기 S):
+    grids   int8  (N, S, S)   돌 배치 (0 빈 칸, 1 흑, 2 백)
+    moves   int16 (N, S*S)    둔 순서대로 칸 번호 (row * S + col)
+    counts  int16 (N,)        둔 수 개수
+    players int8  (N,)        둘 차례
+    results (N,)              row, col (int16), score (float32, 없으면 NaN), state (int8)
+
+사용 예 (작업 하나를 보낼 때 보드를 피클로 넘기는 것과 슬롯 번호만 넘기는 것의 비교):
+    python board_pool.py --size 15 --tasks 20000 --workers 4
+"""
+
+import argparse
+import math
+import os
+import time
+import weakref
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+from bitboard import BitBoard
+
+# 결과 칸의 상태
+EMPTY, PENDING, DONE = 0, 1, 2
+
+RESULT_DTYPE = np.dtype([("row", np.int16), ("col", np.int16), ("score", np.float32), ("state", np.int8)])
+
+# 작업 프로세스마다 지금 쓰는 풀에 한 번만 붙음 (공유 메모리 이름 -> 풀)
+_attached: Dict[str, "BoardPool"] = {}
+# 이 프로세스에 있는 모든 풀 (fork로 물려받은 주인 풀 포함)
+_pools: "weakref.WeakSet[BoardPool]" = weakref.WeakSet()
+
+
+def _layout(slots: int, size: int) -> List[Tuple[str, np.dtype, Tuple[int, ...]]]:
+    cells = size * size
+    return [("grids", np.dtype(np.int8), (slots, size, size)),
+            ("moves", np.dtype(np.int16), (slots, cells)),
+            ("counts", np.dtype(np.int16), (slots,)),
+            ("players", np.dtype(np.int8), (slots,)),
+            ("results", RESULT_DTYPE, (slots,))]
+
+
+class BoardPool:
+    """공유 메모리에 둔 보드 슬롯 묶음
+
+    만든 프로세스(주인)가 빈 슬롯을 빌려(acquire) 국면을 쓰고(write), 작업 프로세스는 spec으로
+    붙어서(attach) 그 슬롯을 읽고 결과를 쓴다(set_result). 한 슬롯은 한 번에 한 작업만 쓴다.
+    """
+
+    def __init__(self, slots: int, size: int = 15, name: Optional[str] = None):
+        self.slots = slots
+        self.size = size
+        self.owner = name is None
+        layout = _layout(slots, size)
+        nbytes = sum(dtype.itemsize * math.prod(shape) for _, dtype, shape in layout)
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=nbytes)
+        offset = 0
+        for field, dtype, shape in layout:
+            setattr(self, field, np.ndarray(shape, dtype, buffer=self.shm.buf, offset=offset))
+            offset += dtype.itemsize * math.prod(shape)
+        self._free = list(range(slots - 1, -1, -1))
+        self._closed = False
+        self._pid = os.getpid()  # 만든 프로세스 - fork로 물려받은 자식은 공유 메모리를 지우지 않음
+        _pools.add(self)
+        # 주인은 close()를 부르지 못하고 끝나도(중단 등) 프로세스가 끝날 때 공유 메모리를 지움
+        self._unlink = weakref.finalize(self, self.shm.unlink) if self.owner else None
+        if self.owner:
+            self.grids.fill(0)
+            self.counts.fill(0)
+            self.results["state"] = EMPTY
+
+    @property
+    def spec(self) -> Tuple[str, int, int]:
+        """작업 프로세스에 넘길 (공유 메모리 이름, 슬롯 수, 보드 크기)"""
+        return self.shm.name, self.slots, self.size
+
+    @classmethod
+    def attach(cls, spec: Tuple[str, int, int]) -> "BoardPool":
+        """다른 프로세스가 만든 풀에 붙음 (프로세스마다 한 번만 붙고 이후에는 같은 풀을 돌려줌)
+
+        다른 이름의 풀이 오면 주인이 풀을 새로 만든 것이므로, 전에 붙었거나 fork로 물려받은 풀에서는 떨어진다.
+        """
+        name, slots, size = spec
+        pool = _attached.get(name)
+        if pool is None:
+            for stale in list(_pools):
+                if not stale.owner or stale._pid != os.getpid():
+                    stale.close()
+            _attached.clear()
+            pool = _attached[name] = cls(slots, size, name)
+        return pool
+
+    def acquire(self) -> Optional[int]:
+        """빈 슬롯 번호 (모두 쓰는 중이면 None) - 주인 프로세스에서만"""
+        return self._free.pop() if self._free else None
+
+    def release(self, slot: int):
+        self.results[slot]["state"] = EMPTY
+        self._free.append(slot)
+
+    def write(self, slot: int, board: BitBoard, player: int):
+        """슬롯에 국면과 둘 차례를 쓰고 결과 칸을 기다림 상태로"""
+        count = len(board.history)
+        self.grids[slot] = board.grid
+        if count:
+            self.moves[slot, :count] = [row * self.size + col for row, col in board.history]
+        self.counts[slot] = count
+        self.players[slot] = player
+        self.results[slot] = (-1, -1, np.nan, PENDING)
+
+    def grid(self, slot: int) -> np.ndarray:
+        """슬롯의 돌 배치 - 공유 메모리를 그대로 보는 읽기 전용 배열"""
+        view = self.grids[slot]
+        view.flags.writeable = False
+        return view
+
+    def player(self, slot: int) -> int:
+        return int(self.players[slot])
+
+    def history(self, slot: int) -> List[Tuple[int, int]]:
+        """둔 순서대로 (row, col)"""
+        return [divmod(int(cell), self.size) for cell in self.moves[slot, :self.counts[slot]]]
+
+    def position(self, slot: int) -> BitBoard:
+        """슬롯의 국면을 둔 순서대로 다시 둔 BitBoard"""
+        board = BitBoard(self.size)
+        grid = self.grids[slot]
+        for row, col in self.history(slot):
+            board.place(row, col, int(grid[row, col]))
+        return board
+
+    def set_result(self, slot: int, row: int, col: int, score: Optional[float] = None):
+        """작업 프로세스가 고른 수와 점수를 씀 (상태는 마지막에 바꿈)"""
+        result = self.results[slot:slot + 1]
+        result["row"] = row
+        result["col"] = col
+        result["score"] = np.nan if score is None else score
+        result["state"] = DONE
+
+    def result(self, slot: int) -> Optional[Tuple[int, int, Optional[float]]]:
+        """(row, col, 점수) - 아직 결과가 없으면 None"""
+        row, col, score, state = self.results[slot].item()
+        if state != DONE:
+            return None
+        return row, col, None if math.isnan(score) else float(score)
+
+    def close(self):
+        """풀에서 떨어짐 - 주인이면 공유 메모리도 지움 (여러 번 불러도 됨)"""
+        if self._closed:
+            return
+        self._closed = True
+        for field, _, _ in _layout(self.slots, self.size):
+            setattr(self, field, None)
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # 밖에서 아직 슬롯 배열을 잡고 있음 - 매핑은 그 배열이 사라질 때 풀림
+        if self._unlink is not None:
+            if self._pid == os.getpid():
+                self._unlink()
+            else:
+                self._unlink.detach()
+
+    def __enter__(self) -> "BoardPool":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _count_copied(grid: np.ndarray) -> int:
+    return int(np.count_nonzero(grid))
+
+
+def _count_shared(spec: Tuple[str, int, int], slot: int) -> int:
+    pool = BoardPool.attach(spec)
+    count = int(np.count_nonzero(pool.grid(slot)))
+    pool.set_result(slot, count, 0)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="보드를 피클로 넘길 때와 공유 메모리 슬롯으로 넘길 때의 작업당 비용 비교")
+    parser.add_argument("--size", type=int, default=15, help="보드 크기")
+    parser.add_argument("--tasks", type=int, default=20000, help="보낼 작업 수")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    from multiprocessing import Pool
+    from benchmark import make_position
+    import random
+    position = make_position(min(60, args.size * args.size // 3), random.Random(0), args.size)
+    slots = 4 * args.workers
+    with BoardPool(slots, args.size) as boards, Pool(args.workers) as pool:
+        for slot in range(slots):
+            boards.write(slot, position, 1)
+        pool.map(_count_copied, [position.grid] * args.workers)  # 작업 프로세스 시작
+        start = time.perf_counter()
+        pool.map(_count_copied, [position.grid] * args.tasks, chunksize=1)
+        copied = time.perf_counter() - start
+        start = time.perf_counter()
+        pool.starmap(_count_shared, [(boards.spec, i % slots) for i in range(args.tasks)], chunksize=1)
+        shared = time.perf_counter() - start
+    print(f"{args.size}x{args.size}, 작업 {args.tasks}개, 프로세스 {args.workers}개")
+    print(f"  보드 피클: {copied / args.tasks * 1e6:.1f}us/작업")
+    print(f"  공유 슬롯: {shared / args.tasks * 1e6:.1f}us/작업 (x{copied / shared:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+오프닝 북 생성/확장 도구
+AI 자가 대국을 두고 처음 몇 수의 (대칭 정규화된 국면, 응수, 승패)를 모아 이진 북 파일로 저장합니다.
+
+사용 예:
+    python build_book.py --games 400 --workers 8 --depth 8
+    python build_book.py --games 200 --extend          # 기존 북에 더하기
+"""
+
+import argparse
+import os
+import numpy as np
+from typing import Dict, List
+from arena import parse_config, play_games
+from opening_book import DEFAULT_BOOK_PATH, OpeningBook
+
+
+def add_games(book: OpeningBook, results: List[Dict], depth: int, skip: int):
+    """판별 기보의 처음 depth수를 북에 기록 - 처음 skip수(무작위 시작 수)는 보드에만 놓고 기록하지 않음"""
+    for result in results:
+        grid = np.zeros((book.size, book.size), dtype=np.int8)
+        player = 1
+        for i, (row, col) in enumerate(result["record"][:depth]):
+            if i >= skip:
+                book.add(grid, player, row, col, result["winner"] == player)
+            grid[row, col] = player
+            player = 3 - player
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프닝 북 생성/확장")
+    parser.add_argument("--a", default="hard:think_ms=200,use_book=0", help="AI A 설정")
+    parser.add_argument("--b", default="hard:think_ms=200,use_book=0", help="AI B 설정")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--depth", type=int, default=8, help="북에 넣을 수 (판마다 처음 몇 수, 무작위 시작 수 포함)")
+    parser.add_argument("--opening", type=int, default=1,
+                        help="무작위 시작 수 개수 (북에는 넣지 않음 - 많을수록 같은 국면이 덜 반복됨)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=DEFAULT_BOOK_PATH)
+    parser.add_argument("--extend", action="store_true", help="기존 북에 더하기")
+    args = parser.parse_args()
+
+    size = 15
+    if args.extend and os.path.exists(args.out):
+        book = OpeningBook.load(args.out)
+        size = book.size
+    else:
+        book = OpeningBook(size)
+
+    results = play_games(parse_config(args.a), parse_config(args.b), args.games, args.workers,
+                         size, args.opening, args.seed)
+    add_games(book, results, args.depth, args.opening)
+    book.save(args.out)
+    print(f"{args.games}판 추가, 국면 {len(book)}개 -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple, Union
+from bitboard import BitBoard, WINDOW_SCORES
+from neural_net import PolicyValueNet, encode_planes
+
+WALL = 3  # 보드 바깥을 나타내는 값
+PAD = 4
+
+# 5칸 윈도우에 내 돌이 k개일 때 하나를 더 놓으면 늘어나는 점수 (k=5는 빈 칸이 없어 쓰이지 않음)
+GAIN_TABLE = np.array([WINDOW_SCORES[k + 1] - WINDOW_SCORES[k] for k in range(5)] + [0], dtype=np.int32)
+WINDOW_TABLE = np.array(WINDOW_SCORES, dtype=np.int64)
+
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+
+def _window_slice(n: int, dr: int, dc: int, i: int) -> Tuple[slice, slice]:
+    """패딩된 보드에서 모든 윈도우의 i번째 칸을 모은 슬라이스
+
+    윈도우 시작점은 원래 보드의 어떤 칸이든 덮을 수 있는 모든 위치 (방향 축으로 n + 4개).
+    """
+    base_r = 0 if dr else PAD
+    base_c = 0 if dc == 1 else PAD
+    rows = slice(base_r + i * dr, base_r + i * dr + n + 4 * abs(dr))
+    cols = slice(base_c + i * dc, base_c + i * dc + n + 4 * abs(dc))
+    return rows, cols
+
+
+def _window_counts(padded: np.ndarray, n: int, dr: int, dc: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """각 5칸 윈도우의 (흑 돌 수, 백 돌 수, 벽 칸 수) - 방향별로 5번의 슬라이스 덧셈"""
+    black = white = wall = None
+    for i in range(5):
+        rows, cols = _window_slice(n, dr, dc, i)
+        cells = padded[..., rows, cols]
+        if black is None:
+            black = (cells == 1).astype(np.int8)
+            white = (cells == 2).astype(np.int8)
+            wall = (cells == WALL).astype(np.int8)
+        else:
+            black += cells == 1
+            white += cells == 2
+            wall += cells == WALL
+    return black, white, wall
+
+
+def _scatter(values: np.ndarray, n: int, dr: int, dc: int) -> np.ndarray:
+    """윈도우별 값을 그 윈도우가 덮는 원래 보드의 칸들로 모아 더함"""
+    total = 0
+    for k in range(5):
+        # 칸 (r, c)를 덮는 k번째 윈도우의 시작점 인덱스
+        row_start = 4 * dr - k * dr
+        if dc >= 0:
+            col_start = 4 * dc - k * dc
+        else:
+            col_start = k
+        total = total + values[..., row_start:row_start + n, col_start:col_start + n]
+    return total
+
+
+def _padded(board: np.ndarray) -> np.ndarray:
+    pad_width = [(0, 0)] * (board.ndim - 2) + [(PAD, PAD), (PAD, PAD)]
+    return np.pad(board.astype(np.int8, copy=False), pad_width, constant_values=WALL)
+
+
+def gain_maps(board: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """모든 칸에 대해 흑/백이 그 칸에 둘 때 늘어나는 패턴 점수 (BitBoard.move_gain의 내 점수 변화와 같음)
+
+    board는 (..., n, n) 모양이면 되고, 앞쪽 차원은 그대로 유지된다.
+    """
+    n = board.shape[-1]
+    padded = _padded(board)
+
+    black_gain = 0
+    white_gain = 0
+    for dr, dc in DIRECTIONS:
+        black, white, wall = _window_counts(padded, n, dr, dc)
+        open_for_black = (white == 0) & (wall == 0)
+        open_for_white = (black == 0) & (wall == 0)
+        black_gain = black_gain + _scatter(np.where(open_for_black, GAIN_TABLE[black], 0), n, dr, dc)
+        white_gain = white_gain + _scatter(np.where(open_for_white, GAIN_TABLE[white], 0), n, dr, dc)
+    return black_gain, white_gain
+
+
+def five_maps(board: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """흑/백이 그 칸에 두면 5목(이상)이 되는 빈 칸 - (..., n, n) bool"""
+    n = board.shape[-1]
+    padded = _padded(board)
+
+    black_five = 0
+    white_five = 0
+    for dr, dc in DIRECTIONS:
+        black, white, wall = _window_counts(padded, n, dr, dc)
+        black_five = black_five + _scatter(((black == 4) & (white == 0) & (wall == 0)).astype(np.int8), n, dr, dc)
+        white_five = white_five + _scatter(((white == 4) & (black == 0) & (wall == 0)).astype(np.int8), n, dr, dc)
+    empty = board == 0
+    return (black_five > 0) & empty, (white_five > 0) & empty
+
+
+def score_map(board: np.ndarray, player: int, defense_weight: float = 0.8) -> np.ndarray:
+    """모든 빈 칸의 (공격 + 방어) 점수 지도 - 돌이 있는 칸은 -inf"""
+    gains = gain_maps(board)
+    mine = gains[player - 1]
+    theirs = gains[2 - player]
+    scores = mine + defense_weight * theirs
+    return np.where(board == 0, scores, -np.inf)
+
+
+def pattern_scores(board: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """보드 전체의 흑/백 패턴 점수 합 (BitBoard.scores와 같음)"""
+    n = board.shape[-1]
+    padded = _padded(board)
+
+    black_score = 0
+    white_score = 0
+    for dr, dc in DIRECTIONS:
+        black, white, wall = _window_counts(padded, n, dr, dc)
+        black_score = black_score + np.where((white == 0) & (wall == 0), WINDOW_TABLE[black], 0).sum(axis=(-2, -1))
+        white_score = white_score + np.where((black == 0) & (wall == 0), WINDOW_TABLE[white], 0).sum(axis=(-2, -1))
+    return black_score, white_score
+
+
+def neighbor_mask(board: np.ndarray, radius: int = 1) -> np.ndarray:
+    """반경 안에 돌이 있는 빈 칸 - (..., n, n) 모양 그대로"""
+    n = board.shape[-1]
+    pad_width = [(0, 0)] * (board.ndim - 2) + [(radius, radius), (radius, radius)]
+    occupied = np.pad(board != 0, pad_width)
+    near = np.zeros(board.shape, dtype=bool)
+    for dr in range(2 * radius + 1):
+        for dc in range(2 * radius + 1):
+            near |= occupied[..., dr:dr + n, dc:dc + n]
+    return near & (board == 0)
+
+
+def best_moves_batch(boards: np.ndarray, players: Union[int, np.ndarray], defense_weight: float = 0.8,
+                     rng: Optional["np.random.Generator"] = None,
+                     forbidden: Optional[np.ndarray] = None) -> np.ndarray:
+    """(N, n, n) 보드 묶음의 최선수를 한 번에 계산 -> (N, 2) [row, col]
+
+    5목을 만드는 수, 상대의 5목을 막는 수 순서로 먼저 두고, 그 밖에는 score_map 점수로 고른다.
+    후보는 돌 주변의 빈 칸, 동점은 무작위로 고른다.
+    forbidden(N, n, n)은 흑의 금수 자리 - 흑은 그 자리에 두지 않고, 백은 그 자리의 흑 5목을 막지 않는다.
+    빈 보드는 중앙, 가득 찬 보드는 (0, 0)을 반환한다.
+    """
+    count, n = boards.shape[0], boards.shape[-1]
+    players = np.broadcast_to(np.asarray(players), (count,))[:, None, None]
+    black_gain, white_gain = gain_maps(boards)
+    mine = np.where(players == 1, black_gain, white_gain)
+    theirs = np.where(players == 1, white_gain, black_gain)
+    scores = mine + defense_weight * theirs
+
+    # 이기는 수 > 막는 수 > 나머지 (movegen.ordered_moves의 우선순위와 같음)
+    black_five, white_five = five_maps(boards)
+    win = np.where(players == 1, black_five, white_five)
+    block = np.where(players == 1, white_five, black_five)
+    if forbidden is not None:
+        block &= ~((players == 2) & forbidden)
+    scores = scores + np.where(win, 1e12, 0) + np.where(block, 1e11, 0)
+
+    # 동점 처리용 잡음 - 점수 간격(0.8의 배수 차이 >= 0.2)보다 작게
+    rng = rng or np.random.default_rng()
+    scores = scores + rng.random(scores.shape) * 0.01
+
+    candidates = neighbor_mask(boards)
+    empty_board = ~boards.reshape(count, -1).any(axis=1)
+    if forbidden is not None:
+        candidates = candidates & ~((players == 1) & forbidden)
+    scores = np.where(candidates, scores, -np.inf).reshape(count, -1)
+    flat = scores.argmax(axis=1)
+    flat = np.where(np.isneginf(scores.max(axis=1)), 0, flat)
+    flat = np.where(empty_board, (n // 2) * n + n // 2, flat)
+    return np.stack(np.divmod(flat, n), axis=1)
+
+
+class PatternEvaluator:
+    """기본 평가 - 5칸 윈도우 패턴 점수 (BitBoard가 돌을 놓을 때마다 점진적으로 유지)"""
+
+    name = "pattern"
+    batched = False  # 자식 국면들을 한 번에 평가하는 편이 더 빠른지
+
+    def evaluate(self, board: BitBoard, player: int) -> float:
+        """player(둘 차례) 입장의 국면 점수"""
+        return board.evaluate(player)
+
+    def score_moves(self, board: BitBoard, player: int, moves: List[Tuple[int, int]]) -> List[float]:
+        """후보마다 공격(내 수의 가치) + 방어(상대 수의 가치 * 0.8) 점수 - score_map과 같은 값"""
+        return [board.move_gain(row, col, player)[0] + 0.8 * board.move_gain(row, col, 3 - player)[0]
+                for row, col in moves]
+
+
+class NetworkEvaluator:
+    """정책/가치 신경망 평가 - 후보 수들을 둔 자식 국면을 한 묶음으로 한 번에 추론
+
+    가치(-1 ~ 1)는 value_scale을 곱해 패턴 점수와 같은 정수 범위로 바꾼다 (승패 점수보다는 충분히 작음).
+    같은 국면을 여러 번 평가하지 않도록 최근 결과를 해시로 기억한다.
+    """
+
+    name = "network"
+    batched = True
+
+    def __init__(self, net: PolicyValueNet, value_scale: float = 100000, cache_size: int = 1 << 16):
+        self.net = net
+        self.value_scale = value_scale
+        self.cache_size = cache_size
+        self._cache: Dict[Tuple[int, int], float] = {}
+        self.path: Optional[str] = None  # 가중치 파일에서 읽었으면 그 경로 (작업 프로세스에 넘길 때 씀)
+
+    @classmethod
+    def load(cls, path: str) -> "NetworkEvaluator":
+        evaluator = cls(PolicyValueNet.load(path))
+        evaluator.path = path
+        return evaluator
+
+    def evaluate(self, board: BitBoard, player: int) -> float:
+        key = (board.hash, player)
+        score = self._cache.get(key)
+        if score is None:
+            _, value = self.net.forward(encode_planes(board.grid, player))
+            score = self._remember(key, int(value[0] * self.value_scale))
+        return score
+
+    def score_moves(self, board: BitBoard, player: int, moves: List[Tuple[int, int]]) -> List[float]:
+        """후보마다 그 수를 둔 국면의 가치 (player 입장) - 자식 국면 N개를 forward 한 번으로"""
+        if not moves:
+            return []
+        rows, cols = np.array(moves).T
+        children = np.repeat(board.grid[None], len(moves), axis=0)
+        children[np.arange(len(moves)), rows, cols] = player
+        _, values = self.net.forward(encode_planes(children, 3 - player))
+        # 자식 국면의 가치는 상대(다음에 둘 쪽) 입장이므로 부호를 바꿈
+        return [-int(value * self.value_scale) for value in values]
+
+    def policy(self, board: BitBoard, player: int) -> np.ndarray:
+        """칸별로 player가 둘 확률 (돌이 있는 칸은 0)"""
+        logits, _ = self.net.forward(encode_planes(board.grid, player))
+        logits = np.where(board.grid == 0, logits[0], -np.inf)
+        probabilities = np.exp(logits - logits.max())
+        return probabilities / probabilities.sum()
+
+    def _remember(self, key: Tuple[int, int], score: int) -> int:
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[key] = score
+        return score
+
+
+Evaluator = Union[PatternEvaluator, NetworkEvaluator]
+
+
+def make_evaluator(spec: Union[str, Evaluator, None] = None) -> Evaluator:
+    """'pattern'(기본) 또는 신경망 가중치 파일(.npz) 경로로 평가기를 만듦"""
+    if spec is None or spec == "pattern":
+        return PatternEvaluator()
+    if isinstance(spec, str):
+        return NetworkEvaluator.load(spec)
+    return spec
@@ -0,0 +1,72 @@
+import json
+import os
+import platform
+import pygame
+from typing import Optional, Tuple
+
+# 운영체제별 한글 폰트 후보 (앞의 것부터 시도)
+FONT_CANDIDATES = {
+    "Darwin": [
+        "/System/Library/Fonts/AppleSDGothicNeo.ttc",  # Apple SD Gothic Neo
+        "/Library/Fonts/NanumGothic.ttf",  # 나눔고딕 (설치되어 있다면)
+        "/System/Library/Fonts/Helvetica.ttc",  # 대체 폰트
+        "/System/Library/Fonts/Supplemental/Arial Unicode MS.ttf",  # Arial Unicode MS
+    ],
+    "Windows": [
+        "C:/Windows/Fonts/malgun.ttf",  # 맑은 고딕
+        "C:/Windows/Fonts/gulim.ttc",   # 굴림
+        "C:/Windows/Fonts/NanumGothic.ttf",  # 나눔고딕
+    ],
+}
+# 후보 경로가 없을 때 pygame 시스템 폰트 목록에서 찾을 이름들
+SYSTEM_FONT_NAMES = "applesdgothicneo,nanumgothic,malgun,gulim"
+FONT_SIZES = (36, 24)  # (큰 글자, 작은 글자)
+
+_cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+FONT_CACHE_PATH = os.path.join(_cache_home, "omok", "font.json")
+
+
+def cached_font_path(cache_path: str = FONT_CACHE_PATH) -> Optional[str]:
+    """캐시에 적어 둔 폰트 경로 - 캐시가 없거나 그 파일이 사라졌으면 None, 한글 폰트가 없다고 적혀 있으면 ''"""
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    path = cached.get("path")
+    if path is None or cached.get("system") != platform.system():
+        return None
+    if path and not os.path.exists(path):
+        return None
+    return path
+
+
+def save_font_path(path: str, cache_path: str = FONT_CACHE_PATH):
+    """찾은 폰트 경로를 캐시에 적음 (캐시 폴더를 만들 수 없으면 적지 않음)"""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump({"system": platform.system(), "path": path}, f, ensure_ascii=False)
+    except OSError:
+        pass
+
+
+def discover_font_path() -> str:
+    """한글 폰트 파일 경로를 찾음 (못 찾으면 '') - 시스템 폰트 목록을 훑으므로 느릴 수 있음"""
+    for path in FONT_CANDIDATES.get(platform.system(), []):
+        if os.path.exists(path):
+            return path
+    try:
+        return pygame.font.match_font(SYSTEM_FONT_NAMES) or ""
+    except Exception:
+        return ""
+
+
+def make_fonts(path: Optional[str]) -> Tuple[pygame.font.Font, pygame.font.Font]:
+    """(큰 글자, 작은 글자) 폰트 - 경로가 없거나 읽을 수 없으면 pygame 기본 폰트"""
+    if path:
+        try:
+            return tuple(pygame.font.Font(path, size) for size in FONT_SIZES)
+        except (OSError, pygame.error):
+            pass
+    return tuple(pygame.font.Font(None, size) for size in FONT_SIZES)
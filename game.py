@@ -1,75 +1,74 @@
 import pygame
 import sys
-import platform
-from typing import Optional, Tuple
+import time
+from typing import List, Optional, Set, Tuple
 from board import Board
+from fonts import cached_font_path, discover_font_path, make_fonts, save_font_path
 from ai import AI
+from ai_worker import AIWorker
+from net_client import GameClient
+from game_record import RecordWriter
+from instrumentation import Instrumentation, format_stats
+from time_control import GameClock, format_clock
+
+RULE_NAMES = {"freestyle": "자유룰", "renju": "렌주룰"}
+BOARD_SIZES = (15, 19, 50)  # 메뉴에서 고를 수 있는 보드 크기 (50은 '무한 오목'용 큰 보드)
 
 class Game:
-    def __init__(self):
-        pygame.init()
-        self.board = Board(15)  # 15x15 오목판
+    def __init__(self, client: Optional[GameClient] = None, ai_log: Optional[str] = None,
+                 rules: str = "freestyle", size: int = 15, ponder: bool = False, evaluator: Optional[str] = None,
+                 mcts_workers: int = 1, time_control: Optional[Tuple[int, int]] = None):
+        # 창과 글자에 쓰는 모듈만 초기화 (소리/조이스틱 초기화는 시작을 늦춤)
+        pygame.display.init()
+        pygame.font.init()
+        if client is not None and rules != "freestyle":
+            # 서버 게임은 자유룰만 지원 - 서버가 받은 수를 그대로 두도록 자유룰로 맞춤
+            print("서버 게임은 자유룰로 진행합니다.")
+            rules = "freestyle"
+        self.rules = rules  # "freestyle" 자유룰, "renju" 렌주룰 (흑의 장목/3-3/4-4 금지)
+        self.board_size = size  # 다음 게임의 보드 크기 (메뉴에서 ←→로 변경)
+        self.board = Board(size, rules)  # size x size 오목판
         self.screen = pygame.display.set_mode((self.board.screen_width, self.board.screen_height))
         pygame.display.set_caption("3D 오목 게임")
         
         # 게임 상태
         self.current_player = 1  # 1: 검은 돌, 2: 흰 돌
-        self.game_mode = "2player"  # "2player", "ai_easy", "ai_medium", "ai_hard"
+        self.game_mode = "2player"  # "2player", "ai_easy", "ai_medium", "ai_hard", "ai_mcts"
         self.game_state = "playing"  # "playing", "game_over", "menu"
         self.winner = None
         
-        # AI
-        self.ai = AI(2)
+        # AI - 메인 루프를 막지 않도록 별도 스레드에서 계산
+        # evaluator: 신경망 가중치(.npz), 없으면 패턴 점수 / mcts_workers: MCTS 난이도의 탐색 프로세스 수
+        self.ai = AI(2, rules=rules, evaluator=evaluator, mcts_workers=mcts_workers)
+        self.ai_worker = AIWorker(self.ai)
+        self.ai_min_think_ms = 500  # 너무 빨리 두지 않도록 최소 생각 시간 (대국 시계가 없을 때만)
+        self.ai_request_time = 0
+        # 대국 시계 - time_control (처음 시간 ms, 수마다 추가 시간 ms)을 주면 양쪽 남은 시간을 재고,
+        # AI는 남은 시간에 맞춰 수마다 생각 시간을 정함. 시간을 다 쓰면 패배
+        self.clock = GameClock(*time_control) if time_control else None
+        self.timed_out = False
+        self.ai_error: Optional[str] = None  # AI 계산이 실패해 멈춘 판의 오류 메시지
+        # 미리 읽기 - 어려움 난이도에서 내 차례 동안 AI가 예상 응수를 미리 탐색 (P로 켜고 끔)
+        self.ponder = ponder
+        self._ponder_hash: Optional[int] = None  # 마지막으로 미리 읽기를 시작한 국면
         
-        # 폰트 - 운영체제별 한글 지원 폰트 설정
-        system = platform.system()
-        font_loaded = False
+        # AI 통계 - 로그 파일을 주거나 F3으로 디버그 정보를 켰을 때만 모음
+        self.show_debug = False
+        if ai_log:
+            self.ai.instrumentation = Instrumentation(log_path=ai_log)
         
-        if system == "Darwin":  # macOS
-            mac_fonts = [
-                "/System/Library/Fonts/AppleSDGothicNeo.ttc",  # Apple SD Gothic Neo
-                "/Library/Fonts/NanumGothic.ttf",  # 나눔고딕 (설치되어 있다면)
-                "/System/Library/Fonts/Helvetica.ttc",  # 대체 폰트
-                "/System/Library/Fonts/Supplemental/Arial Unicode MS.ttf",  # Arial Unicode MS
-            ]
-            for font_path in mac_fonts:
-                try:
-                    self.font = pygame.font.Font(font_path, 36)
-                    self.small_font = pygame.font.Font(font_path, 24)
-                    font_loaded = True
-                    print(f"Mac 한글 폰트 로드 성공: {font_path}")
-                    break
-                except:
-                    continue
+        # 네트워크 - client가 있으면 규칙/AI는 서버가 처리하고 여기서는 입력과 화면만 담당
+        self.client = client
+        self.net_game: Optional[int] = None  # 서버의 게임 번호
         
-        elif system == "Windows":  # Windows
-            windows_fonts = [
-                "C:/Windows/Fonts/malgun.ttf",  # 맑은 고딕
-                "C:/Windows/Fonts/gulim.ttc",   # 굴림
-                "C:/Windows/Fonts/NanumGothic.ttf",  # 나눔고딕
-            ]
-            for font_path in windows_fonts:
-                try:
-                    self.font = pygame.font.Font(font_path, 36)
-                    self.small_font = pygame.font.Font(font_path, 24)
-                    font_loaded = True
-                    print(f"Windows 한글 폰트 로드 성공: {font_path}")
-                    break
-                except:
-                    continue
+        # S 키로 지금까지의 기보를 이 파일에 이어 씀
+        self.record_path = "games.omr"
         
-        # 폰트 로드 실패시 pygame의 시스템 폰트 사용
-        if not font_loaded:
-            try:
-                # pygame의 시스템 폰트에서 한글 지원 폰트 찾기
-                self.font = pygame.font.SysFont('applesdfgothicneo,nanumgothic,malgun,gulim', 36)
-                self.small_font = pygame.font.SysFont('applesdfgothicneo,nanumgothic,malgun,gulim', 24)
-                print("시스템 폰트 사용 (한글 지원)")
-            except:
-                # 최후의 수단으로 기본 폰트 사용
-                self.font = pygame.font.Font(None, 36)
-                self.small_font = pygame.font.Font(None, 24)
-                print("기본 폰트 사용 (한글 표시 제한)")
+        # 폰트 - 한글 폰트 경로는 디스크 캐시에서 바로 읽고, 캐시가 없으면 첫 화면을 기본 폰트로 그린 뒤
+        # 시스템 폰트를 찾아 캐시에 적음 (load_fonts) - 느린 폰트 검색이 첫 화면을 막지 않도록
+        self.font_path = cached_font_path()
+        self.fonts_pending = self.font_path is None
+        self.font, self.small_font = make_fonts(self.font_path)
         
         # UI 상태
         self.show_menu = True
@@ -78,10 +77,15 @@ class Game:
             "2인용 게임",
             "AI vs 플레이어 (쉬움)",
             "AI vs 플레이어 (보통)",
-            "AI vs 플레이어 (어려움)"
+            "AI vs 플레이어 (어려움)",
+            "AI vs 플레이어 (MCTS)"
         ]
         
-
+        # 렌더링 상태 - 바뀐 영역만 다시 그림
+        self.needs_redraw = True  # 다음 프레임에 화면 전체를 다시 그릴지
+        self._text_cache = {}
+        self._info_drawn = None  # 마지막으로 그린 게임 정보 줄들
+        self._info_rect: Optional[pygame.Rect] = None
         
         # 색상
         self.menu_bg_color = (50, 50, 50)
@@ -93,13 +97,24 @@ class Game:
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_UP:
                 self.selected_mode = (self.selected_mode - 1) % len(self.menu_options)
+                self.needs_redraw = True
             elif event.key == pygame.K_DOWN:
                 self.selected_mode = (self.selected_mode + 1) % len(self.menu_options)
+                self.needs_redraw = True
+            elif event.key == pygame.K_TAB and not self.client:
+                # 서버 게임은 자유룰만 지원
+                self.rules = "renju" if self.rules == "freestyle" else "freestyle"
+                self.needs_redraw = True
+            elif event.key in (pygame.K_LEFT, pygame.K_RIGHT) and not self.client:
+                # 서버 게임의 보드 크기는 서버가 정함
+                sizes = sorted(set(BOARD_SIZES) | {self.board_size})
+                step = 1 if event.key == pygame.K_RIGHT else -1
+                self.board_size = sizes[(sizes.index(self.board_size) + step) % len(sizes)]
+                self.needs_redraw = True
             elif event.key == pygame.K_RETURN:
                 self.start_game()
             elif event.key == pygame.K_ESCAPE:
-                pygame.quit()
-                sys.exit()
+                self.quit()
     
     def handle_game_events(self, event):
         """게임 이벤트 처리"""
@@ -107,35 +122,177 @@ class Game:
             if self.game_state == "playing":
                 pos = pygame.mouse.get_pos()
                 cell = self.board.get_cell_from_pos(pos)
-                if cell:
+                if cell and not self.is_ai_turn():
                     row, col = cell
-                    if self.board.place_stone(row, col, self.current_player):
-                        if self.board.check_winner(row, col, self.current_player):
-                            self.game_state = "game_over"
-                            self.winner = self.current_player
-                        elif self.board.is_full():
-                            self.game_state = "game_over"
-                            self.winner = 0  # 무승부
-                        else:
-                            self.current_player = 3 - self.current_player  # 플레이어 전환
+                    if self.client:
+                        if self.net_game is not None:
+                            self.client.send({"op": "move", "game": self.net_game, "row": row, "col": col})
+                    else:
+                        self.play_move(row, col)
         
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_r:
-                self.reset_game()
+                if self.client:
+                    if self.net_game is not None:
+                        self.client.send({"op": "reset", "game": self.net_game})
+                else:
+                    self.reset_game()
+            elif event.key == pygame.K_u and not self.client:
+                self.undo_move()
+            elif event.key == pygame.K_y and not self.client:
+                self.redo_move()
+            elif event.key == pygame.K_s:
+                self.save_record()
+            elif event.key == pygame.K_F3:
+                self.toggle_debug()
+            elif event.key == pygame.K_p and not self.client:
+                self.toggle_ponder()
             elif event.key == pygame.K_m:
+                self.ai_worker.cancel()
+                if self.clock:
+                    self.clock.pause()
                 self.show_menu = True
                 self.game_state = "menu"
+                self.needs_redraw = True
             elif event.key == pygame.K_ESCAPE:
-                pygame.quit()
-                sys.exit()
+                self.quit()
+    
+    def play_move(self, row: int, col: int) -> bool:
+        """현재 플레이어의 돌을 놓고 승패/차례 처리"""
+        if not self.board.place_stone(row, col, self.current_player):
+            return False
+        if self.board.check_winner(row, col, self.current_player):
+            self.game_state = "game_over"
+            self.winner = self.current_player
+            self.needs_redraw = True
+        elif self.board.is_full():
+            self.game_state = "game_over"
+            self.winner = 0  # 무승부
+            self.needs_redraw = True
+        else:
+            if self.clock and not self.client:
+                self.clock.press(self.current_player)
+            self.current_player = 3 - self.current_player  # 플레이어 전환
+        if self.game_state == "game_over" and self.clock:
+            self.clock.pause()
+        return True
+    
+    def undo_move(self):
+        """한 수 무르기 - AI 게임에서는 AI의 수와 함께 내 차례까지 무름"""
+        self.ai_worker.cancel()
+        undone = None
+        while True:
+            move = self.board.undo()
+            if move is None:
+                break
+            undone = move
+            if self.game_mode == "2player" or move[2] == 1:
+                break
+        if undone is None:
+            return
+        self.current_player = undone[2]
+        self.game_state = "playing"
+        self.winner = None
+        self.timed_out = False
+        self.ai_error = None
+        self.sync_clock()
+        self.needs_redraw = True
+    
+    def redo_move(self):
+        """무른 수 다시 두기 - AI 게임에서는 AI의 응수까지 다시 둠"""
+        if self.game_state != "playing":
+            return
+        self.ai_worker.cancel()
+        while self.board.redo_stack:
+            row, col, player = self.board.redo_stack[-1]
+            if player != self.current_player:
+                break
+            # play_move는 다시 두기 스택을 비우므로 직접 다시 두고 승패만 확인
+            self.board.redo()
+            if self.board.check_winner(row, col, player):
+                self.game_state = "game_over"
+                self.winner = player
+            elif self.board.is_full():
+                self.game_state = "game_over"
+                self.winner = 0
+            else:
+                self.current_player = 3 - player
+            if self.game_mode == "2player" or self.game_state != "playing" or self.current_player == 1:
+                break
+        self.sync_clock()
+        self.needs_redraw = True
+    
+    def sync_clock(self):
+        """대국 시계를 지금 차례인 쪽으로 맞춤 (무르기/다시 두기 뒤, 쓴 시간은 돌려주지 않음)"""
+        if not self.clock or self.client:
+            return
+        if self.game_state != "playing" or self.show_menu:
+            self.clock.pause()
+        elif self.clock.running != self.current_player:
+            self.clock.start(self.current_player)
+    
+    def update_clock(self):
+        """지금 차례인 쪽이 시간을 다 썼으면 시간패"""
+        if (not self.clock or self.client or self.show_menu or self.game_state != "playing"
+                or not self.clock.flagged(self.current_player)):
+            return
+        self.ai_worker.cancel()
+        self.clock.pause()
+        self.game_state = "game_over"
+        self.winner = 3 - self.current_player
+        self.timed_out = True
+        self.needs_redraw = True
+    
+    def toggle_debug(self):
+        """AI 디버그 정보 표시 켜고 끄기 (처음 켤 때 통계 수집을 시작)"""
+        self.show_debug = not self.show_debug
+        if self.show_debug and self.ai.instrumentation is None:
+            self.ai.instrumentation = Instrumentation()
+    
+    def toggle_ponder(self):
+        """미리 읽기 켜고 끄기"""
+        self.ponder = not self.ponder
+        self._ponder_hash = None
+        if not self.ponder:
+            self.ai_worker.stop_ponder()
+    
+    def save_record(self):
+        """지금까지의 기보를 기보 파일에 이어 씀"""
+        if not self.board.core.history:
+            return
+        with RecordWriter(self.record_path) as writer:
+            writer.write(self.board.to_record(self.winner))
+        print(f"기보 저장: {self.record_path} ({len(self.board.core.history)}수)")
+    
+    def quit(self):
+        """진행 중인 AI 계산을 멈추고 종료"""
+        self.ai_worker.shutdown()
+        self.ai.mcts.close()  # MCTS 작업 프로세스와 공유 메모리 보드 풀
+        if self.ai.instrumentation:
+            self.ai.instrumentation.close()
+        if self.client:
+            self.client.close()
+        pygame.quit()
+        sys.exit()
     
     def start_game(self):
         """게임 시작"""
+        self.ai_worker.cancel()
         self.show_menu = False
         self.game_state = "playing"
         self.current_player = 1
         self.winner = None
+        if self.board.size != self.board_size:
+            self.resize_board(self.board_size)
         self.board.reset()
+        self.board.set_rules(self.rules)
+        self.ai.set_rules(self.rules)
+        self.timed_out = False
+        self.ai_error = None
+        if self.clock:
+            self.clock.reset()
+            self.sync_clock()
+        self.needs_redraw = True
         
         # 게임 모드 설정
         if self.selected_mode == 0:
@@ -146,53 +303,179 @@ class Game:
             self.game_mode = "ai_medium"
         elif self.selected_mode == 3:
             self.game_mode = "ai_hard"
+        elif self.selected_mode == 4:
+            self.game_mode = "ai_mcts"
+        
+        if self.client:
+            # 2인용은 이 창 하나에서 흑백을 모두 둠
+            self.net_game = None
+            self.client.send({"op": "new", "mode": self.game_mode, "hotseat": self.game_mode == "2player"})
+    
+    def resize_board(self, size: int):
+        """보드 크기 바꾸기 - 새 보드를 만들고 창 크기를 맞춤 (AI는 다음 수에서 새 크기로 동기화)"""
+        self.board = Board(size, self.board.rules.name)
+        self.board_size = size
+        self.screen = pygame.display.set_mode((self.board.screen_width, self.board.screen_height))
+        self._info_drawn = None
+        self._info_rect = None
+        self.needs_redraw = True
     
     def reset_game(self):
         """게임 리셋"""
+        self.ai_worker.cancel()
         self.game_state = "playing"
         self.current_player = 1
         self.winner = None
         self.board.reset()
+        self.timed_out = False
+        self.ai_error = None
+        if self.clock:
+            self.clock.reset()
+            self.sync_clock()
+        self.needs_redraw = True
     
-    def ai_move(self):
-        """AI 수 두기"""
-        if self.game_state == "playing" and self.current_player == 2:
-            difficulty = self.game_mode.split("_")[1] if "_" in self.game_mode else "medium"
-            row, col = self.ai.get_move_with_difficulty(self.board.board, difficulty)
-            
-            if self.board.place_stone(row, col, self.current_player):
-                if self.board.check_winner(row, col, self.current_player):
-                    self.game_state = "game_over"
-                    self.winner = self.current_player
-                elif self.board.is_full():
-                    self.game_state = "game_over"
-                    self.winner = 0
-                else:
-                    self.current_player = 3 - self.current_player
+    def is_ai_turn(self) -> bool:
+        return (not self.show_menu and self.game_state == "playing" and
+                self.game_mode != "2player" and self.current_player == 2)
+    
+    def get_difficulty(self) -> str:
+        return self.game_mode.split("_")[1] if "_" in self.game_mode else "medium"
+    
+    def update_ai(self):
+        """AI 차례면 백그라운드 계산을 시작하고, 끝난 결과가 있으면 둔다"""
+        if self.client:
+            return
+        if not self.is_ai_turn():
+            self.update_ponder()
+            return
+        if not self.ai_worker.thinking:
+            if self.clock:
+                self.ai_worker.request_move(self.board.board, self.get_difficulty(),
+                                            self.clock.remaining_ms(2), self.clock.increment_ms)
+            else:
+                self.ai_worker.request_move(self.board.board, self.get_difficulty())
+            self.ai_request_time = pygame.time.get_ticks()
+            return
+        if not self.clock and pygame.time.get_ticks() - self.ai_request_time < self.ai_min_think_ms:
+            return
+        move = self.ai_worker.poll()
+        if move is not None:
+            self.play_move(*move)
+        elif self.ai_worker.error is not None:
+            self.fail_ai(self.ai_worker.error)
+    
+    def fail_ai(self, error: BaseException):
+        """AI 계산이 실패하면 판을 멈추고 오류를 보여줌 (R로 다시 시작하거나 U로 무를 수 있음)"""
+        print(f"AI 계산에 실패했습니다: {error!r}")
+        self.ai_error = str(error) or type(error).__name__
+        self.game_state = "game_over"
+        if self.clock:
+            self.clock.pause()
+        self.needs_redraw = True
+    
+    def update_ponder(self):
+        """내 차례면 AI가 이 국면에서 예상 응수를 미리 읽기 시작 (국면마다 한 번)"""
+        if (not self.ponder or self.show_menu or self.game_state != "playing" or self.game_mode != "ai_hard"
+                or self.ai_worker.thinking or self.board.core.hash == self._ponder_hash):
+            return
+        self._ponder_hash = self.board.core.hash
+        self.ai_worker.request_ponder(self.board.board, self.get_difficulty())
+    
+    def update_network(self):
+        """서버에서 온 메시지를 반영 (클라이언트 모드)"""
+        if not self.client:
+            return
+        for message in self.client.poll():
+            op = message.get("op")
+            if op == "created":
+                self.net_game = message["game"]
+                if message.get("size", self.board.size) != self.board.size:
+                    self.resize_board(message["size"])
+            elif op == "state" and message["game"] == self.net_game:
+                self.apply_state(message)
+            elif op == "error":
+                print(f"서버: {message['message']}")
+        if not self.client.connected:
+            print("서버와의 연결이 끊어졌습니다.")
+            self.quit()
+    
+    def apply_state(self, message: dict):
+        """서버의 게임 상태를 보드에 반영 - 전체 기보 또는 마지막 수 (수의 규칙 판정은 서버가 이미 함)"""
+        if "moves" in message:
+            self.board.reset()
+            for row, col, player in message["moves"]:
+                self.board.core.place(row, col, player)
+            self.needs_redraw = True
+        else:
+            row, col, player = message["last"]
+            self.board.core.place(row, col, player)
+        self.current_player = message["turn"]
+        self.winner = message["winner"]
+        game_state = "playing" if self.winner is None else "game_over"
+        if game_state != self.game_state:
+            self.game_state = game_state
+            self.needs_redraw = True
+    
+    def forbidden_marks(self) -> Set[Tuple[int, int]]:
+        """화면에 표시할 금수 자리 - 렌주룰에서 흑 차례일 때만 (금수 지도는 돌이 바뀐 곳 주변만 다시 판정)"""
+        if self.board.rules.name == "freestyle" or self.game_state != "playing" or self.current_player != 1:
+            return frozenset()
+        return self.board.forbidden_points()
     
     def draw_menu(self):
         """메뉴 그리기"""
         self.screen.fill(self.menu_bg_color)
         
         # 제목
-        title = self.font.render("3D 오목 게임", True, (255, 255, 255))
+        title = self.render_text(self.font, "3D 오목 게임", (255, 255, 255))
         title_rect = title.get_rect(center=(self.board.screen_width // 2, 100))
         self.screen.blit(title, title_rect)
         
         # 메뉴 옵션들
         for i, option in enumerate(self.menu_options):
             color = self.menu_selected_color if i == self.selected_mode else self.menu_text_color
-            text = self.font.render(option, True, color)
+            text = self.render_text(self.font, option, color)
             text_rect = text.get_rect(center=(self.board.screen_width // 2, 200 + i * 50))
             self.screen.blit(text, text_rect)
         
+        # 규칙, 보드 크기
+        settings = [f"규칙: {RULE_NAMES[self.rules]} (Tab: 변경)",
+                    f"보드: {self.board_size}x{self.board_size} (←→: 변경)"]
+        for i, setting in enumerate(settings):
+            text = self.render_text(self.small_font, setting, (255, 220, 120))
+            rect = text.get_rect(center=(self.board.screen_width // 2, 200 + len(self.menu_options) * 50 + i * 30))
+            self.screen.blit(text, rect)
+        
         # 안내
-        instruction = self.small_font.render("↑↓: 선택, Enter: 시작, ESC: 종료", True, (200, 200, 200))
-        instruction_rect = instruction.get_rect(center=(self.board.screen_width // 2, 400))
+        instruction = self.render_text(self.small_font, "↑↓: 선택, Enter: 시작, ESC: 종료", (200, 200, 200))
+        instruction_rect = instruction.get_rect(
+            center=(self.board.screen_width // 2, 200 + len(self.menu_options) * 50 + len(settings) * 30 + 20))
         self.screen.blit(instruction, instruction_rect)
     
-    def draw_game_info(self):
-        """게임 정보 그리기"""
+    def load_fonts(self):
+        """한글 폰트를 찾아 캐시에 적고 글자를 다시 그림 (캐시가 없을 때 첫 화면 뒤에 한 번)"""
+        self.fonts_pending = False
+        self.font_path = discover_font_path()
+        save_font_path(self.font_path)
+        self.font, self.small_font = make_fonts(self.font_path)
+        self._text_cache.clear()
+        self._info_drawn = None
+        self.needs_redraw = True
+        print(f"한글 폰트 로드: {self.font_path}" if self.font_path else "기본 폰트 사용 (한글 표시 제한)")
+    
+    def render_text(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """글자 표면을 한 번만 렌더링해 재사용"""
+        key = (id(font), text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self._text_cache[key] = surface
+        return surface
+    
+    def get_info_lines(self) -> List[Tuple[str, Tuple[int, int, int], Tuple[int, int]]]:
+        """게임 정보 줄들 (글자, 색, 위치)"""
+        lines = []
+        
         # 게임 모드에 따른 플레이어 정보 표시
         if self.game_mode == "2player":
             # 2인용 게임
@@ -207,32 +490,76 @@ class Game:
             else:
                 player_text = "현재 차례: AI (흰 돌)"
         
-        player_surface = self.small_font.render(player_text, True, (255, 255, 255))
-        self.screen.blit(player_surface, (10, 10))
+        if self.game_state == "playing" and (self.ai_worker.thinking or self.client and self.is_ai_turn()):
+            dots = "." * (pygame.time.get_ticks() // 300 % 3 + 1)
+            player_text = f"AI 생각 중{dots}"
+        
+        lines.append((player_text, (255, 255, 255), (10, 10)))
         
         # 사용자 돌 색깔 안내 (AI 게임에서만)
         if self.game_mode != "2player":
             user_info = "당신의 돌: 검은 돌 | AI의 돌: 흰 돌"
-            user_surface = self.small_font.render(user_info, True, (150, 200, 255))
-            self.screen.blit(user_surface, (10, 35))
+            lines.append((user_info, (150, 200, 255), (10, 35)))
             y_offset = 60
         else:
             y_offset = 35
         
         # 게임 모드 표시
-        mode_text = f"모드: {self.menu_options[self.selected_mode]}"
-        mode_surface = self.small_font.render(mode_text, True, (255, 255, 255))
-        self.screen.blit(mode_surface, (10, y_offset))
+        mode_text = (f"모드: {self.menu_options[self.selected_mode]} "
+                     f"({RULE_NAMES[self.board.rules.name]}, {self.board.size}x{self.board.size})")
+        lines.append((mode_text, (255, 255, 255), (10, y_offset)))
+        
+        # 대국 시계 - 차례인 쪽은 노란색, 10초 미만이면 빨간색
+        if self.clock and not self.client:
+            for i, (player, name) in enumerate(((1, "흑"), (2, "백"))):
+                remaining = self.clock.remaining_ms(player)
+                color = ((255, 80, 80) if remaining < 10_000 else (255, 220, 120) if self.clock.running == player
+                         else (200, 200, 200))
+                lines.append((f"{name} {format_clock(remaining)}", color, (self.board.screen_width - 110, 10 + i * 25)))
         
         # 조작법
         controls = [
             "R: 게임 리셋",
+            "U: 무르기, Y: 다시 두기, S: 기보 저장",
             "M: 메뉴로 돌아가기",
+            "F3: AI 디버그 정보, P: 미리 읽기 " + ("켜짐" if self.ponder else "꺼짐"),
             "ESC: 종료"
         ]
         for i, control in enumerate(controls):
-            control_surface = self.small_font.render(control, True, (200, 200, 200))
-            self.screen.blit(control_surface, (10, y_offset + 25 + i * 20))
+            lines.append((control, (200, 200, 200), (10, y_offset + 25 + i * 20)))
+        
+        # AI 디버그 정보 - 마지막 수의 통계
+        if self.show_debug:
+            y = y_offset + 25 + len(controls) * 20 + 5
+            stats = self.ai.instrumentation.last if self.ai.instrumentation else None
+            debug_lines = format_stats(stats, self.board.size) if stats else ["AI 통계 없음"]
+            if self.ponder:
+                hits, misses = self.ai.ponder_hits, self.ai.ponder_misses
+                debug_lines = debug_lines + [f"미리 읽기 적중 {hits}/{hits + misses}"]
+            for i, text in enumerate(debug_lines):
+                lines.append((text, (255, 220, 120), (10, y + i * 20)))
+        return lines
+    
+    def draw_game_info(self, dirty: Optional[List[pygame.Rect]] = None) -> List[pygame.Rect]:
+        """게임 정보 그리기 - 글자가 바뀌었거나 아래 보드가 다시 그려졌을 때만 다시 그리고 갱신 영역을 반환"""
+        lines = self.get_info_lines()
+        surfaces = [(self.render_text(self.small_font, text, color), pos) for text, color, pos in lines]
+        rect = pygame.Rect(surfaces[0][0].get_rect(topleft=surfaces[0][1])).unionall(
+            [surface.get_rect(topleft=pos) for surface, pos in surfaces[1:]])
+        
+        overlapped = dirty is None or (self._info_rect is not None and self._info_rect.collidelist(dirty) != -1)
+        if lines == self._info_drawn and not overlapped:
+            return []
+        
+        # 이전 글자를 보드로 덮고 새로 그림 (글자를 겹쳐 그리면 가장자리가 번짐)
+        if self._info_rect is not None:
+            rect = rect.union(self._info_rect)
+        self.board.redraw_area(self.screen, rect)
+        for surface, pos in surfaces:
+            self.screen.blit(surface, pos)
+        self._info_drawn = lines
+        self._info_rect = rect
+        return [rect]
     
     def draw_game_over(self):
         """게임 오버 화면 그리기"""
@@ -243,7 +570,9 @@ class Game:
         self.screen.blit(overlay, (0, 0))
         
         # 결과 메시지
-        if self.winner == 0:
+        if self.ai_error:
+            message = f"AI 계산 실패: {self.ai_error}"
+        elif self.winner == 0:
             message = "무승부!"
         else:
             if self.game_mode == "2player":
@@ -258,46 +587,66 @@ class Game:
                     message = "당신이 승리했습니다!"
                 else:
                     message = "AI가 승리했습니다!"
+            if self.timed_out:
+                message += " (시간 초과)"
         
-        result_text = self.font.render(message, True, (255, 255, 255))
+        result_text = self.render_text(self.font, message, (255, 255, 255))
         result_rect = result_text.get_rect(center=(self.board.screen_width // 2, self.board.screen_height // 2))
         self.screen.blit(result_text, result_rect)
         
         # 재시작 안내
-        restart_text = self.small_font.render("R: 재시작, M: 메뉴로 돌아가기", True, (200, 200, 200))
+        restart_text = self.render_text(self.small_font, "R: 재시작, U: 무르기, M: 메뉴로 돌아가기", (200, 200, 200))
         restart_rect = restart_text.get_rect(center=(self.board.screen_width // 2, self.board.screen_height // 2 + 50))
         self.screen.blit(restart_text, restart_rect)
     
-    def run(self):
-        """게임 메인 루프"""
+    def run(self, startup: Optional[float] = None):
+        """게임 메인 루프 - startup(프로세스 시작 시각, perf_counter)을 주면 첫 화면까지의 시간을 재고 종료"""
         clock = pygame.time.Clock()
+        first_frame = True
         
         while True:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                    self.quit()
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.needs_redraw = True
                 
                 if self.show_menu:
                     self.handle_menu_events(event)
                 else:
                     self.handle_game_events(event)
             
-            # AI 수 두기
-            if (not self.show_menu and self.game_state == "playing" and 
-                self.game_mode != "2player" and self.current_player == 2):
-                pygame.time.wait(500)  # AI 생각 시간
-                self.ai_move()
+            # AI 수 두기 - 계산은 백그라운드에서, 화면은 계속 갱신
+            self.update_clock()
+            self.update_ai()
+            self.update_network()
             
-            # 화면 그리기
-            if self.show_menu:
-                self.draw_menu()
-            else:
-                self.board.draw(self.screen)
-                self.draw_game_info()
-                
-                if self.game_state == "game_over":
-                    self.draw_game_over()
+            # 화면 그리기 - 바뀐 것이 없으면 아무것도 그리지 않음
+            if self.needs_redraw:
+                self.needs_redraw = False
+                if self.show_menu:
+                    self.draw_menu()
+                else:
+                    self.board.draw(self.screen, full=True, marks=self.forbidden_marks())
+                    self.draw_game_info()
+                    
+                    if self.game_state == "game_over":
+                        self.draw_game_over()
+                pygame.display.flip()
+            elif not self.show_menu and self.game_state != "game_over":
+                dirty = self.board.draw(self.screen, marks=self.forbidden_marks())
+                dirty += self.draw_game_info(dirty)
+                if dirty:
+                    pygame.display.update(dirty)
+            
+            # 첫 화면을 띄운 뒤에 느린 초기화 (폰트 검색)
+            if first_frame:
+                first_frame = False
+                frame_ms = (time.perf_counter() - startup) * 1000 if startup is not None else 0.0
+                if self.fonts_pending:
+                    self.load_fonts()
+                if startup is not None:
+                    print(f"시작 시간: 첫 화면 {frame_ms:.0f}ms, 폰트 준비 {(time.perf_counter() - startup) * 1000:.0f}ms")
+                    self.quit()
             
-            pygame.display.flip()
             clock.tick(60) 
@@ -0,0 +1,247 @@
+import os
+import struct
+import numpy as np
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+MAGIC = b"OMGR"
+VERSION = 1
+HEADER_DTYPE = np.dtype([("magic", "S4"), ("version", "<u2")])
+# 한 판의 머리: 보드 크기, 승자 (0 무승부, 1 흑, 2 백, -1 모름), 수 개수 - 뒤에 수마다 칸 번호(row * size + col) u2
+GAME_DTYPE = np.dtype([("size", "u1"), ("winner", "i1"), ("count", "<u2")])
+MOVE_DTYPE = np.dtype("<u2")
+GAME_HEAD = struct.Struct("<BbH")  # GAME_DTYPE과 같은 배치 (스트리밍 읽기용)
+
+# 텍스트 기보의 결과 표기
+RESULTS = {1: "1-0", 2: "0-1", 0: "1/2-1/2", None: "*"}
+RESULT_WINNERS = {text: winner for winner, text in RESULTS.items()}
+
+
+class GameRecord:
+    """한 판의 기보 - 흑부터 번갈아 둔 수 목록과 결과"""
+
+    def __init__(self, moves: List[Tuple[int, int]], size: int = 15, winner: Optional[int] = None):
+        self.moves = moves
+        self.size = size
+        self.winner = winner
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, GameRecord) and self.size == other.size and
+                self.winner == other.winner and list(self.moves) == list(other.moves))
+
+    def __repr__(self) -> str:
+        return f"GameRecord({format_moves(self.moves, self.size)!r}, size={self.size}, winner={self.winner})"
+
+    def to_array(self) -> np.ndarray:
+        """수 순서대로 1(흑)/2(백)을 놓은 보드"""
+        grid = np.zeros((self.size, self.size), dtype=np.int8)
+        for i, (row, col) in enumerate(self.moves):
+            grid[row, col] = 1 + i % 2
+        return grid
+
+
+def encode(record: GameRecord) -> bytes:
+    """한 판을 이진 형식으로 (머리 4바이트 + 수당 2바이트)"""
+    head = np.array([(record.size, -1 if record.winner is None else record.winner, len(record.moves))],
+                    dtype=GAME_DTYPE)
+    cells = np.array([row * record.size + col for row, col in record.moves], dtype=MOVE_DTYPE)
+    return head.tobytes() + cells.tobytes()
+
+
+def _decode(size: int, winner: int, cells: np.ndarray) -> GameRecord:
+    return GameRecord([divmod(cell, size) for cell in cells.tolist()], size, None if winner < 0 else winner)
+
+
+class RecordWriter:
+    """기보 파일에 한 판씩 이어 쓰기 (파일이 없으면 머리부터 씀)"""
+
+    def __init__(self, path: str, append: bool = True):
+        exists = append and os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            _check_header(path)
+        self.file: BinaryIO = open(path, "ab" if exists else "wb")
+        if not exists:
+            self.file.write(np.array([(MAGIC, VERSION)], dtype=HEADER_DTYPE).tobytes())
+        self.count = 0
+
+    def write(self, record: GameRecord):
+        self.file.write(encode(record))
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_records(path: str, records: Iterable[GameRecord], append: bool = False) -> int:
+    """기보들을 파일에 저장하고 쓴 판 수를 반환"""
+    with RecordWriter(path, append) as writer:
+        for record in records:
+            writer.write(record)
+        return writer.count
+
+
+def _check_header(path: str):
+    with open(path, "rb") as f:
+        header = np.frombuffer(f.read(HEADER_DTYPE.itemsize), dtype=HEADER_DTYPE)
+    if len(header) != 1 or header[0]["magic"] != MAGIC or header[0]["version"] != VERSION:
+        raise ValueError(f"기보 파일 형식이 아닙니다: {path}")
+
+
+def iter_records(path: str, chunk_size: int = 1 << 20) -> Iterator[GameRecord]:
+    """기보 파일을 조금씩 읽으며 한 판씩 돌려줌 (파일 전체를 메모리에 올리지 않음)"""
+    _check_header(path)
+    head_size = GAME_DTYPE.itemsize
+    with open(path, "rb") as f:
+        f.seek(HEADER_DTYPE.itemsize)
+        buffer = b""
+        while True:
+            chunk = f.read(chunk_size)
+            buffer += chunk
+            pos = 0
+            while len(buffer) - pos >= head_size:
+                size, winner, count = GAME_HEAD.unpack_from(buffer, pos)
+                end = pos + head_size + count * MOVE_DTYPE.itemsize
+                if end > len(buffer):
+                    break
+                cells = np.frombuffer(buffer, dtype=MOVE_DTYPE, count=count, offset=pos + head_size)
+                yield _decode(size, winner, cells)
+                pos = end
+            buffer = buffer[pos:]
+            if not chunk:
+                if buffer:
+                    raise ValueError(f"기보 파일이 중간에 끊겼습니다: {path}")
+                return
+
+
+class RecordArchive:
+    """기보 파일 전체를 배열 몇 개로 읽은 것 - 판 i의 수는 moves[offsets[i]:offsets[i + 1]]"""
+
+    def __init__(self, sizes: np.ndarray, winners: np.ndarray, offsets: np.ndarray, moves: np.ndarray):
+        self.sizes = sizes
+        self.winners = winners  # -1: 모름
+        self.offsets = offsets
+        self.moves = moves  # 칸 번호 (row * size + col)
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def __getitem__(self, index: int) -> GameRecord:
+        cells = self.moves[self.offsets[index]:self.offsets[index + 1]]
+        return _decode(int(self.sizes[index]), int(self.winners[index]), cells)
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+
+def load_records(path: str) -> RecordArchive:
+    """기보 파일 전체를 한 번에 읽음 - 판 머리만 훑고 수는 하나의 배열로 모음"""
+    _check_header(path)
+    with open(path, "rb") as f:
+        f.seek(HEADER_DTYPE.itemsize)
+        raw = f.read()
+    head_size = GAME_DTYPE.itemsize
+    starts = []
+    pos = 0
+    total = len(raw)
+    while pos < total:
+        if pos + head_size > total:
+            raise ValueError(f"기보 파일이 중간에 끊겼습니다: {path}")
+        starts.append(pos)
+        pos += head_size + (raw[pos + 2] | raw[pos + 3] << 8) * MOVE_DTYPE.itemsize
+    if pos != total:
+        raise ValueError(f"기보 파일이 중간에 끊겼습니다: {path}")
+
+    data = np.frombuffer(raw, dtype=np.uint8)
+    starts = np.array(starts, dtype=np.int64)
+    heads = np.empty(len(starts), dtype=GAME_DTYPE)
+    heads["size"] = data[starts]
+    heads["winner"] = data.view(np.int8)[starts + 1]
+    heads["count"] = data[starts + 2] | (data[starts + 3].astype(np.uint16) << 8)
+
+    # 판 머리 바이트를 빼면 수들만 이어 붙은 u2 배열이 됨
+    is_move = np.ones(total, dtype=bool)
+    for offset in range(head_size):
+        is_move[starts + offset] = False
+    moves = data[is_move].view(MOVE_DTYPE)
+    offsets = np.zeros(len(starts) + 1, dtype=np.int64)
+    np.cumsum(heads["count"], out=offsets[1:])
+    return RecordArchive(heads["size"].copy(), heads["winner"].copy(), offsets, moves)
+
+
+def format_move(row: int, col: int, size: int = 15) -> str:
+    """오목 표준 표기 - 열은 왼쪽부터 a, b, ..., 행은 아래쪽부터 1, 2, ... (예: 15x15의 중앙은 h8)
+
+    26열을 넘는 큰 보드는 스프레드시트처럼 z 다음을 aa, ab, ...로 적는다.
+    """
+    letters = ""
+    col += 1
+    while col:
+        col, rest = divmod(col - 1, 26)
+        letters = chr(ord("a") + rest) + letters
+    return f"{letters}{size - row}"
+
+
+def parse_move(text: str, size: int = 15) -> Tuple[int, int]:
+    text = text.lower()
+    split = len(text.rstrip("0123456789"))  # 열 글자 수
+    if split == 0 or split == len(text) or not text[:split].isalpha():
+        raise ValueError(f"수 표기가 아닙니다: {text}")
+    col = 0
+    for letter in text[:split]:
+        col = col * 26 + ord(letter) - ord("a") + 1
+    col -= 1
+    row = size - int(text[split:])
+    if not (0 <= row < size and 0 <= col < size):
+        raise ValueError(f"보드 밖의 수입니다: {text}")
+    return row, col
+
+
+def format_moves(moves: Iterable[Tuple[int, int]], size: int = 15) -> str:
+    return " ".join(format_move(row, col, size) for row, col in moves)
+
+
+def parse_moves(text: str, size: int = 15) -> List[Tuple[int, int]]:
+    return [parse_move(token, size) for token in text.split()]
+
+
+def save_text(path: str, records: Iterable[GameRecord], append: bool = False) -> int:
+    """한 줄에 한 판: '[15] h8 i9 ... 1-0' (보드 크기, 수, 결과)"""
+    count = 0
+    with open(path, "a" if append else "w", encoding="utf-8") as f:
+        for record in records:
+            tokens = [f"[{record.size}]"] + [format_move(row, col, record.size) for row, col in record.moves]
+            f.write(" ".join(tokens + [RESULTS[record.winner]]) + "\n")
+            count += 1
+    return count
+
+
+def iter_text(path: str) -> Iterator[GameRecord]:
+    """텍스트 기보를 한 판씩 읽음 ('#'으로 시작하는 줄과 빈 줄은 무시)"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            tokens = line.split()
+            if not tokens or tokens[0].startswith("#"):
+                continue
+            size = 15
+            if tokens[0].startswith("["):
+                size = int(tokens.pop(0).strip("[]"))
+            winner = None
+            if tokens and tokens[-1] in RESULT_WINNERS:
+                winner = RESULT_WINNERS[tokens.pop()]
+            yield GameRecord([parse_move(token, size) for token in tokens], size, winner)
+
+
+def load_text(path: str) -> List[GameRecord]:
+    return list(iter_text(path))
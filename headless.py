@@ -0,0 +1,101 @@
+"""
+창 없이 터미널에서 AI와 두는 오목
+pygame을 불러오지 않고 규칙/AI 코어(BitBoard, rules, ai)만 써서 바로 시작합니다.
+
+사용 예:
+    python main.py --headless --difficulty hard
+    python main.py --headless --size 19 --rules renju
+"""
+
+import time
+from typing import Callable, Optional, Set, Tuple
+from ai import AI
+from bitboard import BitBoard
+from game_record import format_move, parse_move
+from instrumentation import Instrumentation
+from rules import make_rules
+
+STONE_MARKS = {0: ".", 1: "X", 2: "O"}
+FORBIDDEN_MARK = "*"  # 렌주룰에서 흑이 둘 수 없는 자리
+
+
+def render(board: BitBoard, marks: Set[Tuple[int, int]] = frozenset()) -> str:
+    """보드를 글자로 - 열은 위에 a, b, ..., 행은 왼쪽에 아래쪽부터 1, 2, ... (오목 표준 표기와 같음)"""
+    size = board.size
+    letters = [format_move(0, col, size).rstrip("0123456789") for col in range(size)]
+    width = max(len(letter) for letter in letters) + 1
+    label = len(str(size))
+    lines = [" " * label + " " + "".join(letter.rjust(width) for letter in letters)]
+    for row in range(size):
+        cells = [FORBIDDEN_MARK if (row, col) in marks else STONE_MARKS[int(board.grid[row, col])]
+                 for col in range(size)]
+        lines.append(str(size - row).rjust(label) + " " + "".join(cell.rjust(width) for cell in cells))
+    return "\n".join(lines)
+
+
+def run_headless(difficulty: str = "hard", rules: str = "freestyle", size: int = 15, evaluator: Optional[str] = None,
+                 ai_log: Optional[str] = None, startup: Optional[float] = None,
+                 read: Callable[[str], str] = input) -> Optional[int]:
+    """플레이어(흑)와 AI(백)가 번갈아 둠 - 승자(1, 2, 무승부 0)를 반환, 도중에 끝내면 None
+
+    startup(프로세스 시작 시각, perf_counter)을 주면 첫 입력을 기다리기까지의 시간을 재고 바로 끝낸다.
+    """
+    board = BitBoard(size)
+    game_rules = make_rules(rules, board)
+    ai = AI(2, rules=rules, evaluator=evaluator)
+    if ai_log:
+        ai.instrumentation = Instrumentation(log_path=ai_log)
+    print(render(board, game_rules.forbidden_points()))
+    if startup is not None:
+        print(f"시작 시간: 첫 입력 대기 {(time.perf_counter() - startup) * 1000:.0f}ms")
+        return None
+
+    center = format_move(size // 2, size // 2, size)
+    try:
+        while True:
+            try:
+                text = read(f"당신(X) 차례 - 수(예: {center}), u: 무르기, q: 종료 > ").strip().lower()
+            except EOFError:
+                return None
+            if text in ("q", "quit"):
+                return None
+            if text == "u":
+                # 내 수와 AI의 응수를 함께 무름
+                for _ in range(min(2, len(board.history))):
+                    board.undo()
+                print(render(board, game_rules.forbidden_points()))
+                continue
+            try:
+                row, col = parse_move(text, size)
+            except ValueError as e:
+                print(e)
+                continue
+            if board.grid[row, col] != 0:
+                print("이미 돌이 있는 자리입니다")
+                continue
+            if game_rules.is_forbidden(row, col, 1):
+                print("금수 자리입니다 (렌주룰)")
+                continue
+
+            for player in (1, 2):
+                if player == 2:
+                    start = time.perf_counter()
+                    row, col = ai.get_move_with_difficulty(board.grid, difficulty)
+                    print(f"AI(O): {format_move(row, col, size)} ({(time.perf_counter() - start) * 1000:.0f}ms)")
+                    if game_rules.is_forbidden(row, col, player) or not board.place(row, col, player):
+                        print("AI가 둘 수 없는 자리에 두었습니다 - 당신의 승리!")
+                        return 1
+                else:
+                    board.place(row, col, player)
+                if game_rules.is_win(row, col, player):
+                    print(render(board))
+                    print("당신의 승리!" if player == 1 else "AI의 승리!")
+                    return player
+                if board.is_full():
+                    print(render(board))
+                    print("무승부!")
+                    return 0
+            print(render(board, game_rules.forbidden_points()))
+    finally:
+        if ai.instrumentation:
+            ai.instrumentation.close()
@@ -0,0 +1,77 @@
+import json
+import threading
+from typing import Callable, Dict, List, Optional, TextIO
+from bitboard import line_value
+from game_record import format_move
+from movegen import pattern_cache_info
+
+# 한 수의 기록에 들어가는 항목
+#   player, difficulty, stones(두기 전 돌 수), move, source(book/vcf/block/vct/ponder/search/mcts),
+#   candidates, evaluations, nodes, threat_nodes, depth, tt_hits, tt_probes, pattern_cache_hits,
+#   think_ms(배정한 생각 시간), wall_ms, score
+MoveStats = Dict[str, object]
+
+
+class Instrumentation:
+    """AI가 수를 둘 때마다 통계를 받아 콜백과 JSON-lines 로그로 내보냄
+
+    AI.instrumentation에 붙였을 때만 통계를 모으므로, 붙이지 않으면 추가 비용이 거의 없다.
+    기록은 AI를 돌리는 스레드에서 들어오고, last/history는 다른 스레드에서 읽어도 된다.
+    """
+
+    def __init__(self, callback: Optional[Callable[[MoveStats], None]] = None, log_path: Optional[str] = None,
+                 keep: int = 100):
+        self.callback = callback
+        self.log_path = log_path
+        self.keep = keep  # 보관할 최근 기록 수
+        self.history: List[MoveStats] = []
+        self.last: Optional[MoveStats] = None
+        self._lock = threading.Lock()
+        self._log: Optional[TextIO] = open(log_path, "a", encoding="utf-8") if log_path else None
+
+    def emit(self, stats: MoveStats):
+        with self._lock:
+            self.last = stats
+            self.history.append(stats)
+            del self.history[:-self.keep]
+            if self._log is not None:
+                self._log.write(json.dumps(stats, ensure_ascii=False) + "\n")
+                self._log.flush()
+        if self.callback is not None:
+            self.callback(stats)
+
+    def close(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+
+def pattern_cache_hits() -> int:
+    """패턴 점수/위협 판정 캐시의 누적 적중 수"""
+    return line_value.cache_info().hits + pattern_cache_info().hits
+
+
+def read_log(path: str) -> List[MoveStats]:
+    """JSON-lines 로그 읽기"""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def format_stats(stats: MoveStats, size: int = 15) -> List[str]:
+    """디버그 화면용 요약 줄들"""
+    row, col = stats["move"]
+    score = "-" if stats["score"] is None else f"{stats['score']:.0f}"
+    candidates = "-" if stats["candidates"] is None else stats["candidates"]
+    budget = f"/{stats['think_ms']:.0f}" if stats.get("think_ms") is not None else ""
+    lines = [f"AI 수 {format_move(row, col, size)} ({stats['source']}), {stats['wall_ms']:.0f}{budget}ms, 점수 {score}"]
+    details = [f"후보 {candidates}", f"평가 {stats['evaluations']}", f"노드 {stats['nodes']}"]
+    if stats["depth"]:
+        details.append(f"깊이 {stats['depth']}")
+    if stats["threat_nodes"]:
+        details.append(f"위협 {stats['threat_nodes']}")
+    lines.append(", ".join(details))
+    probes = stats["tt_probes"]
+    hit_rate = stats["tt_hits"] / probes if probes else 0.0
+    lines.append(f"치환표 적중 {stats['tt_hits']}/{probes} ({hit_rate:.0%}), 패턴 캐시 적중 {stats['pattern_cache_hits']}")
+    return lines
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+게임 서버 부하 테스트
+여러 클라이언트가 동시에 접속해 무작위 수로 게임을 끝까지 두고, 초당 게임 수와 수당 왕복 지연 시간을 잽니다.
+
+사용 예:
+    python server.py --port 8765 &
+    python loadtest.py --port 8765 --clients 200 --games 2 --mode ai_easy
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import numpy as np
+from typing import Dict, List, Optional
+from server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class LoadClient:
+    """무작위 수를 두는 클라이언트 하나"""
+
+    def __init__(self, host: str, port: int, mode: str, size: int, rng: random.Random):
+        self.host = host
+        self.port = port
+        self.mode = mode
+        self.size = size
+        self.rng = rng
+        self.latencies: List[float] = []  # 내 수를 보내고 반영된 상태를 받기까지
+        self.ai_latencies: List[float] = []  # 내 수가 반영된 뒤 AI 수를 받기까지
+        self.games = 0
+        self.errors = 0
+
+    async def run(self, games: int):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            for _ in range(games):
+                await self._play(reader, writer)
+                self.games += 1
+        finally:
+            writer.close()
+
+    async def _play(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        hotseat = self.mode == "2player"
+        self._send(writer, {"op": "new", "mode": self.mode, "hotseat": hotseat})
+        empty = [(row, col) for row in range(self.size) for col in range(self.size)]
+        self.rng.shuffle(empty)
+        game_id: Optional[int] = None
+        pending = None  # (보낸 칸, 보낸 시각)
+        replied_at: Optional[float] = None
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("서버가 연결을 끊었습니다")
+            message = json.loads(line)
+            op = message["op"]
+            if op == "created":
+                game_id = message["game"]
+                continue
+            if op == "error":
+                self.errors += 1
+                continue
+            if op != "state" or message["game"] != game_id:
+                continue
+
+            now = time.perf_counter()
+            if "last" in message:
+                row, col, _ = message["last"]
+                empty.remove((row, col))
+                if pending is not None and pending[0] == (row, col):
+                    self.latencies.append(now - pending[1])
+                    pending = None
+                    replied_at = now
+                elif replied_at is not None:
+                    self.ai_latencies.append(now - replied_at)
+                    replied_at = None
+            if message["winner"] is not None:
+                return
+            if message["turn"] == 1 or hotseat:
+                cell = empty[-1]
+                pending = (cell, time.perf_counter())
+                self._send(writer, {"op": "move", "game": game_id, "row": cell[0], "col": cell[1]})
+                await writer.drain()
+
+    @staticmethod
+    def _send(writer: asyncio.StreamWriter, message: Dict):
+        writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    data = np.array(values) * 1000
+    p50, p90, p99 = np.percentile(data, [50, 90, 99])
+    return {"p50": float(p50), "p90": float(p90), "p99": float(p99), "max": float(data.max())}
+
+
+async def run_load(host: str, port: int, clients: int = 100, games: int = 1, mode: str = "ai_easy",
+                   size: int = 15, seed: int = 0) -> Dict:
+    """clients개의 클라이언트가 각자 games판씩 두고 통계를 반환"""
+    load_clients = [LoadClient(host, port, mode, size, random.Random(seed + i)) for i in range(clients)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client.run(games) for client in load_clients), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    finished = sum(client.games for client in load_clients)
+    latencies = [t for client in load_clients for t in client.latencies]
+    ai_latencies = [t for client in load_clients for t in client.ai_latencies]
+    return {
+        "clients": clients,
+        "mode": mode,
+        "games": finished,
+        "failed_clients": sum(1 for result in results if isinstance(result, Exception)),
+        "errors": sum(client.errors for client in load_clients),
+        "elapsed_s": elapsed,
+        "games_per_sec": finished / elapsed if elapsed else 0.0,
+        "moves_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "move_latency_ms": percentiles(latencies),
+        "ai_latency_ms": percentiles(ai_latencies),
+    }
+
+
+def print_report(report: Dict):
+    print(f"클라이언트 {report['clients']}개 ({report['mode']}): {report['games']}판 완료, "
+          f"{report['elapsed_s']:.1f}초, {report['games_per_sec']:.2f} 판/초, {report['moves_per_sec']:.0f} 수/초")
+    if report["failed_clients"] or report["errors"]:
+        print(f"  실패한 클라이언트 {report['failed_clients']}개, 오류 응답 {report['errors']}개")
+    for name, key in (("수 왕복", "move_latency_ms"), ("AI 응답", "ai_latency_ms")):
+        latency = report[key]
+        print(f"  {name} 지연: p50 {latency['p50']:.2f}ms p90 {latency['p90']:.2f}ms "
+              f"p99 {latency['p99']:.2f}ms 최대 {latency['max']:.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="게임 서버 부하 테스트")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--clients", type=int, default=100, help="동시 접속 클라이언트 수")
+    parser.add_argument("--games", type=int, default=1, help="클라이언트당 게임 수")
+    parser.add_argument("--mode", default="ai_easy", help="게임 모드 (2player는 한 클라이언트가 흑백을 모두 둠)")
+    parser.add_argument("--size", type=int, default=15, help="서버의 보드 크기")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args.host, args.port, args.clients, args.games, args.mode, args.size, args.seed))
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,22 +5,77 @@
 Python과 Pygame을 사용한 3D 효과가 있는 오목 게임
 """
 
+import time
+
+STARTUP = time.perf_counter()  # 시작 시간 측정 기준 (--startup-time)
+
+import argparse
 import sys
 import os
 
 # 현재 디렉토리를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from game import Game
+# pygame과 게임 창(game), AI 코어는 인자를 읽은 뒤 필요한 것만 불러옴 (--headless는 pygame 없이 시작)
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="3D 오목 게임")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="게임 서버에 접속해서 플레이 (server.py)")
+    parser.add_argument("--ai-log", metavar="PATH", help="AI가 둘 때마다 통계를 JSON-lines로 기록")
+    parser.add_argument("--rules", choices=["freestyle", "renju"], default="freestyle",
+                        help="규칙 (freestyle: 자유룰, renju: 렌주룰) - 메뉴에서 Tab으로도 바꿀 수 있음")
+    parser.add_argument("--size", type=int, default=15,
+                        help="보드 크기 (15, 19, 50 등) - 메뉴에서 ←→로도 바꿀 수 있음")
+    parser.add_argument("--ponder", action="store_true",
+                        help="어려움 AI가 내 차례 동안 예상 응수를 미리 탐색 (게임 중 P로도 켜고 끌 수 있음)")
+    parser.add_argument("--evaluator", metavar="PATH",
+                        help="AI 평가에 쓸 신경망 가중치 파일 (.npz, train_net.py로 학습) - 없으면 패턴 점수")
+    parser.add_argument("--mcts-workers", type=int, default=1,
+                        help="MCTS 난이도에서 루트 병렬로 탐색할 프로세스 수")
+    parser.add_argument("--clock", metavar="MIN+SEC",
+                        help="대국 시계 (예: 5+3 - 5분, 수마다 3초 추가) - AI는 남은 시간에 맞춰 생각 시간을 정함")
+    parser.add_argument("--headless", action="store_true",
+                        help="창 없이 터미널에서 AI와 두기 (pygame 없이 시작)")
+    parser.add_argument("--difficulty", choices=["easy", "medium", "hard", "mcts"], default="hard",
+                        help="--headless의 AI 난이도")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="첫 화면(--headless는 첫 입력 대기)까지 걸린 시간을 출력하고 종료")
+    args = parser.parse_args()
+    if not 5 <= args.size <= 255:
+        parser.error("보드 크기는 5에서 255 사이여야 합니다")
+    startup = STARTUP if args.startup_time else None
+    time_control = None
+    if args.clock:
+        from time_control import parse_time_control
+        try:
+            time_control = parse_time_control(args.clock)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    if args.headless:
+        from headless import run_headless
+        try:
+            run_headless(args.difficulty, args.rules, args.size, args.evaluator, args.ai_log, startup)
+        except KeyboardInterrupt:
+            print()
+        return
+    
     print("3D 오목 게임을 시작합니다...")
     print("게임 로딩 중...")
     
     try:
-        game = Game()
-        game.run()
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+        from game import Game
+        from net_client import GameClient
+        client = None
+        if args.connect:
+            host, _, port = args.connect.rpartition(":")
+            client = GameClient(host or "127.0.0.1", int(port))
+            print(f"서버 접속: {args.connect}")
+        game = Game(client, args.ai_log, args.rules, args.size, args.ponder, args.evaluator, args.mcts_workers,
+                    time_control)
+        game.run(startup)
     except KeyboardInterrupt:
         print("\n게임이 중단되었습니다.")
     except Exception as e:
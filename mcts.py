@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+몬테카를로 트리 탐색 (UCT/PUCT) 엔진
+패턴 평가기로는 UCT + 빠른 롤아웃, 신경망 평가기로는 PUCT(정책을 사전 확률로, 가치를 롤아웃 대신)로 탐색합니다.
+여러 프로세스가 각자 같은 루트에서 트리를 키우고 루트 방문 수를 합치는 루트 병렬 방식입니다.
+루트 국면은 공유 메모리 보드 풀(board_pool.py)에 한 번 써 두고 작업 프로세스들이 복사 없이 읽습니다.
+
+사용 예 (코어 수에 따른 초당 플레이아웃 확인):
+    python mcts.py --workers 1,2,4,8 --think-ms 2000
+"""
+
+import argparse
+import math
+import random
+import threading
+import time
+import numpy as np
+from typing import Dict, List, Optional, Tuple, Union
+from bitboard import BitBoard
+from board_pool import BoardPool
+from evaluator import Evaluator, PatternEvaluator, make_evaluator
+from movegen import ordered_moves
+from rules import make_rules
+
+# 롤아웃을 끊었을 때 패턴 점수 차를 승률로 바꾸는 척도
+ROLLOUT_SCALE = 2000.0
+
+# 작업 프로세스마다 평가기를 한 번만 만듦 (가중치 파일 경로 -> 평가기)
+_worker_evaluators: Dict[str, Evaluator] = {}
+
+
+class Node:
+    """트리 노드 - value는 이 노드의 수를 둔 쪽(player) 입장의 누적 결과 (이김 1, 짐 0)"""
+
+    __slots__ = ("move", "parent", "player", "prior", "children", "untried", "visits", "value", "winner")
+
+    def __init__(self, move: Optional[Tuple[int, int]], parent: Optional["Node"], player: int, prior: float = 1.0):
+        self.move = move
+        self.parent = parent
+        self.player = player
+        self.prior = prior
+        self.children: List["Node"] = []
+        self.untried: Optional[List[Tuple[Tuple[int, int], float]]] = None  # (수, 사전 확률) - 처음 방문할 때 채움
+        self.visits = 0
+        self.value = 0.0
+        self.winner = False  # 이 수로 이겼는지 (끝난 국면)
+
+
+class MCTSEngine:
+    """UCT/PUCT 몬테카를로 트리 탐색
+
+    선택: 패턴 평가기면 UCT(c = exploration), 신경망 평가기면 PUCT(정책 확률을 사전 확률로)
+    확장: movegen.ordered_moves의 위협 순 후보 중 상위 max_children개 (이기거나 막아야 하는 수가 있으면 그 수만)
+    평가: 돌 주변 후보에서 고르는 빠른 롤아웃 (rollout_depth수 뒤에 끊고 패턴 점수로 판정), 또는 신경망 가치
+    workers가 2 이상이면 작업 프로세스들이 루트 병렬로 트리를 키우고 루트 방문 수를 합친다.
+    """
+
+    def __init__(self, think_ms: int = 1000, playouts: Optional[int] = None, workers: int = 1,
+                 exploration: float = 1.0, max_children: int = 12, rollout_depth: int = 30, rollout_sample: int = 3,
+                 evaluator: Union[str, Evaluator, None] = None, seed: Optional[int] = None):
+        self.think_ms = think_ms
+        self.playouts_budget = playouts  # 주면 시간 대신 (전체) 플레이아웃 수로 멈춤
+        self.workers = workers
+        self.exploration = exploration
+        self.max_children = max_children
+        self.rollout_depth = rollout_depth
+        self.rollout_sample = rollout_sample  # 롤아웃 한 수마다 후보 몇 개를 뽑아 패턴 점수로 고를지
+        self.evaluator = make_evaluator(evaluator)
+        self.rng = random.Random(seed)
+
+        self.playouts = 0
+        self.elapsed = 0.0
+        self.best_value: Optional[float] = None
+        self.root_visits: Dict[Tuple[int, int], int] = {}
+        self._executor = None  # workers가 2 이상일 때 처음 탐색하면서 만드는 ProcessPoolExecutor
+        self._boards: Optional[BoardPool] = None  # 작업 프로세스들이 읽을 루트 국면 (슬롯 하나)
+
+    @property
+    def playouts_per_sec(self) -> float:
+        return self.playouts / self.elapsed if self.elapsed else 0.0
+
+    def search(self, board: BitBoard, player: int, stop: Optional[threading.Event] = None,
+               think_ms: Optional[float] = None) -> Tuple[int, int]:
+        """가장 많이 방문한 루트 수를 반환 - board는 두고 무르며 쓰고 원래 상태로 돌려놓음
+
+        think_ms를 주면 이번 탐색에만 self.think_ms 대신 그 시간을 쓴다.
+        """
+        think_ms = self.think_ms if think_ms is None else think_ms
+        start = time.perf_counter()
+        self.playouts = 0
+        if not board.history:
+            self.elapsed = time.perf_counter() - start
+            return board.size // 2, board.size // 2
+
+        jobs = []
+        if self.workers > 1:
+            # 프로세스 풀 모듈은 여러 프로세스로 탐색할 때만 불러옴 (AI 코어를 가볍게 불러오도록)
+            from concurrent.futures import ProcessPoolExecutor
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers - 1)
+            if self._boards is None or self._boards.size != board.size:
+                if self._boards is not None:
+                    self._boards.close()
+                self._boards = BoardPool(1, board.size)
+            self._boards.write(0, board, player)
+            rules = board.rules.name if board.rules is not None else "freestyle"
+            budget = None if self.playouts_budget is None else self.playouts_budget // self.workers
+            # 신경망은 가중치 파일 경로만 넘기고 작업 프로세스에서 한 번 읽어 둠
+            spec = getattr(self.evaluator, "path", None) or self.evaluator
+            jobs = [self._executor.submit(_search_worker, self._boards.spec, rules, think_ms, budget,
+                                          self._params(), spec, self.rng.randrange(1 << 30))
+                    for _ in range(self.workers - 1)]
+
+        # 이 프로세스도 하나의 작업자로 트리를 키움 (stop 신호는 여기서만 받음)
+        budget = self.playouts_budget
+        if budget is not None and self.workers > 1:
+            budget = budget - budget // self.workers * (self.workers - 1)
+        root = self._grow(board, player, think_ms, budget, stop)
+        visits = {child.move: [child.visits, child.value] for child in root.children}
+        self.playouts = root.visits
+
+        if jobs:
+            from concurrent.futures import wait
+            done, _ = wait(jobs, timeout=None if stop is None or not stop.is_set() else 0)
+            for job in done:
+                counts, playouts = job.result()
+                self.playouts += playouts
+                for move, (child_visits, value) in counts.items():
+                    total = visits.setdefault(move, [0, 0.0])
+                    total[0] += child_visits
+                    total[1] += value
+
+        self.elapsed = time.perf_counter() - start
+        self.root_visits = {move: count for move, (count, _) in visits.items()}
+        if not visits:
+            moves = ordered_moves(board, player)
+            self.best_value = None
+            return moves[0] if moves else (board.size // 2, board.size // 2)
+        move, (count, value) = max(visits.items(), key=lambda item: item[1][0])
+        self.best_value = value / count if count else None
+        return move
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._boards is not None:
+            self._boards.close()
+            self._boards = None
+
+    def _params(self) -> Dict:
+        return {"exploration": self.exploration, "max_children": self.max_children,
+                "rollout_depth": self.rollout_depth, "rollout_sample": self.rollout_sample}
+
+    def _grow(self, board: BitBoard, player: int, think_ms: float, playouts: Optional[int],
+              stop: Optional[threading.Event]) -> Node:
+        """시간이나 플레이아웃 예산이 다할 때까지 트리를 키우고 루트를 반환"""
+        root = Node(None, None, 3 - player)
+        deadline = time.perf_counter() + think_ms / 1000.0
+        clock = time.perf_counter
+        while True:
+            if playouts is not None:
+                if root.visits >= playouts:
+                    break
+            elif clock() > deadline:
+                break
+            if stop is not None and stop.is_set():
+                break
+            self._playout(board, root)
+            # 루트의 수가 하나뿐이면 (이기거나 막아야 하는 수) 더 볼 필요 없음
+            if root.untried == [] and len(root.children) == 1:
+                break
+        return root
+
+    def _playout(self, board: BitBoard, root: Node):
+        node = root
+        depth = 0
+        try:
+            # 선택 - 모든 후보를 펼친 노드에서는 UCT/PUCT 점수가 가장 높은 자식으로 내려감
+            while not node.winner:
+                if node.untried is None:
+                    node.untried = self._expand_moves(board, 3 - node.player)
+                if node.untried:
+                    move, prior = node.untried.pop(0)
+                    child = Node(move, node, 3 - node.player, prior)
+                    node.children.append(child)
+                    node = child
+                    child.winner = self._play(board, move, child.player)
+                    depth += 1
+                    break
+                if not node.children:
+                    break  # 둘 곳이 없음 (무승부)
+                node = self._select(node)
+                self._play(board, node.move, node.player)
+                depth += 1
+
+            # 평가 - node.player 입장의 결과
+            if node.winner:
+                result = 1.0
+            elif node.untried == [] and not node.children:
+                result = 0.5
+            else:
+                result = self._evaluate(board, node.player)
+        finally:
+            for _ in range(depth):
+                board.undo()
+
+        # 역전파 - 한 단계 올라갈 때마다 입장이 바뀜
+        while node is not None:
+            node.visits += 1
+            node.value += result
+            result = 1.0 - result
+            node = node.parent
+
+    def _expand_moves(self, board: BitBoard, player: int) -> List[Tuple[Tuple[int, int], float]]:
+        moves = ordered_moves(board, player)[:self.max_children]
+        if not moves:
+            return []
+        if isinstance(self.evaluator, PatternEvaluator):
+            return [(move, 1.0) for move in moves]
+        policy = self.evaluator.policy(board, player)
+        priors = np.array([policy[row, col] for row, col in moves])
+        priors = priors / priors.sum() if priors.sum() > 0 else np.full(len(moves), 1 / len(moves))
+        return list(zip(moves, priors.tolist()))
+
+    def _select(self, node: Node) -> Node:
+        log_visits = math.log(node.visits)
+        sqrt_visits = math.sqrt(node.visits)
+        puct = not isinstance(self.evaluator, PatternEvaluator)
+        best, best_score = None, -math.inf
+        for child in node.children:
+            if child.winner:
+                return child  # 이기는 수는 항상 그 수
+            mean = child.value / child.visits
+            if puct:
+                score = mean + self.exploration * child.prior * sqrt_visits / (1 + child.visits)
+            else:
+                score = mean + self.exploration * math.sqrt(log_visits / child.visits)
+            if score > best_score:
+                best, best_score = child, score
+        return best
+
+    @staticmethod
+    def _play(board: BitBoard, move: Tuple[int, int], player: int) -> bool:
+        """수를 두고 그 수로 이겼는지"""
+        row, col = move
+        board.place(row, col, player)
+        if board.rules is not None:
+            return board.rules.is_win(row, col, player)
+        return board.is_five(row, col, player)
+
+    def _evaluate(self, board: BitBoard, player: int) -> float:
+        """방금 player가 둔 국면의 player 입장 승률 (0 ~ 1)"""
+        if not isinstance(self.evaluator, PatternEvaluator):
+            return 0.5 - 0.5 * self.evaluator.evaluate(board, 3 - player) / self.evaluator.value_scale
+        return self._rollout(board, player)
+
+    def _rollout(self, board: BitBoard, player: int) -> float:
+        """돌 주변 후보 몇 개를 뽑아 패턴 점수가 가장 좋은 수로 번갈아 두는 빠른 롤아웃 (금수는 보지 않음)"""
+        rng = self.rng
+        sample = self.rollout_sample
+        to_move = 3 - player
+        played = 0
+        result = None
+        try:
+            while played < self.rollout_depth:
+                candidates = tuple(board.candidates)
+                if not candidates:
+                    result = 0.5
+                    break
+                picks = rng.sample(candidates, min(sample, len(candidates)))
+                if len(picks) > 1:
+                    row, col = max(picks, key=lambda cell: board.move_gain(cell[0], cell[1], to_move)[0] +
+                                   board.move_gain(cell[0], cell[1], 3 - to_move)[0])
+                else:
+                    row, col = picks[0]
+                won = self._play(board, (row, col), to_move)
+                played += 1
+                if won:
+                    result = 1.0 if to_move == player else 0.0
+                    break
+                to_move = 3 - to_move
+            if result is None:
+                result = 0.5 + 0.5 * math.tanh(board.evaluate(player) / ROLLOUT_SCALE)
+        finally:
+            for _ in range(played):
+                board.undo()
+        return result
+
+
+def _search_worker(boards: Tuple[str, int, int], rules: str, think_ms: float, playouts: Optional[int], params: Dict,
+                   evaluator: Union[str, Evaluator, None], seed: int) -> Tuple[Dict[Tuple[int, int], List], int]:
+    """작업 프로세스에서 루트부터 트리 하나를 키우고 (루트 자식별 [방문 수, 누적 결과], 플레이아웃 수)를 반환
+
+    루트 국면과 둘 차례는 보드 풀(boards)의 0번 슬롯에서 읽는다.
+    """
+    pool = BoardPool.attach(boards)
+    board = pool.position(0)
+    player = pool.player(0)
+    if rules != "freestyle":
+        make_rules(rules, board)
+    if isinstance(evaluator, str):
+        if evaluator not in _worker_evaluators:
+            _worker_evaluators[evaluator] = make_evaluator(evaluator)
+        evaluator = _worker_evaluators[evaluator]
+    engine = MCTSEngine(think_ms, evaluator=evaluator, seed=seed, **params)
+    root = engine._grow(board, player, think_ms, playouts, None)
+    return {child.move: [child.visits, child.value] for child in root.children}, root.visits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCTS 초당 플레이아웃 측정 (작업 프로세스 수별)")
+    parser.add_argument("--workers", default="1,2,4", help="측정할 프로세스 수들 (예: 1,2,4,8)")
+    parser.add_argument("--think-ms", type=int, default=2000)
+    parser.add_argument("--stones", type=int, default=20, help="측정 국면의 돌 수")
+    parser.add_argument("--evaluator", help="신경망 가중치 파일 (없으면 롤아웃)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from benchmark import make_position
+    position = make_position(args.stones, random.Random(args.seed))
+    player = 1 + len(position.history) % 2
+    base = None
+    for workers in [int(count) for count in args.workers.split(",")]:
+        engine = MCTSEngine(args.think_ms, workers=workers, evaluator=args.evaluator, seed=args.seed)
+        try:
+            engine.search(position, player)  # 작업 프로세스 시작/캐시 준비
+            move = engine.search(position, player)
+        finally:
+            engine.close()
+        rate = engine.playouts_per_sec
+        base = base or rate
+        print(f"프로세스 {workers}개: {engine.playouts} 플레이아웃, {rate:.0f} 플레이아웃/초 "
+              f"(x{rate / base:.2f}), 수 {move}")
+
+
+if __name__ == "__main__":
+    main()
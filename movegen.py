@@ -0,0 +1,134 @@
+from functools import lru_cache
+from typing import List, Tuple
+from bitboard import BitBoard
+
+# 위협 단계
+NONE = 0
+THREE = 2       # 열린 삼 - 다음 수로 열린 사를 만들 수 있음
+FOUR = 3        # 막힌 사 - 완성 칸이 하나
+OPEN_FOUR = 4   # 열린 사 - 완성 칸이 둘 이상 (막을 수 없음)
+FIVE = 5
+
+# 정렬 우선순위 - 내 5목 > 상대 5목 저지 > 내 필승 위협 > 상대 필승 위협 저지 > 사/삼
+ATTACK_PRIORITY = {FIVE: 10 ** 12, OPEN_FOUR: 10 ** 10, FOUR: 10 ** 7, THREE: 10 ** 6, NONE: 0}
+DEFENSE_PRIORITY = {FIVE: 10 ** 11, OPEN_FOUR: 10 ** 9, FOUR: 10 ** 5, THREE: 5 * 10 ** 5, NONE: 0}
+
+
+def _covers(runs: int, a: int, b: int) -> bool:
+    """a와 b를 모두 포함하는 5칸 연속이 runs 안에 있는지"""
+    low = max(0, max(a, b) - 4)
+    high = min(a, b)
+    if high < low:
+        return False
+    return bool((runs >> low) & ((1 << (high - low + 1)) - 1))
+
+
+def _five_mask(bits: int) -> int:
+    return bits & (bits >> 1) & (bits >> 2) & (bits >> 3) & (bits >> 4)
+
+
+def _completions(mine: int, empty: int, pos: int) -> int:
+    """pos를 포함하는 5목을 완성시키는 빈 칸의 수"""
+    count = 0
+    for e in range(max(0, pos - 4), pos + 5):
+        if (empty >> e) & 1 and _covers(_five_mask(mine | (1 << e)), e, pos):
+            count += 1
+    return count
+
+
+@lru_cache(maxsize=1 << 16)
+def _window_threat(mine: int, theirs: int, valid: int) -> int:
+    """가운데(비트 4) 칸에 돌을 놓은 9칸 창의 위협 단계"""
+    mine |= 1 << 4
+    if _covers(_five_mask(mine), 4, 4):
+        return FIVE
+
+    empty = valid & ~mine & ~theirs
+    completions = _completions(mine, empty, 4)
+    if completions >= 2:
+        return OPEN_FOUR
+    if completions == 1:
+        return FOUR
+
+    for e in range(9):
+        if (empty >> e) & 1 and _completions(mine | (1 << e), empty & ~(1 << e), 4) >= 2:
+            return THREE
+    return NONE
+
+
+def line_threat(mine: int, theirs: int, valid: int, pos: int) -> int:
+    """한 줄의 빈 칸 pos에 돌을 놓았을 때 그 줄에서 생기는 위협 단계
+
+    pos를 지나는 5칸은 모두 pos-4 ~ pos+4 안에 있으므로 그 9칸만 잘라 캐시 키로 쓴다.
+    """
+    shift = pos - 4
+    if shift >= 0:
+        return _window_threat((mine >> shift) & 0x1FF, (theirs >> shift) & 0x1FF, (valid >> shift) & 0x1FF)
+    return _window_threat((mine << -shift) & 0x1FF, (theirs << -shift) & 0x1FF, (valid << -shift) & 0x1FF)
+
+
+def pattern_cache_info():
+    """위협 판정 캐시(9칸 창)의 통계 - functools.lru_cache의 cache_info()"""
+    return _window_threat.cache_info()
+
+
+def line_levels(board: BitBoard, row: int, col: int, player: int) -> List[int]:
+    """(row, col)에 player가 둘 때 네 방향 줄마다의 위협 단계 (여러 줄을 합친 판정 전)"""
+    opponent = 3 - player
+    levels = []
+    for d in range(4):
+        index, pos = board.line_index(d, row, col)
+        levels.append(line_threat(board.lines[player][d][index], board.lines[opponent][d][index],
+                                  board.valid[d][index], pos))
+    return levels
+
+
+def threat(board: BitBoard, row: int, col: int, player: int) -> Tuple[int, int]:
+    """(row, col)에 player가 둘 때 (가장 높은 위협 단계, 삼 이상 위협이 생기는 줄 수)"""
+    best = NONE
+    lines = 0
+    for level in line_levels(board, row, col, player):
+        if level > best:
+            best = level
+        if level >= THREE:
+            lines += 1
+    # 4-4, 4-3, 3-3 처럼 두 줄 이상에서 위협이 생기면 막을 수 없음
+    if best < FIVE and lines >= 2:
+        best = OPEN_FOUR
+    return best, lines
+
+
+def ordered_moves(board: BitBoard, player: int, forced: bool = True) -> List[Tuple[int, int]]:
+    """위협 기반으로 정렬된 후보 수
+
+    forced면 이기는 수가 있으면 그 수만, 상대의 5목을 막아야 하면 막는 수만 반환한다.
+    아니면 그런 수도 맨 앞에 두고 모든 후보를 반환한다.
+    board에 규칙(board.rules)이 붙어 있으면 player의 금수 자리는 빼고 본다.
+    """
+    if not board.history:
+        center = board.size // 2
+        return [(center, center)]
+
+    opponent = 3 - player
+    rules = board.rules
+    scored = []
+    blocks = []
+    for row, col in board.candidates:
+        # 금수 자리는 둘 수 없고, 상대의 금수 자리는 막을 필요가 없음
+        if rules is not None and rules.is_forbidden(row, col, player):
+            continue
+        attack, _ = threat(board, row, col, player)
+        if attack == FIVE and forced:
+            return [(row, col)]
+        defense, _ = threat(board, row, col, opponent)
+        if rules is not None and defense >= THREE and rules.is_forbidden(row, col, opponent):
+            defense = NONE
+        if defense == FIVE:
+            blocks.append((row, col))
+        gain = board.move_gain(row, col, player)[0] + board.move_gain(row, col, opponent)[0] * 0.8
+        scored.append((ATTACK_PRIORITY[attack] + DEFENSE_PRIORITY[defense] + gain, row, col))
+
+    if blocks and forced:
+        return blocks
+    scored.sort(reverse=True)
+    return [(row, col) for _, row, col in scored]
@@ -0,0 +1,45 @@
+import json
+import socket
+from typing import Dict, List
+
+
+class GameClient:
+    """게임 서버에 붙는 얇은 클라이언트 (pygame 루프에서 매 프레임 poll)
+
+    소켓은 논블로킹이라 poll()은 기다리지 않고, 도착한 메시지만 돌려준다.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = 5.0):
+        self.host = host
+        self.port = port
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.setblocking(False)
+        self._buffer = b""
+        self.connected = True
+
+    def send(self, message: Dict):
+        data = json.dumps(message, separators=(",", ":")).encode() + b"\n"
+        self.sock.setblocking(True)
+        try:
+            self.sock.sendall(data)
+        finally:
+            self.sock.setblocking(False)
+
+    def poll(self) -> List[Dict]:
+        """도착한 메시지들 (없으면 빈 목록)"""
+        while True:
+            try:
+                chunk = self.sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            if not chunk:
+                self.connected = False
+                break
+            self._buffer += chunk
+        *lines, self._buffer = self._buffer.split(b"\n")
+        return [json.loads(line) for line in lines if line]
+
+    def close(self):
+        self.connected = False
+        self.sock.close()
@@ -0,0 +1,142 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, List, Optional, Tuple, Union
+
+# 입력 평면: 둘 차례인 쪽의 돌, 상대 돌, 보드 안(1) - 0 패딩과 보드 바깥을 구분
+INPUT_PLANES = 3
+DTYPE = np.float32
+
+# 가중치 이름
+#   conv{i}.w (3, 3, 입력 채널, 출력 채널), conv{i}.b    몸통 3x3 합성곱 + ReLU
+#   policy.w (채널, 1), policy.b                          칸마다 둘 수의 로짓 (1x1 합성곱)
+#   value1.w (채널, 은닉), value1.b, value2.w (은닉, 1), value2.b   전역 평균 -> 은닉 -> tanh
+# 모두 합성곱이거나 전역 평균 뒤라서 보드 크기와 상관없이 같은 가중치를 쓴다.
+
+
+def encode_planes(grids: np.ndarray, players: Union[int, np.ndarray]) -> np.ndarray:
+    """(N, n, n) 보드 묶음 -> (N, n, n, 3) 입력 (players: 보드마다 둘 차례인 쪽)"""
+    grids = np.asarray(grids)
+    if grids.ndim == 2:
+        grids = grids[None]
+    players = np.broadcast_to(np.asarray(players), (grids.shape[0],))[:, None, None]
+    planes = np.empty(grids.shape + (INPUT_PLANES,), dtype=DTYPE)
+    planes[..., 0] = grids == players
+    planes[..., 1] = grids == 3 - players
+    planes[..., 2] = 1.0
+    return planes
+
+
+def im2col(x: np.ndarray) -> np.ndarray:
+    """(N, H, W, C) -> (N * H * W, 9 * C) - 3x3 창을 한 줄로 펼침 (가장자리는 0 패딩)"""
+    n, h, w, c = x.shape
+    padded = np.pad(x, ((0, 0), (1, 1), (1, 1), (0, 0)))
+    windows = sliding_window_view(padded, (3, 3), axis=(1, 2))  # (N, H, W, C, 3, 3)
+    return windows.transpose(0, 1, 2, 4, 5, 3).reshape(n * h * w, 9 * c)
+
+
+def col2im(cols: np.ndarray, shape: Tuple[int, int, int, int]) -> np.ndarray:
+    """im2col의 역방향 - 펼친 창의 기울기를 원래 칸으로 모아 더함"""
+    n, h, w, c = shape
+    cols = cols.reshape(n, h, w, 3, 3, c)
+    padded = np.zeros((n, h + 2, w + 2, c), dtype=cols.dtype)
+    for i in range(3):
+        for j in range(3):
+            padded[:, i:i + h, j:j + w, :] += cols[:, :, :, i, j, :]
+    return padded[:, 1:-1, 1:-1, :]
+
+
+def init_weights(channels: int = 32, layers: int = 4, hidden: int = 32, seed: int = 0) -> Dict[str, np.ndarray]:
+    """He 초기화한 새 가중치"""
+    rng = np.random.default_rng(seed)
+    weights = {}
+    fan_in = INPUT_PLANES
+    for i in range(layers):
+        weights[f"conv{i}.w"] = rng.normal(0, np.sqrt(2 / (9 * fan_in)), (3, 3, fan_in, channels)).astype(DTYPE)
+        weights[f"conv{i}.b"] = np.zeros(channels, dtype=DTYPE)
+        fan_in = channels
+    weights["policy.w"] = rng.normal(0, np.sqrt(1 / channels), (channels, 1)).astype(DTYPE)
+    weights["policy.b"] = np.zeros(1, dtype=DTYPE)
+    weights["value1.w"] = rng.normal(0, np.sqrt(2 / channels), (channels, hidden)).astype(DTYPE)
+    weights["value1.b"] = np.zeros(hidden, dtype=DTYPE)
+    weights["value2.w"] = rng.normal(0, np.sqrt(1 / hidden), (hidden, 1)).astype(DTYPE)
+    weights["value2.b"] = np.zeros(1, dtype=DTYPE)
+    return weights
+
+
+class PolicyValueNet:
+    """작은 합성곱 정책/가치 신경망 - NumPy만으로 CPU에서 추론 (float32)
+
+    forward는 보드 묶음 (N, n, n, 3)을 받아 칸별 수 로짓 (N, n, n)과 둘 차례인 쪽의 승패 예측 (N,)
+    (-1 패배 ~ 1 승리)을 돌려준다. 합성곱은 im2col로 펼쳐 행렬 곱 한 번으로 계산한다.
+    """
+
+    def __init__(self, weights: Dict[str, np.ndarray]):
+        self.weights = {name: np.asarray(value, dtype=DTYPE) for name, value in weights.items()}
+        self.layers = sum(1 for name in self.weights if name.startswith("conv") and name.endswith(".w"))
+
+    @property
+    def channels(self) -> int:
+        return self.weights["conv0.w"].shape[-1]
+
+    @classmethod
+    def load(cls, path: str) -> "PolicyValueNet":
+        with np.load(path) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def save(self, path: str):
+        np.savez(path, **self.weights)
+
+    def forward(self, planes: np.ndarray, cache: Optional[List] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(N, n, n, 3) -> (수 로짓 (N, n, n), 가치 (N,)) - cache를 주면 역전파에 쓸 중간값을 담음"""
+        w = self.weights
+        x = planes.astype(DTYPE, copy=False)
+        n, h, width, _ = x.shape
+        for i in range(self.layers):
+            kernel = w[f"conv{i}.w"]
+            cols = im2col(x)
+            out = cols @ kernel.reshape(-1, kernel.shape[-1]) + w[f"conv{i}.b"]
+            out = out.reshape(n, h, width, -1)
+            if cache is not None:
+                cache.append((x.shape, cols, out > 0))
+            x = np.maximum(out, 0)
+
+        logits = (x @ w["policy.w"] + w["policy.b"])[..., 0]
+        pooled = x.mean(axis=(1, 2))
+        hidden = np.maximum(pooled @ w["value1.w"] + w["value1.b"], 0)
+        value = np.tanh(hidden @ w["value2.w"] + w["value2.b"])[:, 0]
+        if cache is not None:
+            cache.append((x, pooled, hidden, value))
+        return logits, value
+
+    def backward(self, cache: List, d_logits: np.ndarray, d_value: np.ndarray) -> Dict[str, np.ndarray]:
+        """forward(cache=...) 뒤에 출력 기울기로부터 가중치별 기울기를 구함 (학습용)"""
+        w = self.weights
+        grads = {}
+        x, pooled, hidden, value = cache[-1]
+        n, h, width, channels = x.shape
+
+        # 가치 머리
+        d_pre = (d_value * (1 - value ** 2))[:, None]
+        grads["value2.w"] = hidden.T @ d_pre
+        grads["value2.b"] = d_pre.sum(axis=0)
+        d_hidden = (d_pre @ w["value2.w"].T) * (hidden > 0)
+        grads["value1.w"] = pooled.T @ d_hidden
+        grads["value1.b"] = d_hidden.sum(axis=0)
+        d_x = np.broadcast_to((d_hidden @ w["value1.w"].T)[:, None, None, :] / (h * width), x.shape).copy()
+
+        # 정책 머리
+        d_logits = d_logits[..., None]
+        grads["policy.w"] = x.reshape(-1, channels).T @ d_logits.reshape(-1, 1)
+        grads["policy.b"] = d_logits.sum(axis=(0, 1, 2))
+        d_x += d_logits @ w["policy.w"].T
+
+        # 몸통
+        for i in reversed(range(self.layers)):
+            shape, cols, active = cache[i]
+            kernel = w[f"conv{i}.w"]
+            d_out = (d_x * active).reshape(-1, kernel.shape[-1])
+            grads[f"conv{i}.w"] = (cols.T @ d_out).reshape(kernel.shape)
+            grads[f"conv{i}.b"] = d_out.sum(axis=0)
+            if i > 0:
+                d_x = col2im(d_out @ kernel.reshape(-1, kernel.shape[-1]).T, shape)
+        return grads
@@ -0,0 +1,136 @@
+import os
+import random
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from zobrist import zobrist_keys, SIDE_KEY
+
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+
+MAGIC = b"OMBK"
+VERSION = 1
+HEADER_DTYPE = np.dtype([("magic", "S4"), ("version", "<u2"), ("size", "<u2"), ("count", "<u4")])
+# 항목 하나: 대칭 정규화된 국면 해시, 그 국면 기준의 수, 둔 판 수, 이긴 판 수
+ENTRY_DTYPE = np.dtype([("key", "<u8"), ("move", "<u2"), ("games", "<u4"), ("wins", "<u4")])
+
+
+def transform(t: int, row: int, col: int, size: int) -> Tuple[int, int]:
+    """보드의 8가지 대칭 (회전 4 x 뒤집기 2)"""
+    last = size - 1
+    if t == 0:
+        return row, col
+    if t == 1:
+        return col, last - row
+    if t == 2:
+        return last - row, last - col
+    if t == 3:
+        return last - col, row
+    if t == 4:
+        return row, last - col
+    if t == 5:
+        return col, row
+    if t == 6:
+        return last - row, col
+    return last - col, last - row
+
+
+# 각 대칭의 역변환 (회전은 반대 방향, 뒤집기는 자기 자신)
+INVERSE = [0, 3, 2, 1, 4, 5, 6, 7]
+
+
+def canonical_key(grid: np.ndarray, player: int) -> Tuple[int, int]:
+    """8가지 대칭 중 해시가 가장 작은 것을 기준으로 (키, 그 대칭 번호)"""
+    size = grid.shape[0]
+    keys = zobrist_keys(size)
+    stones = [(int(row), int(col), int(grid[row, col])) for row, col in np.argwhere(grid != 0)]
+    side = SIDE_KEY if player == 2 else 0
+    best = None
+    for t in range(8):
+        key = side
+        for row, col, stone in stones:
+            r, c = transform(t, row, col, size)
+            key ^= keys[stone][r][c]
+        if best is None or key < best[0]:
+            best = (key, t)
+    return best
+
+
+class OpeningBook:
+    """대칭 정규화된 국면 -> 자가 대국에서 나온 응수와 승률"""
+
+    def __init__(self, size: int = 15, min_games: int = 4, min_win_rate: float = 0.5):
+        self.size = size
+        self.min_games = min_games  # 이보다 적게 둔 수는 쓰지 않음
+        self.min_win_rate = min_win_rate  # 이긴 비율이 이보다 낮은 수도 쓰지 않음
+        # key -> {move: [games, wins]}
+        self.entries: Dict[int, Dict[int, List[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, grid: np.ndarray, player: int, row: int, col: int, won: bool):
+        """player가 (row, col)에 둔 결과를 기록"""
+        key, t = canonical_key(grid, player)
+        r, c = transform(t, row, col, self.size)
+        stats = self.entries.setdefault(key, {}).setdefault(r * self.size + c, [0, 0])
+        stats[0] += 1
+        stats[1] += int(won)
+
+    def lookup(self, grid: np.ndarray, player: int, rng: Optional[random.Random] = None) -> Optional[Tuple[int, int]]:
+        """책에 있는 수 중 승률이 가장 높은 수 (동률이면 무작위) 또는 None
+
+        min_games판 이상 두었고 이긴 비율이 min_win_rate 이상인 수만 쓴다.
+        """
+        if grid.shape[0] != self.size:
+            return None
+        key, t = canonical_key(grid, player)
+        moves = self.entries.get(key)
+        if not moves:
+            return None
+        rated = [((wins + 1) / (games + 2), move) for move, (games, wins) in moves.items()
+                 if games >= self.min_games and wins >= self.min_win_rate * games]
+        if not rated:
+            return None
+        best = max(rate for rate, _ in rated)
+        move = (rng or random).choice([move for rate, move in rated if rate == best])
+        row, col = transform(INVERSE[t], move // self.size, move % self.size, self.size)
+        if grid[row, col] != 0:
+            return None  # 해시 충돌
+        return row, col
+
+    def save(self, path: str):
+        """고정 크기 항목을 키 순서로 저장"""
+        records = [(key, move, games, wins)
+                   for key, moves in self.entries.items()
+                   for move, (games, wins) in moves.items()]
+        records.sort()
+        header = np.array([(MAGIC, VERSION, self.size, len(records))], dtype=HEADER_DTYPE)
+        entries = np.array(records, dtype=ENTRY_DTYPE)
+        with open(path, "wb") as f:
+            f.write(header.tobytes())
+            f.write(entries.tobytes())
+
+    @classmethod
+    def load(cls, path: str, min_games: int = 4, min_win_rate: float = 0.5) -> "OpeningBook":
+        with open(path, "rb") as f:
+            header = np.frombuffer(f.read(HEADER_DTYPE.itemsize), dtype=HEADER_DTYPE)[0]
+            if header["magic"] != MAGIC or header["version"] != VERSION:
+                raise ValueError(f"오프닝 북 형식이 아닙니다: {path}")
+            entries = np.frombuffer(f.read(), dtype=ENTRY_DTYPE, count=int(header["count"]))
+        book = cls(int(header["size"]), min_games, min_win_rate)
+        for key, move, games, wins in entries.tolist():
+            book.entries.setdefault(key, {})[move] = [games, wins]
+        return book
+
+
+_default_book: Optional[OpeningBook] = None
+_default_loaded = False
+
+
+def default_book() -> Optional[OpeningBook]:
+    """기본 오프닝 북 (프로세스마다 한 번만 읽음, 파일이 없으면 None)"""
+    global _default_book, _default_loaded
+    if not _default_loaded:
+        _default_loaded = True
+        if os.path.exists(DEFAULT_BOOK_PATH):
+            _default_book = OpeningBook.load(DEFAULT_BOOK_PATH)
+    return _default_book
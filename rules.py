@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+오목 규칙 (자유룰, 렌주룰 금수 판정과 금수 지도)
+렌주룰의 금수 지도는 돌이 놓이거나 치워진 곳 주변의 판정만 지우고 다시 판정합니다.
+
+사용 예 (알려진 금수/비금수 국면과, 무작위 대국에서 금수 지도를 매번 처음부터 판정한 결과와 비교):
+    python rules.py --games 20 --seed 0
+"""
+
+import argparse
+import random
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Set, Tuple
+from bitboard import BitBoard
+
+# 줄 안의 비트 위치가 1 늘 때 칸이 움직이는 방향 (bitboard.line_index와 짝)
+POS_STEPS = [(0, 1), (1, 0), (1, 1), (-1, 1)]
+
+WINDOW = 5  # 가운데 칸 양쪽으로 볼 칸 수 (5목 양 끝 너머 한 칸까지)
+WINDOW_MASK = (1 << (2 * WINDOW + 1)) - 1
+CENTER = WINDOW
+
+# 금수 판정에서 열린 삼의 '사를 만드는 칸'이 금수인지 되짚어 볼 최대 깊이
+MAX_DEPTH = 4
+
+
+class FreestyleRules:
+    """자유룰 - 5목 이상이면 승리, 금수 없음"""
+
+    name = "freestyle"
+
+    def __init__(self, board: BitBoard):
+        self.board = board
+
+    def is_win(self, row: int, col: int, player: int) -> bool:
+        """(row, col)에 놓인 돌로 이겼는지"""
+        return self.board.is_five(row, col, player)
+
+    def is_forbidden(self, row: int, col: int, player: int) -> bool:
+        """빈 칸 (row, col)이 player에게 금수인지"""
+        return False
+
+    def forbidden_points(self) -> Set[Tuple[int, int]]:
+        """흑의 금수 자리 전체"""
+        return set()
+
+    def changed(self, row: int, col: int):
+        """(row, col)에 돌이 놓이거나 치워졌을 때 BitBoard가 부름"""
+
+
+def _run(black: int, pos: int) -> int:
+    """pos를 포함하는 연속된 흑돌의 비트 마스크"""
+    low = pos
+    while low > 0 and (black >> (low - 1)) & 1:
+        low -= 1
+    high = pos
+    while (black >> (high + 1)) & 1:
+        high += 1
+    return ((1 << (high - low + 1)) - 1) << low
+
+
+def _is_exact_five(black: int, pos: int) -> bool:
+    return bin(_run(black, pos)).count("1") == 5
+
+
+def _five_points(black: int, empty: int) -> List[int]:
+    """두면 가운데 돌을 포함한 정확한 5목이 되는 빈 칸들"""
+    points = []
+    for e in range(CENTER - 4, CENTER + 5):
+        if (empty >> e) & 1:
+            run = _run(black | (1 << e), e)
+            if (run >> CENTER) & 1 and bin(run).count("1") == 5:
+                points.append(e)
+    return points
+
+
+@lru_cache(maxsize=1 << 16)
+def analyze_line(black: int, empty: int) -> Tuple[bool, bool, int, Tuple[int, ...]]:
+    """가운데(비트 5)에 흑을 놓은 11칸 창의 모양 -> (정확한 5목, 장목, 사의 수, 열린 삼을 사로 만드는 칸들)
+
+    사는 돌 네 개 묶음 단위로 센다 - 열린 사(.XXXX.)는 하나, X.XXX.X 같은 한 줄 쌍사는 둘.
+    열린 삼을 사로 만드는 칸은 가운데로부터의 상대 위치이며, 그 칸이 금수인지는 호출하는 쪽에서 확인한다.
+    """
+    black |= 1 << CENTER
+    empty &= ~(1 << CENTER)
+    length = bin(_run(black, CENTER)).count("1")
+    if length == 5:
+        return True, False, 0, ()
+    if length > 5:
+        return False, True, 0, ()
+
+    fours = {_run(black | (1 << e), e) & ~(1 << e) for e in _five_points(black, empty)}
+    if fours:
+        return False, False, len(fours), ()
+
+    # 한 수를 더 두면 양쪽이 모두 정확한 5목 자리인 열린 사가 되는 칸
+    threes = []
+    for y in range(CENTER - 3, CENTER + 4):
+        if not (empty >> y) & 1:
+            continue
+        with_y = black | (1 << y)
+        run = _run(with_y, CENTER)
+        if not (run >> y) & 1 or bin(run).count("1") != 4:
+            continue
+        low = (run & -run).bit_length() - 1
+        high = run.bit_length() - 1
+        ends = [e for e in (low - 1, high + 1) if 0 <= e <= 2 * WINDOW and (empty >> e) & 1]
+        if len(ends) == 2 and all(_is_exact_five(with_y | (1 << e), e) for e in ends):
+            threes.append(y - CENTER)
+    return False, False, 0, tuple(threes)
+
+
+@lru_cache(maxsize=1 << 16)
+def _cells_in_reach(size: int, row: int, col: int) -> Tuple[Tuple[int, int], ...]:
+    cells = []
+    for dr, dc in POS_STEPS:
+        for k in range(-WINDOW, WINDOW + 1):
+            r, c = row + k * dr, col + k * dc
+            if 0 <= r < size and 0 <= c < size:
+                cells.append((r, c))
+    return tuple(cells)
+
+
+class RenjuRules(FreestyleRules):
+    """렌주룰 - 흑은 정확히 5목이어야 이기고 장목(6목 이상), 3-3, 4-4 자리에 둘 수 없음
+
+    금수 지도는 칸마다 판정 결과와 그 판정이 읽은 칸들을 기억해 두고, 돌이 놓이거나 치워지면
+    그 돌이 영향을 줄 수 있는 판정만 지운다. 지워진 칸은 다음에 물어볼 때 다시 판정한다.
+    """
+
+    name = "renju"
+
+    def __init__(self, board: BitBoard):
+        super().__init__(board)
+        self._known: Dict[Tuple[int, int], bool] = {}
+        self._deps: Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]] = {}
+        self._watchers: Dict[Tuple[int, int], Set[Tuple[int, int]]] = {}
+        self._forbidden: Set[Tuple[int, int]] = set()
+        # 금수는 돌 근처에서만 생기므로 다시 판정할 칸은 놓인 돌의 영향 범위로 한정 (보드 넓이와 무관)
+        self._dirty: Set[Tuple[int, int]] = set()
+        for row, col in board.history:
+            self._dirty.update(self._reach(row, col))
+
+    def _reach(self, row: int, col: int) -> Tuple[Tuple[int, int], ...]:
+        """네 줄 위로 양쪽 WINDOW칸 (돌 하나가 판정에 영향을 줄 수 있는 범위)"""
+        return _cells_in_reach(self.board.size, row, col)
+
+    def is_win(self, row: int, col: int, player: int) -> bool:
+        if player != 1:
+            return self.board.is_five(row, col, player)
+        # 흑은 정확히 5목만 승리 (장목은 승리가 아님)
+        cell = row * self.board.size + col
+        return any(run[cell] == 5 for run in self.board.runs[1])
+
+    def is_forbidden(self, row: int, col: int, player: int) -> bool:
+        if player != 1 or self.board.grid[row, col] != 0:
+            return False
+        cell = (row, col)
+        known = self._known.get(cell)
+        if known is None:
+            known = self._evaluate(cell)
+        return known
+
+    def forbidden_points(self) -> Set[Tuple[int, int]]:
+        grid = self.board.grid
+        for cell in list(self._dirty):
+            if grid[cell] == 0 and cell not in self._known:
+                self._evaluate(cell)
+        self._dirty.clear()
+        return self._forbidden
+
+    def changed(self, row: int, col: int):
+        affected = set()
+        watchers = self._watchers
+        reach = self._reach(row, col)
+        for cell in reach:
+            if cell in watchers:
+                affected |= watchers[cell]
+        for cell in affected:
+            self._forget(cell)
+        self._forget((row, col))
+        self._dirty |= affected
+        self._dirty.update(reach)
+
+    def _forget(self, cell: Tuple[int, int]):
+        if self._known.pop(cell, None) is None:
+            return
+        self._forbidden.discard(cell)
+        for point in self._deps.pop(cell):
+            watchers = self._watchers[point]
+            watchers.discard(cell)
+            if not watchers:
+                del self._watchers[point]
+
+    def _evaluate(self, cell: Tuple[int, int]) -> bool:
+        """cell의 금수 여부를 판정해 기억 - 판정 중 읽은 칸들을 의존 관계로 등록"""
+        deps: List[Tuple[int, int]] = []
+        forbidden = self._forbidden_at(cell, frozenset(), 0, deps)
+        self._known[cell] = forbidden
+        if forbidden:
+            self._forbidden.add(cell)
+        points = tuple(set(deps))
+        self._deps[cell] = points
+        for point in points:
+            self._watchers.setdefault(point, set()).add(cell)
+        self._dirty.discard(cell)
+        return forbidden
+
+    def _window(self, d: int, row: int, col: int, extra: FrozenSet[Tuple[int, int]]) -> Tuple[int, int]:
+        """(row, col)을 가운데로 한 d 방향 11칸 창의 (흑, 빈 칸) 비트열 - extra는 가상으로 놓은 흑돌"""
+        board = self.board
+        index, pos = board.line_index(d, row, col)
+        black = board.lines[1][d][index]
+        white = board.lines[2][d][index]
+        for r, c in extra:
+            extra_index, extra_pos = board.line_index(d, r, c)
+            if extra_index == index:
+                black |= 1 << extra_pos
+        empty = board.valid[d][index] & ~black & ~white
+        shift = pos - WINDOW
+        if shift >= 0:
+            return (black >> shift) & WINDOW_MASK, (empty >> shift) & WINDOW_MASK
+        return (black << -shift) & WINDOW_MASK, (empty << -shift) & WINDOW_MASK
+
+    def _forbidden_at(self, cell: Tuple[int, int], extra: FrozenSet[Tuple[int, int]], depth: int,
+                      deps: List[Tuple[int, int]]) -> bool:
+        deps.append(cell)
+        row, col = cell
+        shapes = [analyze_line(*self._window(d, row, col, extra)) for d in range(4)]
+        if any(five for five, _, _, _ in shapes):
+            return False  # 정확한 5목은 금수보다 우선
+        if any(overline for _, overline, _, _ in shapes):
+            return True
+        if sum(fours for _, _, fours, _ in shapes) >= 2:
+            return True
+
+        threes = 0
+        extra_here = extra | {cell}
+        for d, (_, _, _, offsets) in enumerate(shapes):
+            if not offsets:
+                continue
+            dr, dc = POS_STEPS[d]
+            # 사를 만드는 칸이 모두 금수라면 진짜 열린 삼이 아님
+            if depth >= MAX_DEPTH or any(
+                    not self._forbidden_at((row + k * dr, col + k * dc), extra_here, depth + 1, deps)
+                    for k in offsets):
+                threes += 1
+                if threes >= 2:
+                    return True
+        return False
+
+
+RULES = {rules.name: rules for rules in (FreestyleRules, RenjuRules)}
+
+
+def make_rules(name: str, board: BitBoard) -> FreestyleRules:
+    """이름으로 규칙 객체를 만들어 board에 붙임"""
+    if name not in RULES:
+        raise ValueError(f"알 수 없는 규칙: {name} (가능한 규칙: {', '.join(RULES)})")
+    rules = RULES[name](board)
+    board.rules = rules
+    return rules
+
+
+# 자체 점검용 국면 - (이름, 흑돌, 백돌, 확인할 칸, 흑의 금수인지)
+_COL4_OVERLINE = ((4, 4), (5, 4), (6, 4), (8, 4), (9, 4))  # (7, 4)에 두면 세로 6목
+_COL8_OVERLINE = ((4, 8), (5, 8), (6, 8), (8, 8), (9, 8))  # (7, 8)에 두면 세로 6목
+_THREE_THREE = ((7, 5), (7, 6), (5, 7), (6, 7))
+KNOWN_POSITIONS = [
+    ("3-3", _THREE_THREE, (), (7, 7), True),
+    ("4-4", ((7, 4), (7, 5), (7, 6), (4, 7), (5, 7), (6, 7)), ((7, 3), (3, 7)), (7, 7), True),
+    ("한 줄 4-4 (X.XXX.X)", ((7, 3), (7, 5), (7, 7), (7, 9)), (), (7, 6), True),
+    ("장목", ((7, 2), (7, 3), (7, 4), (7, 6), (7, 7)), (), (7, 5), True),
+    ("정확한 5목이 금수보다 우선", ((7, 3), (7, 4), (7, 5), (7, 6), (5, 7), (6, 7), (5, 5), (6, 6)), (), (7, 7), False),
+    ("4-3", ((7, 4), (7, 5), (7, 6), (5, 7), (6, 7)), ((7, 3),), (7, 7), False),
+    ("막힌 삼은 삼이 아님", _THREE_THREE, ((7, 8),), (7, 7), False),
+    # 가로 삼을 사로 만드는 칸 (7, 4), (7, 8)이 모두 장목 금수라 가로는 거짓 삼
+    ("거짓 삼 (사를 만드는 칸이 모두 금수)", _THREE_THREE + _COL4_OVERLINE + _COL8_OVERLINE, (), (7, 7), False),
+    ("사를 만드는 칸 하나만 금수", _THREE_THREE + _COL8_OVERLINE, (), (7, 7), True),
+]
+
+
+def _full_recompute(board: BitBoard) -> Set[Tuple[int, int]]:
+    """금수 지도를 쓰지 않고 모든 빈 칸을 새로 판정한 흑의 금수 자리"""
+    fresh = RenjuRules(board)
+    return {(row, col) for row in range(board.size) for col in range(board.size)
+            if fresh.is_forbidden(row, col, 1)}
+
+
+def self_check(games: int = 20, seed: int = 0, size: int = 15) -> List[str]:
+    """알려진 국면의 금수 판정과, 무작위 대국(무르기 포함)에서 점진적 금수 지도를 전체 재판정과 비교 - 실패 목록"""
+    failures = []
+    for name, black, white, cell, expected in KNOWN_POSITIONS:
+        board = BitBoard(size)
+        rules = make_rules("renju", board)
+        for row, col in black:
+            board.place(row, col, 1)
+        for row, col in white:
+            board.place(row, col, 2)
+        if rules.is_forbidden(*cell, 1) != expected:
+            failures.append(f"{name}: {cell}의 금수 판정이 {expected}가 아님")
+        if rules.is_forbidden(*cell, 2):
+            failures.append(f"{name}: 백에게 금수가 생김")
+
+    rng = random.Random(seed)
+    for game in range(games):
+        board = BitBoard(size)
+        rules = make_rules("renju", board)
+        player = 1
+        while len(failures) < 10:
+            cells = sorted(board.candidates) if board.history else [(size // 2, size // 2)]
+            if board.history and rng.random() < 0.15:
+                row, col = board.history[-1]
+                board.undo()
+                player = 3 - player
+            else:
+                # 금수 자리도 가리지 않고 둬서 판정을 기억해 둔 칸 주변도 바뀌게 함
+                row, col = rng.choice(cells)
+                board.place(row, col, player)
+                if board.is_five(row, col, player) or board.is_full():
+                    break
+                player = 3 - player
+            expected = _full_recompute(board)
+            if rules.forbidden_points() != expected:
+                failures.append(f"대국 {game} {len(board.history)}수: 금수 지도 {sorted(rules.forbidden_points())}"
+                                f" != 전체 재판정 {sorted(expected)}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="렌주룰 금수 판정 자체 점검")
+    parser.add_argument("--games", type=int, default=20, help="금수 지도를 전체 재판정과 비교할 무작위 대국 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--size", type=int, default=15, help="무작위 대국의 보드 크기")
+    args = parser.parse_args()
+
+    failures = self_check(args.games, args.seed, args.size)
+    for failure in failures:
+        print(f"실패 - {failure}")
+    if failures:
+        raise SystemExit(1)
+    print(f"알려진 국면 {len(KNOWN_POSITIONS)}개, 무작위 대국 {args.games}판: 모두 통과")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import threading
+import time
+import numpy as np
+from typing import List, Optional, Tuple, Union
+from bitboard import BitBoard
+from evaluator import Evaluator, PatternEvaluator
+from movegen import ordered_moves
+from transposition import TranspositionTable, EXACT, LOWER, UPPER, NO_MOVE
+from zobrist import SIDE_KEY
+
+WIN_SCORE = 10_000_000
+MATE_BOUND = WIN_SCORE - 1000  # 이보다 큰 점수는 수순 길이가 반영된 승패 점수
+
+
+class SearchTimeout(Exception):
+    """탐색 시간(또는 노드 예산) 초과"""
+
+
+class SearchEngine:
+    """반복 심화 네가맥스(알파-베타) 탐색 엔진"""
+
+    def __init__(self, think_ms: int = 1000, max_depth: int = 8, beam_width: int = 10, tt_mb: float = 16,
+                 candidate_radius: int = 1, evaluator: Optional[Evaluator] = None):
+        self.think_ms = think_ms
+        self.max_depth = max_depth
+        self.beam_width = beam_width  # 각 노드에서 살펴볼 후보 수
+        self.candidate_radius = candidate_radius
+        self.tt = TranspositionTable(tt_mb)  # 수가 바뀌어도 유지
+        self.evaluator = evaluator or PatternEvaluator()  # 잎 노드 평가 (패턴 점수 또는 신경망)
+
+        self.nodes = 0
+        self.evaluations = 0  # 잎 노드 평가 횟수
+        self.root_candidates = 0
+        self.completed_depth = 0
+        self.best_score = 0
+        self._deadline = 0.0
+        self._node_limit = float("inf")
+        self._board: Optional[BitBoard] = None
+        self._stop: Optional[threading.Event] = None
+
+    def search(self, board: Union[np.ndarray, BitBoard], player: int,
+               stop: Optional[threading.Event] = None, think_ms: Optional[float] = None,
+               max_depth: Optional[int] = None, max_nodes: Optional[int] = None) -> Tuple[int, int]:
+        """주어진 시간 안에서 찾은 최선의 수를 반환 (stop이 설정되면 그때까지의 최선수)
+
+        BitBoard를 주면 그 보드에 직접 두고 무르며 탐색하고, 끝나면 원래 상태로 돌려놓는다.
+        think_ms, max_depth를 주면 이번 탐색에만 self.think_ms, self.max_depth 대신 그 값을 쓰고,
+        max_nodes를 주면 노드를 그만큼 읽은 뒤 마지막으로 끝난 깊이의 최선수를 둔다.
+        """
+        budget_ms = self.think_ms if think_ms is None else think_ms
+        self._deadline = time.perf_counter() + budget_ms / 1000.0
+        self._node_limit = float("inf") if max_nodes is None else max_nodes
+        self._stop = stop
+        if isinstance(board, BitBoard):
+            self._board = board
+        else:
+            self._board = BitBoard.from_array(board, self.candidate_radius)
+        self.nodes = 0
+        self.evaluations = 0
+        self.completed_depth = 0
+        self.best_score = 0
+        self.tt.new_search()
+
+        root_moves = self._ordered_moves(player)
+        self.root_candidates = len(root_moves)
+        if not root_moves:
+            return (self._board.size // 2, self._board.size // 2)
+
+        best_move = root_moves[0]
+        # 바로 이기는 수는 탐색하지 않고 둔다
+        for row, col in root_moves:
+            if self._board.would_be_five(row, col, player):
+                return (row, col)
+
+        for depth in range(1, (self.max_depth if max_depth is None else max_depth) + 1):
+            try:
+                score, move = self._search_root(root_moves, depth, player)
+            except SearchTimeout:
+                break
+            best_move = move
+            self.best_score = score
+            self.completed_depth = depth
+            # 이전 반복의 최선수를 먼저 탐색
+            root_moves.remove(move)
+            root_moves.insert(0, move)
+            if abs(score) > MATE_BOUND:
+                break
+
+        return best_move
+
+    def _search_root(self, moves: List[Tuple[int, int]], depth: int, player: int) -> Tuple[int, Tuple[int, int]]:
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_move = moves[0]
+        for row, col in moves:
+            score = -self._child_value(row, col, player, depth, -beta, -alpha, 1)
+            if score > alpha:
+                alpha = score
+                best_move = (row, col)
+        return alpha, best_move
+
+    def _child_value(self, row: int, col: int, player: int, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """(row, col)에 둔 뒤 상대 입장에서의 점수"""
+        if self._board.would_be_five(row, col, player):
+            return -(WIN_SCORE - ply)
+        self._board.place(row, col, player)
+        try:
+            return self._negamax(depth - 1, alpha, beta, 3 - player, ply)
+        finally:
+            self._board.undo()
+
+    def _negamax(self, depth: int, alpha: int, beta: int, player: int, ply: int) -> int:
+        self.nodes += 1
+        if (time.perf_counter() > self._deadline or self.nodes > self._node_limit or
+                (self._stop is not None and self._stop.is_set())):
+            raise SearchTimeout()
+
+        if depth == 0:
+            self.evaluations += 1
+            return self.evaluator.evaluate(self._board, player)
+
+        key = self._board.hash ^ (SIDE_KEY if player == 2 else 0)
+        size = self._board.size
+        hash_move = NO_MOVE
+        entry = self.tt.probe(key)
+        if entry is not None:
+            score, entry_depth, flag, hash_move = entry
+            if entry_depth >= depth:
+                score = _score_from_tt(score, ply)
+                if flag == EXACT:
+                    return score
+                if flag == LOWER and score >= beta:
+                    return score
+                if flag == UPPER and score <= alpha:
+                    return score
+
+        moves = self._ordered_moves(player)
+        if not moves:
+            return 0  # 무승부
+        if hash_move != NO_MOVE:
+            move = divmod(hash_move, size)
+            if move in moves:
+                moves.remove(move)
+            moves.insert(0, move)
+
+        if depth == 1 and self.evaluator.batched:
+            best, best_move = self._batched_leaves(moves, player, ply)
+            self.tt.store(key, _score_to_tt(best, ply), depth, EXACT, best_move[0] * size + best_move[1])
+            return best
+
+        alpha_orig = alpha
+        best = -WIN_SCORE - 1
+        best_move = moves[0]
+        for row, col in moves:
+            score = -self._child_value(row, col, player, depth, -beta, -alpha, ply + 1)
+            if score > best:
+                best = score
+                best_move = (row, col)
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                break
+
+        if best <= alpha_orig:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, _score_to_tt(best, ply), depth, flag, best_move[0] * size + best_move[1])
+        return best
+
+    def _batched_leaves(self, moves: List[Tuple[int, int]], player: int, ply: int) -> Tuple[int, Tuple[int, int]]:
+        """잎 바로 위 노드 - 자식 국면들을 평가기로 한 번에 평가 (가지치기 대신 묶음 추론)"""
+        for row, col in moves:
+            if self._board.would_be_five(row, col, player):
+                return WIN_SCORE - (ply + 1), (row, col)
+        scores = self.evaluator.score_moves(self._board, player, moves)
+        self.nodes += len(moves)
+        self.evaluations += len(moves)
+        best = max(range(len(moves)), key=scores.__getitem__)
+        return scores[best], moves[best]
+
+    def _ordered_moves(self, player: int) -> List[Tuple[int, int]]:
+        """위협 기반으로 정렬된 후보 수 중 상위 beam_width개"""
+        return ordered_moves(self._board, player)[:self.beam_width]
+
+
+def _score_to_tt(score: int, ply: int) -> int:
+    """승패 점수를 현재 노드 기준으로 바꿔 저장"""
+    if score > MATE_BOUND:
+        return score + ply
+    if score < -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score: int, ply: int) -> int:
+    if score > MATE_BOUND:
+        return score - ply
+    if score < -MATE_BOUND:
+        return score + ply
+    return score
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+오목 게임 서버 (asyncio)
+여러 판을 한 프로세스에서 동시에 진행하고, AI 수는 프로세스 풀에서 계산합니다.
+AI에게 보낼 국면은 공유 메모리 보드 풀(board_pool.py)의 슬롯에 써 두고 슬롯 번호만 넘기며,
+작업 프로세스는 고른 수와 점수를 그 슬롯의 결과 칸에 씁니다.
+
+프로토콜: TCP 위에 한 줄에 JSON 하나 (UTF-8, '\\n'으로 구분)
+    -> {"op": "new", "mode": "ai_hard" | "ai_mcts" | "ai_medium" | "ai_easy" | "2player", "hotseat": false}
+    <- {"op": "created", "game": 1, "player": 1, "size": 15}
+    -> {"op": "join", "game": 1}                       (2인용 게임의 두 번째 플레이어)
+    <- {"op": "joined", "game": 1, "player": 2}
+    -> {"op": "move", "game": 1, "row": 7, "col": 7}
+    <- {"op": "state", "game": 1, "last": [7, 7, 1], "count": 1, "turn": 2, "winner": null}
+    -> {"op": "reset", "game": 1}
+    <- {"op": "error", "message": "..."}             (AI 계산 실패는 "game"도 실림 - reset으로 다시 시작)
+새로 만들거나 참가하거나 리셋하면 state에 전체 기보("moves")가 실립니다.
+
+사용 예:
+    python server.py --port 8765 --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Set, Tuple
+from ai import AI
+from bitboard import BitBoard
+from board_pool import BoardPool
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 작업 프로세스마다 플레이어별 AI를 한 번만 만듦
+_worker_ais = {}
+
+
+def compute_ai_move(grid: np.ndarray, player: int, difficulty: str) -> Tuple[int, int]:
+    """작업 프로세스에서 AI 수 계산"""
+    ai = _worker_ais.get(player)
+    if ai is None:
+        ai = _worker_ais[player] = AI(player)
+    row, col = ai.get_move_with_difficulty(grid, difficulty)
+    return int(row), int(col)
+
+
+def compute_shared_ai_move(spec: Tuple[str, int, int], slot: int, difficulty: str):
+    """작업 프로세스에서 보드 풀 슬롯의 국면을 복사 없이 읽어 AI 수를 계산하고 결과 칸에 씀"""
+    pool = BoardPool.attach(spec)
+    player = pool.player(slot)
+    row, col = compute_ai_move(pool.grid(slot), player, difficulty)
+    pool.set_result(slot, row, col, _worker_ais[player].last_score)
+
+
+class ServerGame:
+    """서버에서 진행 중인 한 판"""
+
+    def __init__(self, game_id: int, mode: str, size: int, hotseat: bool):
+        self.id = game_id
+        self.mode = mode
+        self.board = BitBoard(size)
+        self.hotseat = hotseat  # 한 연결이 흑백을 모두 둠
+        self.players: Dict[int, "ClientConnection"] = {}
+        self.turn = 1
+        self.winner: Optional[int] = None  # 0: 무승부
+        self.ai_pending = False
+
+    @property
+    def ai_player(self) -> Optional[int]:
+        return 2 if self.mode.startswith("ai_") else None
+
+    @property
+    def difficulty(self) -> str:
+        return self.mode.split("_", 1)[1] if self.mode.startswith("ai_") else "medium"
+
+    def controls(self, connection: "ClientConnection", player: int) -> bool:
+        if self.hotseat:
+            return connection in self.players.values() and player != self.ai_player
+        return self.players.get(player) is connection
+
+    def play(self, row: int, col: int) -> bool:
+        """현재 차례의 돌을 놓고 승패/차례 처리 (규칙은 BitBoard)"""
+        player = self.turn
+        if self.winner is not None or not self.board.place(row, col, player):
+            return False
+        if self.board.is_five(row, col, player):
+            self.winner = player
+        elif self.board.is_full():
+            self.winner = 0
+        else:
+            self.turn = 3 - player
+        return True
+
+    def reset(self):
+        self.board.reset()
+        self.turn = 1
+        self.winner = None
+
+    def state(self, full: bool = False) -> Dict:
+        message = {"op": "state", "game": self.id, "count": len(self.board.history),
+                   "turn": self.turn, "winner": self.winner}
+        grid = self.board.grid
+        if full or not self.board.history:
+            message["moves"] = [[row, col, int(grid[row, col])] for row, col in self.board.history]
+        else:
+            row, col = self.board.history[-1]
+            message["last"] = [row, col, int(grid[row, col])]
+        return message
+
+
+class ClientConnection:
+    def __init__(self, server: "GameServer", reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.games: Set[int] = set()
+        self.task = asyncio.current_task()
+
+    def send(self, message: Dict):
+        if not self.writer.is_closing():
+            self.writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+
+class GameServer:
+    """여러 판을 동시에 진행하는 asyncio 서버"""
+
+    def __init__(self, workers: Optional[int] = None, size: int = 15, pool_slots: Optional[int] = None):
+        self.size = size
+        self.games: Dict[int, ServerGame] = {}
+        self._next_id = 1
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        # AI 국면을 넘길 공유 메모리 슬롯 (기본: 작업 프로세스마다 4개, 모자라면 보드를 복사해 넘김)
+        self.boards = BoardPool(pool_slots or 4 * (workers or os.cpu_count() or 1), size)
+        self._connections: Set[ClientConnection] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> int:
+        """서버 시작 - 실제로 열린 포트를 반환 (port=0이면 빈 포트)"""
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        try:
+            if self._server is not None:
+                self._server.close()
+                handlers = [connection.task for connection in self._connections]
+                for connection in list(self._connections):
+                    connection.writer.close()
+                await asyncio.gather(*handlers, return_exceptions=True)
+                await self._server.wait_closed()
+        finally:
+            # 닫는 도중에 중단되더라도 작업 프로세스와 공유 메모리 보드 풀은 정리
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self.boards.close()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = ClientConnection(self, reader, writer)
+        self._connections.add(connection)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    self._dispatch(connection, message)
+                except (ValueError, KeyError, TypeError) as e:
+                    connection.send({"op": "error", "message": f"잘못된 요청: {e}"})
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._disconnect(connection)
+            writer.close()
+
+    def _dispatch(self, connection: ClientConnection, message: Dict):
+        op = message["op"]
+        if op == "new":
+            self._new_game(connection, message.get("mode", "2player"), bool(message.get("hotseat", False)))
+        elif op == "join":
+            self._join_game(connection, int(message["game"]))
+        elif op == "move":
+            self._move(connection, int(message["game"]), int(message["row"]), int(message["col"]))
+        elif op == "reset":
+            self._reset(connection, int(message["game"]))
+        else:
+            connection.send({"op": "error", "message": f"알 수 없는 요청: {op}"})
+
+    def _new_game(self, connection: ClientConnection, mode: str, hotseat: bool):
+        game = ServerGame(self._next_id, mode, self.size, hotseat)
+        self._next_id += 1
+        self.games[game.id] = game
+        game.players[1] = connection
+        connection.games.add(game.id)
+        connection.send({"op": "created", "game": game.id, "player": 1, "size": self.size})
+        connection.send(game.state(full=True))
+
+    def _join_game(self, connection: ClientConnection, game_id: int):
+        game = self.games.get(game_id)
+        if game is None or game.ai_player is not None or 2 in game.players or game.hotseat:
+            connection.send({"op": "error", "message": "참가할 수 없는 게임입니다"})
+            return
+        game.players[2] = connection
+        connection.games.add(game.id)
+        connection.send({"op": "joined", "game": game.id, "player": 2})
+        self._broadcast(game, game.state(full=True))
+
+    def _move(self, connection: ClientConnection, game_id: int, row: int, col: int):
+        game = self.games.get(game_id)
+        if game is None or not game.controls(connection, game.turn) or game.ai_pending:
+            connection.send({"op": "error", "message": "지금 둘 수 없습니다"})
+            return
+        if not game.play(row, col):
+            connection.send({"op": "error", "message": "둘 수 없는 자리입니다"})
+            return
+        self._broadcast(game, game.state())
+        if game.winner is None and game.turn == game.ai_player:
+            game.ai_pending = True
+            asyncio.get_running_loop().create_task(self._ai_move(game))
+
+    async def _ai_move(self, game: ServerGame):
+        """AI 수는 작업 프로세스에서 계산하고, 그 사이 게임이 리셋됐으면 버림
+
+        계산이 실패하면 게임의 플레이어들에게 오류를 보낸다 (reset으로 다시 시작할 수 있음).
+        """
+        count = len(game.board.history)
+        loop = asyncio.get_running_loop()
+        slot = self.boards.acquire()
+        try:
+            if slot is None:
+                row, col = await loop.run_in_executor(self._executor, compute_ai_move,
+                                                      game.board.grid.copy(), game.ai_player, game.difficulty)
+            else:
+                self.boards.write(slot, game.board, game.ai_player)
+                await loop.run_in_executor(self._executor, compute_shared_ai_move,
+                                           self.boards.spec, slot, game.difficulty)
+                row, col, _ = self.boards.result(slot)
+        except Exception as e:
+            self._broadcast(game, {"op": "error", "game": game.id, "message": f"AI 계산에 실패했습니다: {e}"})
+            return
+        finally:
+            if slot is not None:
+                self.boards.release(slot)
+            game.ai_pending = False
+        if game.id in self.games and len(game.board.history) == count and game.turn == game.ai_player:
+            if game.play(row, col):
+                self._broadcast(game, game.state())
+
+    def _reset(self, connection: ClientConnection, game_id: int):
+        game = self.games.get(game_id)
+        if game is None or connection not in game.players.values():
+            connection.send({"op": "error", "message": "리셋할 수 없는 게임입니다"})
+            return
+        game.reset()
+        self._broadcast(game, game.state(full=True))
+
+    def _broadcast(self, game: ServerGame, message: Dict):
+        for connection in set(game.players.values()):
+            connection.send(message)
+
+    def _disconnect(self, connection: ClientConnection):
+        """연결이 끊기면 그 연결이 만든/참가한 게임을 정리"""
+        self._connections.discard(connection)
+        for game_id in connection.games:
+            game = self.games.get(game_id)
+            if game is None:
+                continue
+            for player, owner in list(game.players.items()):
+                if owner is connection:
+                    del game.players[player]
+            if not game.players:
+                del self.games[game_id]
+
+
+async def _main(host: str, port: int, workers: Optional[int], size: int):
+    server = GameServer(workers, size)
+    port = await server.start(host, port)
+    print(f"오목 서버 시작: {host}:{port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오목 게임 서버")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="AI 계산 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--size", type=int, default=15, help="보드 크기")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_main(args.host, args.port, args.workers, args.size))
+    except KeyboardInterrupt:
+        print("\n서버를 종료합니다.")
+
+
+if __name__ == "__main__":
+    main()
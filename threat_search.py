@@ -0,0 +1,220 @@
+import time
+from typing import List, Optional, Set, Tuple
+from bitboard import BitBoard
+from movegen import line_levels, threat, FIVE, FOUR, THREE
+
+
+class BudgetExceeded(Exception):
+    """노드/시간 예산 초과"""
+
+
+class ThreatSolver:
+    """연속된 사(VCF) 또는 사/삼(VCT)으로 이기는 수순을 찾는 위협 공간 탐색
+
+    공격 측은 위협을 만드는 수만, 수비 측은 그 위협을 막는 수(와 자신의 사)만 고려한다.
+    예산 안에서 증명하지 못하면 None을 반환한다 (필승이 없다는 뜻은 아님).
+    마지막 탐색이 예산 초과로 끝났는지는 timed_out으로 구분한다.
+    """
+
+    def __init__(self, max_nodes: int = 20000, time_ms: int = 200, vcf_depth: int = 24, vct_depth: int = 8):
+        self.max_nodes = max_nodes
+        self.time_ms = time_ms
+        self.vcf_depth = vcf_depth  # 공격 측 수 기준
+        self.vct_depth = vct_depth
+        self.nodes = 0
+        self.timed_out = False  # 마지막 vcf/vct가 수순이 없다고 끝낸 게 아니라 예산 초과로 멈췄는지
+        self._deadline = 0.0
+        self._board: Optional[BitBoard] = None
+        self._failed: Set[Tuple[int, int, int]] = set()
+
+    def begin(self, time_ms: Optional[float] = None):
+        """예산(노드 수, 시간)을 새로 시작 - 이후 vcf/vct 호출이 이 예산을 나눠 씀
+
+        time_ms를 주면 이번 예산에만 self.time_ms 대신 그 시간을 쓴다.
+        """
+        self.nodes = 0
+        self._deadline = time.perf_counter() + (self.time_ms if time_ms is None else time_ms) / 1000.0
+
+    def solve_vcf(self, board: BitBoard, attacker: int) -> Optional[List[Tuple[int, int]]]:
+        """attacker 차례에 연속된 사로 이기는 수순 (없거나 예산 초과면 None)"""
+        self.begin()
+        return self.vcf(board, attacker)
+
+    def solve_vct(self, board: BitBoard, attacker: int) -> Optional[List[Tuple[int, int]]]:
+        """attacker 차례에 사와 열린 삼으로 이기는 수순"""
+        self.begin()
+        return self.vct(board, attacker)
+
+    def vcf(self, board: BitBoard, attacker: int) -> Optional[List[Tuple[int, int]]]:
+        """begin()으로 시작한 예산 안에서 VCF 탐색"""
+        return self._solve(board, attacker, self.vcf_depth, vct=False)
+
+    def vct(self, board: BitBoard, attacker: int) -> Optional[List[Tuple[int, int]]]:
+        """begin()으로 시작한 예산 안에서 VCT 탐색"""
+        return self._solve(board, attacker, self.vct_depth, vct=True)
+
+    def _solve(self, board: BitBoard, attacker: int, depth: int, vct: bool) -> Optional[List[Tuple[int, int]]]:
+        self._board = board
+        self._failed = set()
+        self.timed_out = False
+        marker = len(board.history)
+        try:
+            return self._attack(attacker, depth, vct)
+        except BudgetExceeded:
+            self.timed_out = True
+            return None
+        finally:
+            while len(board.history) > marker:
+                board.undo()
+
+    def _tick(self):
+        self.nodes += 1
+        if self.nodes > self.max_nodes or time.perf_counter() > self._deadline:
+            raise BudgetExceeded()
+
+    def _threat_cells(self) -> Set[Tuple[int, int]]:
+        """위협이 생길 수 있는 칸 - 돌에서 두 칸 이내의 빈 칸"""
+        board = self._board
+        size = board.size
+        cells = set()
+        for row, col in board.history:
+            for r in range(max(0, row - 2), min(size, row + 3)):
+                for c in range(max(0, col - 2), min(size, col + 3)):
+                    if board.grid[r, c] == 0:
+                        cells.add((r, c))
+        return cells
+
+    def _forbidden(self, row: int, col: int, player: int) -> bool:
+        rules = self._board.rules
+        return rules is not None and rules.is_forbidden(row, col, player)
+
+    def _attack(self, attacker: int, depth: int, vct: bool) -> Optional[List[Tuple[int, int]]]:
+        self._tick()
+        board = self._board
+        defender = 3 - attacker
+        key = (board.hash, attacker, depth)
+        if key in self._failed:
+            return None
+
+        cells = self._threat_cells()
+        must_block = []
+        moves = []
+        for row, col in cells:
+            if self._forbidden(row, col, attacker):
+                continue
+            level, _ = threat(board, row, col, attacker)
+            if level == FIVE:
+                return [(row, col)]
+            if board.would_be_five(row, col, defender) and not self._forbidden(row, col, defender):
+                must_block.append((row, col))
+            if vct:
+                if level >= THREE:
+                    moves.append((level, row, col))
+            elif level >= FOUR and max(line_levels(board, row, col, attacker)) >= FOUR:
+                # 3-3은 threat()에서 OPEN_FOUR로 올라가지만 사가 아니므로 VCF에서는 뺀다
+                moves.append((level, row, col))
+        if len(must_block) > 1 or depth == 0:
+            self._failed.add(key)
+            return None
+        if must_block:
+            # 상대의 5목을 막으면서 위협도 만들어야 함
+            moves = [move for move in moves if (move[1], move[2]) == must_block[0]]
+        moves.sort(reverse=True)
+
+        for level, row, col in moves:
+            board.place(row, col, attacker)
+            try:
+                line = self._defend(attacker, depth - 1, vct)
+            finally:
+                board.undo()
+            if line is not None:
+                return [(row, col)] + line
+        self._failed.add(key)
+        return None
+
+    def _defend(self, attacker: int, depth: int, vct: bool) -> Optional[List[Tuple[int, int]]]:
+        """수비 측의 모든 응수에 대해 공격이 이어지면 그 수순 (첫 번째 응수 기준)
+
+        수순은 [수비, 공격, 수비, ...] 순서이며, 막을 수 없는 위협이면 빈 목록이다.
+        """
+        self._tick()
+        board = self._board
+        defender = 3 - attacker
+        cells = self._threat_cells()
+
+        # 공격 측이 다음에 5목을 만드는 칸 (사)
+        completions = [(row, col) for row, col in cells
+                       if board.would_be_five(row, col, attacker) and not self._forbidden(row, col, attacker)]
+        if len(completions) >= 2:
+            return []  # 열린 사 - 막을 수 없음
+        if any(board.would_be_five(row, col, defender) and not self._forbidden(row, col, defender)
+               for row, col in cells):
+            return None  # 수비 측이 먼저 5목
+        if completions:
+            replies = completions
+        else:
+            # 삼에 대한 응수: 공격 측이 사를 만들 수 있는 칸을 막거나, 수비 측이 사로 반격
+            replies = []
+            for row, col in cells:
+                attack_level, _ = threat(board, row, col, attacker)
+                defend_level, _ = threat(board, row, col, defender)
+                if attack_level >= FOUR or defend_level >= FOUR:
+                    replies.append((row, col))
+            if not replies:
+                return None  # 위협이 아님
+        # 렌주룰에서 흑은 금수 자리로 막을 수 없음
+        replies = [(row, col) for row, col in replies if not self._forbidden(row, col, defender)]
+        if not replies:
+            return []
+
+        first_line = None
+        for row, col in replies:
+            board.place(row, col, defender)
+            try:
+                line = self._attack(attacker, depth, vct)
+            finally:
+                board.undo()
+            if line is None:
+                return None
+            if first_line is None:
+                first_line = [(row, col)] + line
+        return first_line
+
+
+def find_forced_move(board: BitBoard, player: int, solver: Optional[ThreatSolver] = None,
+                     time_ms: Optional[float] = None) -> Optional[Tuple[Tuple[int, int], str]]:
+    """평가 전에 확인할 강제 수순 - (수, 이유) 또는 None
+
+    이유는 "vcf"(내 연속 사 승리), "block"(상대 연속 사 저지), "vct"(내 사/삼 승리).
+    모든 탐색이 solver의 예산 하나(time_ms를 주면 그 시간)를 나눠 쓴다.
+    """
+    solver = solver or ThreatSolver()
+    opponent = 3 - player
+    solver.begin(time_ms)
+
+    line = solver.vcf(board, player)
+    if line:
+        return line[0], "vcf"
+
+    # 상대가 두면 연속 사로 이기는 국면이면, 그 수순을 끊는 수를 찾음
+    line = solver.vcf(board, opponent)
+    if line:
+        candidates = line[0::2]  # 상대가 공격에 쓸 칸을 먼저 차지
+        for row, col in candidates:
+            if board.rules is not None and board.rules.is_forbidden(row, col, player):
+                continue
+            board.place(row, col, player)
+            try:
+                refuted = solver.vcf(board, opponent) is None
+            finally:
+                board.undo()
+            if solver.timed_out:
+                break  # 막았는지 확인하지 못함 - 상대 수순의 첫 칸을 차지
+            if refuted:
+                return (row, col), "block"
+        return line[0], "block"
+
+    line = solver.vct(board, player)
+    if line:
+        return line[0], "vct"
+    return None
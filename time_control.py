@@ -0,0 +1,112 @@
+import time
+from typing import Callable, Dict, Optional, Tuple
+from bitboard import BitBoard
+from movegen import THREE, ordered_moves, threat
+
+
+def parse_time_control(text: str) -> Tuple[int, int]:
+    """'5+3'(5분, 수마다 3초 추가) -> (처음 시간 ms, 추가 시간 ms)"""
+    minutes, _, increment = text.partition("+")
+    try:
+        initial_ms = int(float(minutes) * 60_000)
+        increment_ms = int(float(increment or 0) * 1000)
+    except ValueError:
+        raise ValueError(f"시간 규칙은 '분+초' 형식이어야 합니다: {text}")
+    if initial_ms <= 0 or increment_ms < 0:
+        raise ValueError(f"잘못된 시간 규칙: {text}")
+    return initial_ms, increment_ms
+
+
+def format_clock(ms: float) -> str:
+    """남은 시간 표시 - 'm:ss' (10초 미만이면 소수점 한 자리까지)"""
+    ms = max(0.0, ms)
+    if ms < 10_000:
+        return f"0:{ms / 1000:04.1f}"
+    seconds = int(ms // 1000)
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+class GameClock:
+    """대국 시계 - 두 사람의 남은 시간과 수를 둘 때마다 더해 주는 시간 (피셔 방식)
+
+    시계는 한 번에 한 사람 것만 간다. press(player)는 player가 수를 둔 뒤에 불러
+    그 쪽 시계를 멈추고 추가 시간을 더한 뒤 상대 시계를 시작한다.
+    """
+
+    def __init__(self, initial_ms: int, increment_ms: int = 0, now: Callable[[], float] = time.monotonic):
+        self.initial_ms = initial_ms
+        self.increment_ms = increment_ms
+        self.now = now  # 초 단위 시각 함수
+        self.remaining: Dict[int, float] = {}
+        self.running: Optional[int] = None  # 시계가 가는 쪽
+        self._started = 0.0
+        self.reset()
+
+    def reset(self):
+        self.remaining = {1: float(self.initial_ms), 2: float(self.initial_ms)}
+        self.running = None
+
+    def start(self, player: int):
+        self.pause()
+        self.running = player
+        self._started = self.now()
+
+    def pause(self):
+        if self.running is not None:
+            self.remaining[self.running] -= (self.now() - self._started) * 1000
+            self.running = None
+
+    def press(self, player: int):
+        if self.running == player:
+            self.pause()
+        self.remaining[player] += self.increment_ms
+        self.start(3 - player)
+
+    def remaining_ms(self, player: int) -> float:
+        value = self.remaining[player]
+        if self.running == player:
+            value -= (self.now() - self._started) * 1000
+        return value
+
+    def flagged(self, player: int) -> bool:
+        """시간을 다 썼는지"""
+        return self.remaining_ms(player) <= 0
+
+
+def position_complexity(board: BitBoard, player: int, sample: int = 20) -> float:
+    """국면의 복잡도 - 0(둘 수가 하나뿐) 또는 0.5(조용함) ~ 2.0(양쪽에 삼 이상 위협이 많음)
+
+    위협 순으로 정렬한 후보 상위 sample개 중 어느 쪽에든 삼 이상의 위협이 되는 칸 수로 센다.
+    """
+    moves = ordered_moves(board, player)
+    if len(moves) <= 1:
+        return 0.0
+    opponent = 3 - player
+    threats = sum(1 for row, col in moves[:sample]
+                  if max(threat(board, row, col, player)[0], threat(board, row, col, opponent)[0]) >= THREE)
+    return min(2.0, 0.5 + 0.1 * threats)
+
+
+class TimeManager:
+    """남은 시간과 국면 복잡도로 이번 수의 생각 시간을 정함
+
+    기본 몫은 (남은 시간 - 예비 시간) / 앞으로 둘 수 + 추가 시간이고, 여기에 복잡도를 곱한다.
+    앞으로 둘 수는 둔 수가 늘수록 줄여 잡되 min_moves_to_go 밑으로는 내리지 않는다.
+    한 수에 남은 시간의 max_fraction보다 많이 쓰지 않으며, 둘 수가 하나뿐이면 min_ms만 쓴다.
+    """
+
+    def __init__(self, moves_to_go: int = 40, min_moves_to_go: int = 10, min_ms: float = 20,
+                 max_fraction: float = 0.1, reserve_ms: float = 300):
+        self.moves_to_go = moves_to_go
+        self.min_moves_to_go = min_moves_to_go
+        self.min_ms = min_ms
+        self.max_fraction = max_fraction
+        self.reserve_ms = reserve_ms  # 수를 전달하는 데 드는 시간 등을 위해 남겨 둠
+
+    def allocate(self, remaining_ms: float, increment_ms: float, moves_played: int, complexity: float) -> float:
+        usable = max(0.0, remaining_ms - self.reserve_ms)
+        if complexity <= 0:
+            return min(self.min_ms, usable)
+        moves_to_go = max(self.min_moves_to_go, self.moves_to_go - moves_played // 4)
+        think = (usable / moves_to_go + increment_ms * 0.8) * complexity
+        return max(min(self.min_ms, usable), min(think, usable * self.max_fraction + increment_ms * 0.8, usable))
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+정책/가치 신경망 학습 도구 (NumPy, CPU)
+창 없이 둔 자가 대국 기보로 neural_net.PolicyValueNet을 학습해 .npz 가중치로 저장합니다.
+국면마다 다음 수(정책)와 그 판의 승패(가치)를 맞히도록 학습하고, 보드의 8가지 대칭으로 데이터를 늘립니다.
+
+사용 예:
+    python arena.py --a hard:think_ms=100,use_book=0 --b hard:think_ms=100,use_book=0 --games 400 --record selfplay.omr
+    python train_net.py --records selfplay.omr --epochs 10 --out nn_weights.npz
+    python train_net.py --selfplay 200 --workers 8 --epochs 10          # 자가 대국부터 두고 학습
+    python main.py --evaluator nn_weights.npz
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+from typing import Dict, Iterable, List, Tuple
+from arena import parse_config, play_games
+from game_record import GameRecord, RecordWriter, iter_records, iter_text
+from neural_net import PolicyValueNet, encode_planes, init_weights
+
+
+def load_games(paths: List[str]) -> List[GameRecord]:
+    """이진 기보(.omr)나 텍스트 기보(.txt) 파일들에서 판 목록을 읽음"""
+    games = []
+    for path in paths:
+        games.extend(iter_text(path) if path.endswith(".txt") else iter_records(path))
+    return games
+
+
+def make_samples(games: Iterable[GameRecord], size: int, skip: int = 2) -> Dict[str, np.ndarray]:
+    """판마다 (두기 전 보드, 둘 차례, 둔 칸, 승패)를 모음 - 승패를 모르는 판과 처음 skip수(무작위 시작 수)는 뺌
+
+    value는 둘 차례인 쪽 입장: 이기면 1, 지면 -1, 무승부 0
+    """
+    grids, players, moves, values = [], [], [], []
+    for game in games:
+        if game.size != size or game.winner is None:
+            continue
+        grid = np.zeros((size, size), dtype=np.int8)
+        for i, (row, col) in enumerate(game.moves):
+            player = 1 + i % 2
+            if i >= skip:
+                grids.append(grid.copy())
+                players.append(player)
+                moves.append(row * size + col)
+                values.append(0.0 if game.winner == 0 else 1.0 if game.winner == player else -1.0)
+            grid[row, col] = player
+    return {
+        "grids": np.array(grids, dtype=np.int8).reshape(-1, size, size),
+        "players": np.array(players, dtype=np.int8),
+        "moves": np.array(moves, dtype=np.int64),
+        "values": np.array(values, dtype=np.float32),
+    }
+
+
+def symmetry_tables(size: int) -> List[np.ndarray]:
+    """대칭 t(회전 t % 4번, t >= 4면 좌우 뒤집기)마다 원래 칸 번호 -> 옮겨진 칸 번호"""
+    index = np.arange(size * size).reshape(size, size)
+    tables = []
+    for t in range(8):
+        moved = _transform(index[None], t)[0].ravel()
+        table = np.empty(size * size, dtype=np.int64)
+        table[moved] = np.arange(size * size)
+        tables.append(table)
+    return tables
+
+
+def _transform(grids: np.ndarray, t: int) -> np.ndarray:
+    grids = np.rot90(grids, t % 4, axes=(1, 2))
+    return grids[:, :, ::-1] if t >= 4 else grids
+
+
+class Adam:
+    def __init__(self, weights: Dict[str, np.ndarray], lr: float = 1e-3, beta1: float = 0.9, beta2: float = 0.999,
+                 weight_decay: float = 1e-4):
+        self.lr = lr
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.weight_decay = weight_decay
+        self.steps = 0
+        self.m = {name: np.zeros_like(value) for name, value in weights.items()}
+        self.v = {name: np.zeros_like(value) for name, value in weights.items()}
+
+    def step(self, weights: Dict[str, np.ndarray], grads: Dict[str, np.ndarray]):
+        self.steps += 1
+        correction1 = 1 - self.beta1 ** self.steps
+        correction2 = 1 - self.beta2 ** self.steps
+        for name, grad in grads.items():
+            if name.endswith(".w"):
+                grad = grad + self.weight_decay * weights[name]
+            self.m[name] = self.beta1 * self.m[name] + (1 - self.beta1) * grad
+            self.v[name] = self.beta2 * self.v[name] + (1 - self.beta2) * grad * grad
+            update = self.lr * (self.m[name] / correction1) / (np.sqrt(self.v[name] / correction2) + 1e-8)
+            weights[name] -= update.astype(weights[name].dtype)
+
+
+def batch_loss(net: PolicyValueNet, grids: np.ndarray, players: np.ndarray, moves: np.ndarray,
+               values: np.ndarray, train: bool = True) -> Tuple[float, float, float, Dict[str, np.ndarray]]:
+    """(정책 교차 엔트로피, 가치 제곱 오차, 정책 정확도, 기울기) - 돌이 있는 칸은 정책에서 뺌"""
+    count, size = grids.shape[0], grids.shape[-1]
+    cache = [] if train else None
+    logits, predicted = net.forward(encode_planes(grids, players), cache)
+    logits = np.where(grids == 0, logits, -1e9).reshape(count, -1)
+    logits = logits - logits.max(axis=1, keepdims=True)
+    probabilities = np.exp(logits)
+    probabilities /= probabilities.sum(axis=1, keepdims=True)
+    rows = np.arange(count)
+    policy_loss = float(-np.log(probabilities[rows, moves] + 1e-12).mean())
+    value_loss = float(((predicted - values) ** 2).mean())
+    accuracy = float((probabilities.argmax(axis=1) == moves).mean())
+    if not train:
+        return policy_loss, value_loss, accuracy, {}
+
+    d_logits = probabilities.copy()
+    d_logits[rows, moves] -= 1
+    d_logits = (d_logits / count).reshape(count, size, size).astype(np.float32)
+    d_value = (2 * (predicted - values) / count).astype(np.float32)
+    return policy_loss, value_loss, accuracy, net.backward(cache, d_logits, d_value)
+
+
+def train(net: PolicyValueNet, samples: Dict[str, np.ndarray], epochs: int = 10, batch_size: int = 64,
+          lr: float = 1e-3, validation: float = 0.1, seed: int = 0) -> List[Dict]:
+    """미니배치 Adam 학습 - 배치마다 무작위 대칭을 적용하고, 에폭마다 검증 손실을 기록"""
+    rng = np.random.default_rng(seed)
+    count = len(samples["moves"])
+    size = samples["grids"].shape[-1]
+    order = rng.permutation(count)
+    held_out = int(count * validation)
+    valid_index, train_index = order[:held_out], order[held_out:]
+    tables = symmetry_tables(size)
+    optimizer = Adam(net.weights, lr)
+    history = []
+
+    for epoch in range(epochs):
+        start = time.perf_counter()
+        rng.shuffle(train_index)
+        totals = np.zeros(3)
+        batches = 0
+        for begin in range(0, len(train_index), batch_size):
+            index = train_index[begin:begin + batch_size]
+            t = int(rng.integers(8))
+            grids = np.ascontiguousarray(_transform(samples["grids"][index], t))
+            moves = tables[t][samples["moves"][index]]
+            policy_loss, value_loss, accuracy, grads = batch_loss(
+                net, grids, samples["players"][index], moves, samples["values"][index])
+            optimizer.step(net.weights, grads)
+            totals += (policy_loss, value_loss, accuracy)
+            batches += 1
+
+        result = {"epoch": epoch + 1, "seconds": time.perf_counter() - start}
+        result["policy_loss"], result["value_loss"], result["accuracy"] = totals / max(1, batches)
+        if held_out:
+            valid = []
+            for begin in range(0, held_out, 256):
+                index = valid_index[begin:begin + 256]
+                valid.append(batch_loss(net, samples["grids"][index], samples["players"][index],
+                                        samples["moves"][index], samples["values"][index], train=False)[:3])
+            result["valid_policy_loss"], result["valid_value_loss"], result["valid_accuracy"] = np.mean(valid, axis=0)
+        history.append(result)
+        print(f"에폭 {epoch + 1}: 정책 {result['policy_loss']:.3f} 가치 {result['value_loss']:.3f} "
+              f"정확도 {result['accuracy']:.1%}", end="")
+        if held_out:
+            print(f" | 검증 정책 {result['valid_policy_loss']:.3f} 가치 {result['valid_value_loss']:.3f} "
+                  f"정확도 {result['valid_accuracy']:.1%}", end="")
+        print(f" ({result['seconds']:.1f}초)")
+    return history
+
+
+def main():
+    parser = argparse.ArgumentParser(description="정책/가치 신경망 학습 (NumPy)")
+    parser.add_argument("--records", nargs="*", default=[], help="학습할 기보 파일 (.omr 이진, .txt 텍스트)")
+    parser.add_argument("--selfplay", type=int, default=0, help="학습 전에 자가 대국을 몇 판 더 둘지")
+    parser.add_argument("--config", default="hard:think_ms=100,use_book=0", help="자가 대국 AI 설정")
+    parser.add_argument("--selfplay-out", default="selfplay.omr", help="자가 대국 기보를 이어 쓸 파일")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--size", type=int, default=15, help="학습에 쓸 보드 크기 (가중치는 모든 크기에서 쓸 수 있음)")
+    parser.add_argument("--skip", type=int, default=2, help="판마다 학습에서 뺄 처음 수 (무작위 시작 수)")
+    parser.add_argument("--channels", type=int, default=32)
+    parser.add_argument("--layers", type=int, default=4)
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--lr", type=float, default=1e-3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--init", help="이어서 학습할 가중치 파일")
+    parser.add_argument("--out", default="nn_weights.npz")
+    args = parser.parse_args()
+
+    games = load_games(args.records)
+    if args.selfplay:
+        config = parse_config(args.config)
+        results = play_games(config, config, args.selfplay, args.workers, args.size, seed=args.seed)
+        new_games = [GameRecord(result["record"], args.size, result["winner"]) for result in results]
+        with RecordWriter(args.selfplay_out) as writer:
+            for game in new_games:
+                writer.write(game)
+        print(f"자가 대국 {len(new_games)}판 -> {args.selfplay_out}")
+        games.extend(new_games)
+
+    samples = make_samples(games, args.size, args.skip)
+    if not len(samples["moves"]):
+        parser.error("학습할 국면이 없습니다 (--records 또는 --selfplay)")
+    print(f"{len(games)}판, 국면 {len(samples['moves'])}개")
+
+    if args.init and os.path.exists(args.init):
+        net = PolicyValueNet.load(args.init)
+    else:
+        net = PolicyValueNet(init_weights(args.channels, args.layers, seed=args.seed))
+    train(net, samples, args.epochs, args.batch, args.lr, seed=args.seed)
+    net.save(args.out)
+    print(f"가중치 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import numpy as np
+from typing import Optional, Tuple
+
+# 저장된 점수의 종류
+EXACT = 0
+LOWER = 1  # 베타 컷 - 실제 값 >= score
+UPPER = 2  # 알파 미달 - 실제 값 <= score
+
+NO_MOVE = -1
+
+
+class TranspositionTable:
+    """고정 메모리 치환표 (깊이/세대 기준 교체)
+
+    한 항목은 해시 키, 점수, 깊이, 점수 종류, 최선수, 세대를 numpy 배열에 나눠 담는다.
+    """
+
+    ENTRY_BYTES = 8 + 4 + 1 + 1 + 2 + 1
+
+    def __init__(self, size_mb: float = 16):
+        capacity = max(1, int(size_mb * 1024 * 1024) // self.ENTRY_BYTES)
+        # 인덱싱을 위해 2의 거듭제곱으로 내림
+        self.capacity = 1 << (capacity.bit_length() - 1)
+        self._mask = self.capacity - 1
+
+        self.keys = np.zeros(self.capacity, dtype=np.uint64)
+        self.scores = np.zeros(self.capacity, dtype=np.int32)
+        self.depths = np.full(self.capacity, -1, dtype=np.int8)
+        self.flags = np.zeros(self.capacity, dtype=np.int8)
+        self.moves = np.full(self.capacity, NO_MOVE, dtype=np.int16)
+        self.ages = np.zeros(self.capacity, dtype=np.uint8)
+
+        self.age = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def new_search(self):
+        """새 탐색 시작 - 이전 세대 항목은 우선 교체 대상이 됨"""
+        self.age = (self.age + 1) & 0xFF
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, int]]:
+        """(점수, 깊이, 점수 종류, 최선수) 또는 None"""
+        index = key & self._mask
+        if self.depths[index] >= 0 and int(self.keys[index]) == key:
+            self.hits += 1
+            return (int(self.scores[index]), int(self.depths[index]),
+                    int(self.flags[index]), int(self.moves[index]))
+        self.misses += 1
+        return None
+
+    def store(self, key: int, score: int, depth: int, flag: int, move: int = NO_MOVE):
+        """항목 저장 - 빈 칸, 이전 세대, 같거나 얕은 깊이의 항목만 교체"""
+        index = key & self._mask
+        stored_depth = self.depths[index]
+        if stored_depth >= 0:
+            same_key = int(self.keys[index]) == key
+            if not same_key and self.ages[index] == self.age and stored_depth > depth:
+                return
+            if not same_key:
+                self.overwrites += 1
+            elif move == NO_MOVE:
+                move = int(self.moves[index])
+
+        self.keys[index] = key
+        self.scores[index] = score
+        self.depths[index] = depth
+        self.flags[index] = flag
+        self.moves[index] = move
+        self.ages[index] = self.age
+        self.stores += 1
+
+    def clear(self):
+        """모든 항목과 통계 초기화"""
+        self.depths.fill(-1)
+        self.moves.fill(NO_MOVE)
+        self.hits = self.misses = self.stores = self.overwrites = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        """크기 조정을 위한 통계"""
+        filled = int(np.count_nonzero(self.depths >= 0))
+        return {
+            "capacity": self.capacity,
+            "filled": filled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "stores": self.stores,
+            "overwrites": self.overwrites,
+        }
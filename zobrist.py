@@ -0,0 +1,20 @@
+import numpy as np
+from functools import lru_cache
+from typing import List
+
+ZOBRIST_SEED = 20240601
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size: int) -> List[List[List[int]]]:
+    """플레이어/칸별 64비트 난수 키 (keys[player][row][col])
+
+    같은 보드 크기에서는 언제나 같은 키를 만들어 프로세스 간에도 해시가 일치한다.
+    """
+    rng = np.random.default_rng(ZOBRIST_SEED + size)
+    table = rng.integers(1, 2 ** 63, size=(3, size, size), dtype=np.int64)
+    return [[[int(key) for key in row] for row in plane] for plane in table]
+
+
+# 흰 돌 차례일 때 해시에 섞는 키
+SIDE_KEY = 0x5DEECE66D2B79F5